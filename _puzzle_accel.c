@@ -0,0 +1,513 @@
+/*
+ * Backend C tùy chọn cho puzzle_core: nén/giải nén bảng, tính heuristic
+ * (Manhattan hoặc PDB cộng dồn), sinh trạng thái con và vòng lặp trong của IDA*.
+ *
+ * Chỉ hỗ trợ bảng có key vừa 64 bit (tới 4x4). Thứ tự mã nước đi, cách nén
+ * key và cách đánh chỉ số PDB giống hệt bản Python (puzzle_core.DIRECTIONS,
+ * BoardGeometry.pack, puzzle_ranking.rank_positions).
+ *
+ * Sinh module: python build_accel.py
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+
+#define MAX_SQUARES 16
+#define MAX_GROUPS MAX_SQUARES
+#define MAX_DEPTH 1024
+#define NO_BOUND INT32_MAX
+
+/* Tịnh tiến của ô trống theo mã nước đi, cùng thứ tự với puzzle_core.DIRECTIONS */
+static const int DELTAS[4][2] = {{-1, 0}, {1, 0}, {0, -1}, {0, 1}};
+
+typedef struct {
+    PyObject_HEAD
+    int width, height, size, bits;
+    uint64_t mask, goal_key;
+    uint8_t manhattan[MAX_SQUARES][MAX_SQUARES];
+    /* successors[square][previous]: như BoardGeometry.successors, previous = 4 là nút gốc */
+    int successor_count[MAX_SQUARES][5];
+    int8_t successor_code[MAX_SQUARES][5][4];
+    int8_t successor_target[MAX_SQUARES][5][4];
+    /* PDB: groups = 0 nghĩa là dùng Manhattan */
+    int groups;
+    int group_size[MAX_GROUPS];
+    int8_t group_tiles[MAX_GROUPS][MAX_SQUARES];
+    int8_t group_of[MAX_SQUARES];
+    Py_buffer tables[MAX_GROUPS];
+} Engine;
+
+typedef struct {
+    Engine *engine;
+    int bound;
+    unsigned long long explored;
+    int max_depth;
+    int length;
+    int stopped;
+    int error;
+    PyObject *poll;
+    unsigned long long interval;
+    int8_t positions[MAX_SQUARES];
+    int values[MAX_GROUPS];
+    uint8_t codes[MAX_DEPTH];
+} Search;
+
+static inline int popcount32(uint32_t x)
+{
+#if defined(__GNUC__) || defined(__clang__)
+    return __builtin_popcount(x);
+#else
+    int count = 0;
+    while (x) {
+        x &= x - 1;
+        count++;
+    }
+    return count;
+#endif
+}
+
+static inline int tile_at(const Engine *e, uint64_t key, int square)
+{
+    return (int)((key >> (e->bits * square)) & e->mask);
+}
+
+/* Chỉ số của bộ vị trí các ô trong nhóm, giống rank_positions */
+static inline uint64_t rank_group(const Engine *e, int group, const int8_t *positions)
+{
+    uint64_t rank = 0;
+    uint32_t seen = 0;
+    int i;
+    for (i = 0; i < e->group_size[group]; i++) {
+        int p = positions[e->group_tiles[group][i]];
+        rank = rank * (uint64_t)(e->size - i) + (uint64_t)(p - popcount32(seen & ((1u << p) - 1)));
+        seen |= 1u << p;
+    }
+    return rank;
+}
+
+static inline int group_value(const Engine *e, int group, const int8_t *positions)
+{
+    return ((const uint8_t *)e->tables[group].buf)[rank_group(e, group, positions)];
+}
+
+static void key_positions(const Engine *e, uint64_t key, int8_t *positions)
+{
+    int square;
+    for (square = 0; square < e->size; square++)
+        positions[tile_at(e, key, square)] = (int8_t)square;
+}
+
+static int evaluate_key(const Engine *e, uint64_t key)
+{
+    int square, group, total = 0;
+    int8_t positions[MAX_SQUARES];
+    if (e->groups == 0) {
+        for (square = 0; square < e->size; square++)
+            total += e->manhattan[tile_at(e, key, square)][square];
+        return total;
+    }
+    key_positions(e, key, positions);
+    for (group = 0; group < e->groups; group++)
+        total += group_value(e, group, positions);
+    return total;
+}
+
+/* ---------------------------------------------------------------- Engine */
+
+static void Engine_dealloc(Engine *self)
+{
+    int group;
+    for (group = 0; group < self->groups; group++)
+        PyBuffer_Release(&self->tables[group]);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static int Engine_init(Engine *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"width", "height", "bits", "manhattan", "patterns", "tables", NULL};
+    int width, height, bits;
+    const char *manhattan;
+    Py_ssize_t manhattan_len;
+    PyObject *patterns = NULL, *tables = NULL;
+    int square, previous, tile, group;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "iiiy#|OO", kwlist, &width, &height, &bits,
+                                     &manhattan, &manhattan_len, &patterns, &tables))
+        return -1;
+    if (width < 2 || height < 2 || width * height > MAX_SQUARES || bits < 1
+            || bits * width * height > 64 || (1 << bits) < width * height) {
+        PyErr_Format(PyExc_ValueError, "Backend C không hỗ trợ bảng %dx%d", width, height);
+        return -1;
+    }
+    if (manhattan_len != width * height * width * height) {
+        PyErr_SetString(PyExc_ValueError, "Bảng Manhattan không khớp kích thước bảng");
+        return -1;
+    }
+
+    /* Gọi __init__ lần nữa: giải phóng bảng PDB cũ */
+    for (group = 0; group < self->groups; group++)
+        PyBuffer_Release(&self->tables[group]);
+    self->groups = 0;
+
+    self->width = width;
+    self->height = height;
+    self->size = width * height;
+    self->bits = bits;
+    self->mask = (1ull << bits) - 1;
+    /* Đích: ô square chứa square + 1, ô trống (0) ở ô cuối */
+    self->goal_key = 0;
+    for (square = self->size - 2; square >= 0; square--)
+        self->goal_key = (self->goal_key << bits) | (uint64_t)(square + 1);
+    for (tile = 0; tile < self->size; tile++)
+        for (square = 0; square < self->size; square++)
+            self->manhattan[tile][square] = (uint8_t)manhattan[tile * self->size + square];
+
+    for (square = 0; square < self->size; square++) {
+        int row = square / width, col = square % width;
+        for (previous = 0; previous < 5; previous++) {
+            int code, count = 0;
+            for (code = 0; code < 4; code++) {
+                int new_row = row + DELTAS[code][0], new_col = col + DELTAS[code][1];
+                if (new_row < 0 || new_row >= height || new_col < 0 || new_col >= width)
+                    continue;
+                if (previous < 4 && code == (previous ^ 1))
+                    continue;
+                self->successor_code[square][previous][count] = (int8_t)code;
+                self->successor_target[square][previous][count] = (int8_t)(new_row * width + new_col);
+                count++;
+            }
+            self->successor_count[square][previous] = count;
+        }
+    }
+
+    for (tile = 0; tile < MAX_SQUARES; tile++)
+        self->group_of[tile] = -1;
+    if (patterns != NULL && patterns != Py_None) {
+        Py_ssize_t count = PySequence_Length(patterns);
+        if (count < 0)
+            return -1;
+        if (count > MAX_GROUPS || tables == NULL || PySequence_Length(tables) != count) {
+            PyErr_SetString(PyExc_ValueError, "Số bảng PDB không khớp với số nhóm ô");
+            return -1;
+        }
+        for (group = 0; group < count; group++) {
+            PyObject *pattern = PySequence_GetItem(patterns, group);
+            PyObject *table;
+            Py_ssize_t k, i;
+            uint64_t expected = 1;
+            if (pattern == NULL)
+                return -1;
+            k = PySequence_Length(pattern);
+            if (k <= 0 || k >= self->size) {
+                Py_DECREF(pattern);
+                PyErr_SetString(PyExc_ValueError, "Nhóm ô PDB không hợp lệ");
+                return -1;
+            }
+            for (i = 0; i < k; i++) {
+                PyObject *item = PySequence_GetItem(pattern, i);
+                long value = item ? PyLong_AsLong(item) : -1;
+                Py_XDECREF(item);
+                if (value < 1 || value >= self->size || self->group_of[value] != -1) {
+                    Py_DECREF(pattern);
+                    if (!PyErr_Occurred())
+                        PyErr_SetString(PyExc_ValueError, "Nhóm ô PDB không hợp lệ");
+                    return -1;
+                }
+                self->group_tiles[group][i] = (int8_t)value;
+                self->group_of[value] = (int8_t)group;
+                expected *= (uint64_t)(self->size - i);
+            }
+            Py_DECREF(pattern);
+            self->group_size[group] = (int)k;
+
+            table = PySequence_GetItem(tables, group);
+            if (table == NULL)
+                return -1;
+            if (PyObject_GetBuffer(table, &self->tables[group], PyBUF_SIMPLE) < 0) {
+                Py_DECREF(table);
+                return -1;
+            }
+            Py_DECREF(table);
+            self->groups = group + 1;
+            if ((uint64_t)self->tables[group].len != expected) {
+                PyErr_SetString(PyExc_ValueError, "Kích thước bảng PDB không khớp với nhóm ô");
+                return -1;
+            }
+        }
+    }
+    return 0;
+}
+
+static PyObject *Engine_pack(Engine *self, PyObject *board)
+{
+    PyObject *fast = PySequence_Fast(board, "board phải là dãy số");
+    uint64_t key = 0;
+    Py_ssize_t i;
+    if (fast == NULL)
+        return NULL;
+    if (PySequence_Fast_GET_SIZE(fast) != self->size) {
+        Py_DECREF(fast);
+        PyErr_SetString(PyExc_ValueError, "Số ô không khớp kích thước bảng");
+        return NULL;
+    }
+    for (i = self->size - 1; i >= 0; i--) {
+        long tile = PyLong_AsLong(PySequence_Fast_GET_ITEM(fast, i));
+        if (tile < 0 || tile >= self->size) {
+            Py_DECREF(fast);
+            if (!PyErr_Occurred())
+                PyErr_SetString(PyExc_ValueError, "Giá trị ô không hợp lệ");
+            return NULL;
+        }
+        key = (key << self->bits) | (uint64_t)tile;
+    }
+    Py_DECREF(fast);
+    return PyLong_FromUnsignedLongLong(key);
+}
+
+static PyObject *Engine_unpack(Engine *self, PyObject *arg)
+{
+    uint64_t key = PyLong_AsUnsignedLongLong(arg);
+    PyObject *board;
+    int square;
+    if (key == (uint64_t)-1 && PyErr_Occurred())
+        return NULL;
+    board = PyList_New(self->size);
+    if (board == NULL)
+        return NULL;
+    for (square = 0; square < self->size; square++)
+        PyList_SET_ITEM(board, square, PyLong_FromLong(tile_at(self, key, square)));
+    return board;
+}
+
+static PyObject *Engine_evaluate(Engine *self, PyObject *arg)
+{
+    uint64_t key = PyLong_AsUnsignedLongLong(arg);
+    if (key == (uint64_t)-1 && PyErr_Occurred())
+        return NULL;
+    return PyLong_FromLong(evaluate_key(self, key));
+}
+
+static PyObject *Engine_expand(Engine *self, PyObject *args)
+{
+    unsigned long long key;
+    int blank, previous, h, i, count;
+    int8_t positions[MAX_SQUARES];
+    PyObject *children;
+
+    if (!PyArg_ParseTuple(args, "Kiii", &key, &blank, &previous, &h))
+        return NULL;
+    if (blank < 0 || blank >= self->size || previous < -1 || previous > 3) {
+        PyErr_SetString(PyExc_ValueError, "Vị trí ô trống hoặc mã nước đi không hợp lệ");
+        return NULL;
+    }
+    if (previous < 0)
+        previous = 4;
+    if (self->groups)
+        key_positions(self, key, positions);
+
+    count = self->successor_count[blank][previous];
+    children = PyList_New(count);
+    if (children == NULL)
+        return NULL;
+    for (i = 0; i < count; i++) {
+        int code = self->successor_code[blank][previous][i];
+        int target = self->successor_target[blank][previous][i];
+        uint64_t tile = (key >> (self->bits * target)) & self->mask;
+        uint64_t new_key = key ^ (tile << (self->bits * target)) ^ (tile << (self->bits * blank));
+        int new_h, group = self->group_of[tile];
+        PyObject *child;
+        if (self->groups == 0) {
+            new_h = h - self->manhattan[tile][target] + self->manhattan[tile][blank];
+        } else if (group < 0) {
+            new_h = h;
+        } else {
+            int old_value = group_value(self, group, positions);
+            positions[tile] = (int8_t)blank;
+            new_h = h - old_value + group_value(self, group, positions);
+            positions[tile] = (int8_t)target;
+        }
+        child = Py_BuildValue("(iKii)", code, (unsigned long long)new_key, target, new_h);
+        if (child == NULL) {
+            Py_DECREF(children);
+            return NULL;
+        }
+        PyList_SET_ITEM(children, i, child);
+    }
+    return children;
+}
+
+/* ------------------------------------------------------------------ IDA* */
+
+/* Gọi poll(explored, depth, h, f); trả về khác 0 nếu phải dừng */
+static int poll_search(Search *s, int depth, int h, int f)
+{
+    PyObject *result = PyObject_CallFunction(s->poll, "Kiii", s->explored, depth, h, f);
+    int stop;
+    if (result == NULL) {
+        s->error = 1;
+        return 1;
+    }
+    stop = PyObject_IsTrue(result);
+    Py_DECREF(result);
+    if (stop < 0) {
+        s->error = 1;
+        return 1;
+    }
+    return stop;
+}
+
+/* Tìm kiếm theo chiều sâu có giới hạn f <= bound: -1 nếu tới đích, ngược lại f nhỏ nhất vượt bound */
+static int search(Search *s, uint64_t key, int g, int h, int blank, int previous)
+{
+    const Engine *e = s->engine;
+    int f = g + h, next_bound = NO_BOUND, i, count;
+
+    if (f > s->bound)
+        return f;
+    if (key == e->goal_key) {
+        s->length = g;
+        return -1;
+    }
+    if (s->stopped)
+        return NO_BOUND;
+
+    s->explored++;
+    if (g >= s->max_depth)
+        s->max_depth = g + 1;
+    if (s->poll != NULL && s->explored % s->interval == 0 && poll_search(s, g + 1, h, f)) {
+        s->stopped = 1;
+        return NO_BOUND;
+    }
+    if (g >= MAX_DEPTH)
+        return NO_BOUND;
+
+    count = e->successor_count[blank][previous];
+    for (i = 0; i < count; i++) {
+        int code = e->successor_code[blank][previous][i];
+        int target = e->successor_target[blank][previous][i];
+        uint64_t tile = (key >> (e->bits * target)) & e->mask;
+        uint64_t new_key = key ^ (tile << (e->bits * target)) ^ (tile << (e->bits * blank));
+        int new_h, result, group = e->group_of[tile], old_value = 0;
+
+        if (e->groups == 0) {
+            new_h = h - e->manhattan[tile][target] + e->manhattan[tile][blank];
+        } else if (group < 0) {
+            new_h = h;
+        } else {
+            old_value = s->values[group];
+            s->positions[tile] = (int8_t)blank;
+            s->values[group] = group_value(e, group, s->positions);
+            new_h = h - old_value + s->values[group];
+        }
+
+        s->codes[g] = (uint8_t)code;
+        result = search(s, new_key, g + 1, new_h, target, code);
+
+        if (group >= 0 && e->groups) {
+            s->positions[tile] = (int8_t)target;
+            s->values[group] = old_value;
+        }
+        if (result == -1)
+            return -1;
+        if (result < next_bound)
+            next_bound = result;
+        if (s->stopped)
+            return NO_BOUND;
+    }
+    return next_bound;
+}
+
+static PyObject *Engine_ida(Engine *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"key", "blank", "h", "bound", "poll", "interval", NULL};
+    unsigned long long key, interval = 4096;
+    int blank, h, bound, result, group;
+    PyObject *poll = Py_None;
+    Search s;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "Kiii|OK", kwlist, &key, &blank, &h, &bound,
+                                     &poll, &interval))
+        return NULL;
+    if (blank < 0 || blank >= self->size || tile_at(self, key, blank) != 0) {
+        PyErr_SetString(PyExc_ValueError, "Vị trí ô trống không khớp với key");
+        return NULL;
+    }
+
+    s.engine = self;
+    s.bound = bound;
+    s.explored = 0;
+    s.max_depth = 0;
+    s.length = 0;
+    s.stopped = 0;
+    s.error = 0;
+    s.poll = poll == Py_None ? NULL : poll;
+    s.interval = interval ? interval : 1;
+    if (self->groups) {
+        key_positions(self, key, s.positions);
+        for (group = 0; group < self->groups; group++)
+            s.values[group] = group_value(self, group, s.positions);
+    }
+
+    result = search(&s, (uint64_t)key, 0, h, blank, 4);
+    if (s.error)
+        return NULL;
+    /* Không còn node nào vượt ngưỡng: trả về None thay cho vô cực */
+    if (result == NO_BOUND)
+        return Py_BuildValue("(Oy#KiO)", Py_None, (const char *)s.codes, (Py_ssize_t)0, s.explored,
+                             s.max_depth, s.stopped ? Py_True : Py_False);
+    return Py_BuildValue("(iy#KiO)", result, (const char *)s.codes, (Py_ssize_t)(result == -1 ? s.length : 0),
+                         s.explored, s.max_depth, s.stopped ? Py_True : Py_False);
+}
+
+static PyMethodDef Engine_methods[] = {
+    {"pack", (PyCFunction)Engine_pack, METH_O, "Nén bảng thành key (như BoardGeometry.pack)"},
+    {"unpack", (PyCFunction)Engine_unpack, METH_O, "Giải nén key về danh sách ô"},
+    {"evaluate", (PyCFunction)Engine_evaluate, METH_O, "Heuristic đầy đủ của một key"},
+    {"expand", (PyCFunction)Engine_expand, METH_VARARGS,
+     "expand(key, blank, previous, h) -> [(mã nước đi, key con, ô trống mới, h con), ...]"},
+    {"ida", (PyCFunction)(void (*)(void))Engine_ida, METH_VARARGS | METH_KEYWORDS,
+     "ida(key, blank, h, bound, poll=None, interval=4096) -> (kết quả, mã nước đi, explored, "
+     "độ sâu lớn nhất, đã dừng); kết quả -1 nếu tới đích, None nếu không còn ngưỡng tiếp theo"},
+    {NULL, NULL, 0, NULL}
+};
+
+static PyTypeObject EngineType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_puzzle_accel.Engine",
+    .tp_doc = "Bảng tính sẵn và vòng lặp tìm kiếm cho một kích thước bảng và một heuristic",
+    .tp_basicsize = sizeof(Engine),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)Engine_init,
+    .tp_dealloc = (destructor)Engine_dealloc,
+    .tp_methods = Engine_methods,
+};
+
+static struct PyModuleDef accel_module = {
+    PyModuleDef_HEAD_INIT,
+    .m_name = "_puzzle_accel",
+    .m_doc = "Backend C tùy chọn cho puzzle_core (sinh bằng build_accel.py)",
+    .m_size = -1,
+};
+
+PyMODINIT_FUNC PyInit__puzzle_accel(void)
+{
+    PyObject *module;
+    if (PyType_Ready(&EngineType) < 0)
+        return NULL;
+    module = PyModule_Create(&accel_module);
+    if (module == NULL)
+        return NULL;
+    Py_INCREF(&EngineType);
+    if (PyModule_AddObject(module, "Engine", (PyObject *)&EngineType) < 0) {
+        Py_DECREF(&EngineType);
+        Py_DECREF(module);
+        return NULL;
+    }
+    if (PyModule_AddIntConstant(module, "MAX_DEPTH", MAX_DEPTH) < 0) {
+        Py_DECREF(module);
+        return NULL;
+    }
+    return module;
+}
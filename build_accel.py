@@ -0,0 +1,64 @@
+"""Sinh backend C tùy chọn (_puzzle_accel) cho puzzle_core
+
+Cần trình biên dịch C và header của Python (gói python3-dev). Module được ghi
+cạnh puzzle_core.py; khi chưa sinh hoặc không nạp được, puzzle_core tự dùng bản
+Python thuần. Đặt biến môi trường PUZZLE_BACKEND=python để tắt backend C.
+
+Cách dùng:
+    python build_accel.py
+    python build_accel.py --clean
+"""
+import argparse
+import glob
+import os
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SOURCE = os.path.join(HERE, '_puzzle_accel.c')
+
+
+def build(verbose: bool = False) -> str:
+    """Biên dịch _puzzle_accel.c, trả về đường dẫn module vừa sinh"""
+    from setuptools import Extension
+    from setuptools.dist import Distribution
+
+    extra_args = [] if os.name == 'nt' else ['-O3']
+    extension = Extension('_puzzle_accel', [SOURCE], extra_compile_args=extra_args)
+    distribution = Distribution({'name': '_puzzle_accel', 'ext_modules': [extension]})
+    distribution.verbose = verbose
+    with tempfile.TemporaryDirectory() as build_temp:
+        command = distribution.get_command_obj('build_ext')
+        command.build_lib = HERE
+        command.build_temp = build_temp
+        command.ensure_finalized()
+        distribution.run_command('build_ext')
+        return command.get_ext_fullpath('_puzzle_accel')
+
+
+def clean() -> list:
+    """Xóa các module đã sinh, trả về danh sách file đã xóa"""
+    removed = []
+    for pattern in ('_puzzle_accel*.so', '_puzzle_accel*.pyd'):
+        for path in glob.glob(os.path.join(HERE, pattern)):
+            os.remove(path)
+            removed.append(path)
+    return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sinh backend C tùy chọn cho bộ giải")
+    parser.add_argument('--clean', action='store_true', help="Xóa module đã sinh (quay về Python thuần)")
+    parser.add_argument('--verbose', action='store_true', help="In lệnh biên dịch")
+    args = parser.parse_args(argv)
+
+    if args.clean:
+        removed = clean()
+        print(f"🗑 Đã xóa {len(removed)} file" + ''.join(f"\n  {path}" for path in removed))
+        return
+
+    path = build(args.verbose)
+    print(f"✅ Đã sinh {path}")
+
+
+if __name__ == '__main__':
+    main()
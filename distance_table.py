@@ -0,0 +1,189 @@
+"""Bảng khoảng cách chính xác cho bảng nhỏ (8-puzzle 3x3, 2x4, 2x3)
+
+8-puzzle chỉ có 181440 trạng thái giải được nên có thể lưu số bước tối ưu của
+từng trạng thái. Bảng được sinh bằng BFS từ đích, đánh chỉ số theo mã Lehmer
+của hoán vị (puzzle_ranking) và nén 4 bit mỗi trạng thái: chỉ lưu khoảng cách
+mod 16. Hai trạng thái kề nhau luôn lệch đúng 1 bước nên mod 16 đủ để đi
+xuống: mỗi bước chọn ô kề có mã bằng mã hiện tại trừ 1.
+
+Cách dùng:
+    python distance_table.py build --width 3 --height 3
+    python distance_table.py info distances_3x3.bin
+"""
+import argparse
+import itertools
+import os
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+
+from puzzle_core import SMALL_BOARD_SQUARES, BoardGeometry, get_geometry
+from puzzle_ranking import rank_permutation, table_size
+
+# Định dạng file: header (kích thước bảng, khoảng cách lớn nhất) + dữ liệu 4 bit mỗi trạng thái
+TABLE_MAGIC = b'DIST\x00\x00\x00\x00'
+_HEADER = struct.Struct('<8sBBB')
+
+_tables: Dict[Tuple[int, int], 'DistanceTable'] = {}
+
+
+def default_table_path(geometry: BoardGeometry) -> str:
+    """File bảng mặc định cạnh module: distances_<width>x<height>.bin"""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        f'distances_{geometry.width}x{geometry.height}.bin')
+
+
+class DistanceTable:
+    """Khoảng cách tối ưu (mod 16) tới đích của mọi hoán vị, chỉ số là rank_permutation(board)"""
+
+    def __init__(self, geometry: BoardGeometry, data, max_distance: int):
+        if len(data) != (table_size(geometry.size, geometry.size) + 1) // 2:
+            raise ValueError(f"Kích thước dữ liệu không khớp với bảng {geometry.width}x{geometry.height}")
+        self.geometry = geometry
+        self.data = data
+        # Lời giải không bao giờ dài hơn; dùng để phát hiện bảng không giải được
+        self.max_distance = max_distance
+
+    @classmethod
+    def build(cls, geometry: BoardGeometry, progress=None) -> 'DistanceTable':
+        """Sinh bảng bằng BFS từ đích rồi ghi khoảng cách theo chỉ số Lehmer"""
+        if geometry.size > SMALL_BOARD_SQUARES:
+            raise ValueError(f"Bảng {geometry.width}x{geometry.height} quá lớn cho bảng khoảng cách chính xác")
+        neighbors = geometry.neighbors
+        goal = tuple(geometry.goal)
+        distances = {goal: 0}
+        layer = [(goal, geometry.size - 1)]
+        depth = 0
+        while layer:
+            if progress:
+                progress(depth, len(layer))
+            depth += 1
+            next_layer = []
+            for board, blank in layer:
+                for _, square in neighbors[blank]:
+                    child = list(board)
+                    child[blank], child[square] = board[square], 0
+                    child = tuple(child)
+                    if child not in distances:
+                        distances[child] = depth
+                        next_layer.append((child, square))
+            layer = next_layer
+
+        # itertools.permutations sinh hoán vị theo thứ tự từ điển, trùng với thứ tự
+        # rank_permutation nên không cần tính chỉ số cho từng trạng thái.
+        # Trạng thái không giải được giữ mã 0; chúng không bao giờ được tra.
+        data = bytearray((table_size(geometry.size, geometry.size) + 1) // 2)
+        for rank, permutation in enumerate(itertools.permutations(range(geometry.size))):
+            distance = distances.get(permutation)
+            if distance is not None:
+                data[rank >> 1] |= (distance & 15) << (4 * (rank & 1))
+        return cls(geometry, data, depth - 1)
+
+    def save(self, path: str):
+        """Ghi bảng ra file nhị phân"""
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(TABLE_MAGIC, self.geometry.width, self.geometry.height, self.max_distance))
+            f.write(self.data)
+
+    @classmethod
+    def load(cls, path: str) -> 'DistanceTable':
+        """Nạp bảng từ file (vài trăm KB nên đọc toàn bộ vào bộ nhớ)"""
+        with open(path, 'rb') as f:
+            content = f.read()
+        if len(content) < _HEADER.size:
+            raise ValueError(f"File bảng khoảng cách không hợp lệ: {path}")
+        magic, width, height, max_distance = _HEADER.unpack_from(content, 0)
+        if magic != TABLE_MAGIC:
+            raise ValueError(f"File bảng khoảng cách không hợp lệ: {path}")
+        return cls(get_geometry(width, height), content[_HEADER.size:], max_distance)
+
+    def code(self, board: List[int]) -> int:
+        """Khoảng cách mod 16 của một bảng"""
+        rank = rank_permutation(board)
+        return (self.data[rank >> 1] >> (4 * (rank & 1))) & 15
+
+    def solve(self, board: List[int]) -> List[int]:
+        """Dãy mã nước đi tối ưu (chỉ số trong DIRECTIONS); ValueError nếu không giải được"""
+        geometry = self.geometry
+        if not geometry.is_valid(board):
+            raise ValueError(f"Bảng không hợp lệ cho kích thước {geometry.width}x{geometry.height}")
+        board = list(board)
+        blank = board.index(0)
+        current = self.code(board)
+        codes = []
+        while board != geometry.goal:
+            if len(codes) >= self.max_distance:
+                raise ValueError("Puzzle này không thể giải được")
+            target = (current - 1) & 15
+            for code, square in geometry.neighbors[blank]:
+                board[blank], board[square] = board[square], 0
+                if self.code(board) == target:
+                    break
+                board[square], board[blank] = board[blank], 0
+            else:
+                raise ValueError("Puzzle này không thể giải được")
+            codes.append(code)
+            blank, current = square, target
+        return codes
+
+    def __repr__(self):
+        return f"DistanceTable({self.geometry.width}x{self.geometry.height}, max {self.max_distance})"
+
+
+def distance_table_available(geometry: BoardGeometry) -> bool:
+    """Bảng của kích thước này đã nạp hoặc đã có file mặc định (không phải sinh lại)"""
+    return geometry.shape in _tables or os.path.exists(default_table_path(geometry))
+
+
+def load_distance_table(geometry: BoardGeometry, path: Optional[str] = None) -> DistanceTable:
+    """Bảng dùng chung cho một kích thước: nạp từ file nếu đã sinh, ngược lại sinh rồi
+    ghi ra file (bỏ qua nếu không ghi được) để các tiến trình sau không phải sinh lại"""
+    table = _tables.get(geometry.shape)
+    if table is None:
+        path = path or default_table_path(geometry)
+        if os.path.exists(path):
+            table = DistanceTable.load(path)
+            if table.geometry is not geometry:
+                raise ValueError(f"File {path} là bảng {table.geometry.width}x{table.geometry.height}")
+        else:
+            table = DistanceTable.build(geometry)
+            try:
+                table.save(path)
+            except OSError:
+                pass
+        _tables[geometry.shape] = table
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sinh và kiểm tra bảng khoảng cách chính xác cho bảng nhỏ")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = sub.add_parser('build', help="Sinh bảng bằng BFS và ghi ra file")
+    build_parser.add_argument('--width', type=int, default=3)
+    build_parser.add_argument('--height', type=int, default=3)
+    build_parser.add_argument('--output', help="Mặc định: distances_<width>x<height>.bin cạnh module")
+
+    info_parser = sub.add_parser('info', help="Hiển thị thông tin file bảng")
+    info_parser.add_argument('path')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        geometry = get_geometry(args.width, args.height)
+        start_time = time.time()
+
+        def progress(depth, count):
+            print(f"  độ sâu {depth}: {count:,} trạng thái")
+
+        table = DistanceTable.build(geometry, progress)
+        output = args.output or default_table_path(geometry)
+        table.save(output)
+        print(f"✅ Đã ghi {table!r} vào {output} ({time.time() - start_time:.1f}s, {len(table.data):,} byte)")
+    else:
+        table = DistanceTable.load(args.path)
+        print(f"{table!r}: {len(table.data):,} byte")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+"""Pattern Database (PDB) cộng dồn rời rạc cho 15-puzzle (và 24-puzzle 5x5)
+
+Các ô số được chia thành những nhóm rời nhau (ví dụ 6-6-3 hoặc 7-8). Với mỗi
+nhóm, bảng lưu số bước tối thiểu để đưa các ô của nhóm về đúng vị trí, chỉ
+tính những bước di chuyển ô thuộc nhóm. Vì các nhóm rời nhau nên có thể cộng
+giá trị của các bảng mà heuristic vẫn admissible.
+
+Bảng được sinh một lần bằng BFS ngược từ trạng thái đích, ghi ra file nhị phân
+và nạp lại bằng mmap nên khởi động tiến trình giải chỉ mất vài mili giây.
+
+Cách dùng:
+    python pattern_database.py build --partition 663 --output pdb_663.bin
+    python pattern_database.py build --size 5 --partition 24-55554 --output pdb_24.bin
+    python pattern_database.py info pdb_663.bin
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+from puzzle_core import GEOMETRY_4x4, BoardGeometry, Heuristic, get_geometry
+from puzzle_ranking import rank_positions, table_size, unrank_positions
+from puzzle_symmetry import mirror_board
+
+# Cách chia ô chuẩn (đích: 1..15 theo thứ tự, ô trống ở cuối)
+PARTITION_663 = ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4))
+PARTITION_78 = ((1, 2, 3, 4, 5, 6, 7), (8, 9, 10, 11, 12, 13, 14, 15))
+PARTITION_555 = ((1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15))
+
+# 24-puzzle (5x5): mỗi nhóm 6 ô cần 25!/19! ~ 127 triệu mục, nhóm 5 ô ~ 6,4 triệu mục
+PARTITION_24_6666 = ((1, 2, 6, 7, 11, 12), (3, 4, 5, 8, 9, 10), (16, 17, 18, 21, 22, 23),
+                     (13, 14, 15, 19, 20, 24))
+PARTITION_24_55554 = ((1, 2, 3, 6, 7), (4, 5, 8, 9, 10), (11, 12, 16, 17, 21), (13, 14, 15, 18, 19),
+                      (20, 22, 23, 24))
+
+PARTITIONS = {
+    '663': PARTITION_663,
+    '78': PARTITION_78,
+    '555': PARTITION_555,
+    '24-6666': PARTITION_24_6666,
+    '24-55554': PARTITION_24_55554,
+}
+
+DEFAULT_PDB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pdb_663.bin')
+
+# Định dạng file: header + mô tả từng bảng + dữ liệu bảng (mỗi ô 1 byte).
+# Phiên bản 2 thêm kích thước bảng vào header; file phiên bản 1 luôn là 4x4.
+PDB_MAGIC = b'PDB15\x00\x00\x00'
+PDB_VERSION = 2
+_HEADER_V1 = struct.Struct('<8sHH')
+_HEADER = struct.Struct('<8sHHBB')
+_DESCRIPTOR = struct.Struct('<B16sQQ')
+_UNSEEN = 255
+
+
+def _build_table(pattern: Sequence[int], progress=None, geometry: BoardGeometry = GEOMETRY_4x4) -> bytearray:
+    """Sinh bảng cho một nhóm ô bằng BFS ngược từ trạng thái đích.
+
+    Trạng thái BFS gồm vị trí các ô trong nhóm và vị trí ô trống. Ô trống đi
+    qua các ô ngoài nhóm không tốn chi phí nên cả vùng liên thông của nó được
+    xử lý cùng lúc; chỉ việc đẩy một ô trong nhóm mới tăng độ sâu.
+    """
+    k = len(pattern)
+    squares = geometry.size
+    neighbors = [[n for _, n in moves] for moves in geometry.neighbors]
+    size = table_size(k, squares)
+    table = bytearray([_UNSEEN]) * size
+    # Bitmask (một bit mỗi ô): những vị trí ô trống đã thăm ứng với mỗi cấu hình nhóm
+    visited = array('H' if squares <= 16 else 'L', [0]) * size
+
+    goal_rank = rank_positions([tile - 1 for tile in pattern], squares)
+    layer = [goal_rank * squares + squares - 1]
+    depth = 0
+
+    while layer:
+        next_layer = []
+        for code in layer:
+            rank, blank = divmod(code, squares)
+            if visited[rank] >> blank & 1:
+                continue
+
+            positions = unrank_positions(rank, k, squares)
+            occupied = {p: idx for idx, p in enumerate(positions)}
+
+            # Vùng ô trống có thể tới mà không đẩy ô nào trong nhóm
+            region = [blank]
+            mask = 1 << blank
+            for cell in region:
+                for n in neighbors[cell]:
+                    if not mask >> n & 1 and n not in occupied:
+                        mask |= 1 << n
+                        region.append(n)
+            visited[rank] |= mask
+            if table[rank] == _UNSEEN:
+                table[rank] = depth
+
+            for cell in region:
+                for n in neighbors[cell]:
+                    idx = occupied.get(n)
+                    if idx is not None:
+                        moved = positions[:]
+                        moved[idx] = cell
+                        new_rank = rank_positions(moved, squares)
+                        if not visited[new_rank] >> n & 1:
+                            next_layer.append(new_rank * squares + n)
+
+        if progress:
+            progress(pattern, depth, len(layer))
+        layer = next_layer
+        depth += 1
+
+    return table
+
+
+class PatternDatabase(Heuristic):
+    """Heuristic PDB cộng dồn: h(n) = tổng giá trị các bảng của từng nhóm ô"""
+
+    name = 'pdb'
+
+    def __init__(self, patterns: Sequence[Sequence[int]], tables: Sequence, source=None, path=None,
+                 reflect: bool = False, geometry: BoardGeometry = GEOMETRY_4x4):
+        self.patterns = tuple(tuple(p) for p in patterns)
+        self.tables = list(tables)
+        self._source = source
+        # Đường dẫn file (nếu nạp từ file) để tiến trình khác có thể tự nạp lại
+        self.path = path
+        self.geometry = geometry
+        self.shape = geometry.shape
+        # Lấy max của bảng và ảnh đối xứng qua đường chéo (vẫn admissible)
+        self.reflect = reflect
+        self._validate()
+        # Nhóm chứa từng ô số (None nếu ô không thuộc nhóm nào)
+        self._group_of = [None] * geometry.size
+        for group, pattern in enumerate(self.patterns):
+            for tile in pattern:
+                self._group_of[tile] = group
+
+    def _validate(self):
+        squares = self.geometry.size
+        if self.reflect and self.shape != (4, 4):
+            raise ValueError("reflect chỉ hỗ trợ PDB của bảng 4x4")
+        seen = set()
+        for pattern, table in zip(self.patterns, self.tables):
+            if seen & set(pattern) or not set(pattern) <= set(range(1, squares)):
+                raise ValueError(f"Nhóm ô không hợp lệ: {pattern}")
+            seen |= set(pattern)
+            if len(table) != table_size(len(pattern), squares):
+                raise ValueError(f"Kích thước bảng không khớp với nhóm {pattern}")
+        if len(self.patterns) != len(self.tables):
+            raise ValueError("Số bảng không khớp với số nhóm ô")
+
+    @classmethod
+    def build(cls, partition: Sequence[Sequence[int]] = PARTITION_663, progress=None,
+              geometry: BoardGeometry = GEOMETRY_4x4) -> 'PatternDatabase':
+        """Sinh tất cả các bảng trong bộ nhớ"""
+        return cls(partition, [_build_table(pattern, progress, geometry) for pattern in partition],
+                   geometry=geometry)
+
+    def save(self, path: str):
+        """Ghi PDB ra file nhị phân"""
+        offset = _HEADER.size + _DESCRIPTOR.size * len(self.patterns)
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(PDB_MAGIC, PDB_VERSION, len(self.patterns), *self.shape))
+            for pattern, table in zip(self.patterns, self.tables):
+                f.write(_DESCRIPTOR.pack(len(pattern), bytes(pattern), offset, len(table)))
+                offset += len(table)
+            for table in self.tables:
+                f.write(table)
+
+    @classmethod
+    def load(cls, path: str, reflect: bool = False) -> 'PatternDatabase':
+        """Nạp PDB bằng mmap (không đọc toàn bộ file vào bộ nhớ)"""
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, count = _HEADER_V1.unpack_from(mm, 0)
+            if magic != PDB_MAGIC or version not in (1, PDB_VERSION):
+                raise ValueError(f"File PDB không hợp lệ: {path}")
+            if version == 1:
+                header_size, geometry = _HEADER_V1.size, GEOMETRY_4x4
+            else:
+                _, _, _, width, height = _HEADER.unpack_from(mm, 0)
+                header_size, geometry = _HEADER.size, get_geometry(width, height)
+
+            view = memoryview(mm)
+            patterns, tables = [], []
+            for i in range(count):
+                k, tiles, offset, size = _DESCRIPTOR.unpack_from(mm, header_size + i * _DESCRIPTOR.size)
+                if offset + size > len(mm):
+                    raise ValueError(f"File PDB bị cắt cụt: {path}")
+                patterns.append(tuple(tiles[:k]))
+                tables.append(view[offset:offset + size])
+            return cls(patterns, tables, source=mm, path=path, reflect=reflect, geometry=geometry)
+        except Exception:
+            mm.close()
+            raise
+
+    def close(self):
+        """Giải phóng mmap (nếu PDB được nạp từ file)"""
+        if self._source is not None:
+            for table in self.tables:
+                if isinstance(table, memoryview):
+                    table.release()
+            self._source.close()
+            self._source = None
+            self.tables = []
+
+    def __call__(self, board: List[int]) -> int:
+        """Tính giá trị heuristic cho một bảng"""
+        if self.reflect:
+            return max(self._lookup(board), self._lookup(mirror_board(board)))
+        return self._lookup(board)
+
+    def update(self, key: int, new_key: int, h: int, tile: int, from_index: int, to_index: int) -> int:
+        """Chỉ nhóm chứa ô vừa di chuyển thay đổi giá trị"""
+        if self.reflect:
+            return self(self.geometry.unpack(new_key))
+        group = self._group_of[tile]
+        if group is None:
+            return h
+        geometry = self.geometry
+        bits, mask, squares = geometry.bits, geometry.mask, geometry.size
+        positions = [0] * squares
+        for square in range(squares):
+            positions[(new_key >> (bits * square)) & mask] = square
+        new_positions = [positions[t] for t in self.patterns[group]]
+        old_positions = [from_index if t == tile else positions[t] for t in self.patterns[group]]
+        table = self.tables[group]
+        return (h - table[rank_positions(old_positions, squares)]
+                + table[rank_positions(new_positions, squares)])
+
+    def accel_tables(self):
+        """Backend C tra trực tiếp các bảng; bản reflect vẫn tính bằng Python"""
+        if self.reflect:
+            return None
+        return self.patterns, self.tables
+
+    def _lookup(self, board: List[int]) -> int:
+        """Tổng giá trị các bảng cho một bảng"""
+        squares = self.geometry.size
+        positions = [0] * squares
+        for i, tile in enumerate(board):
+            positions[tile] = i
+
+        total = 0
+        for pattern, table in zip(self.patterns, self.tables):
+            total += table[rank_positions([positions[tile] for tile in pattern], squares)]
+        return total
+
+    def __repr__(self):
+        sizes = '-'.join(str(len(p)) for p in self.patterns)
+        if self.shape != (4, 4):
+            return f"PatternDatabase({sizes}, {self.shape[0]}x{self.shape[1]})"
+        return f"PatternDatabase({sizes})"
+
+
+def load_default_pattern_database(reflect: bool = False) -> Optional[PatternDatabase]:
+    """Nạp PDB mặc định nếu file đã được sinh, ngược lại trả về None"""
+    path = os.environ.get('PUZZLE_PDB', DEFAULT_PDB_PATH)
+    if not os.path.exists(path):
+        return None
+    return PatternDatabase.load(path, reflect=reflect)
+
+
+def parse_partition(text: str) -> Tuple[Tuple[int, ...], ...]:
+    """Đọc cách chia ô: tên có sẵn (xem PARTITIONS) hoặc dạng '1,2,3/4,5,6/...'"""
+    if text in PARTITIONS:
+        return PARTITIONS[text]
+    return tuple(tuple(int(x) for x in group.split(',')) for group in text.split('/'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sinh và kiểm tra Pattern Database cho 15-puzzle")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = sub.add_parser('build', help="Sinh PDB bằng BFS ngược và ghi ra file")
+    build_parser.add_argument('--partition', default='663',
+                              help=f"{', '.join(PARTITIONS)} hoặc dạng '1,2,3/4,5,6/...'")
+    build_parser.add_argument('--size', type=int, default=4, help="Kích thước bảng vuông (4 hoặc 5)")
+    build_parser.add_argument('--output', default=DEFAULT_PDB_PATH)
+
+    info_parser = sub.add_parser('info', help="Hiển thị thông tin file PDB")
+    info_parser.add_argument('path')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        partition = parse_partition(args.partition)
+        start_time = time.time()
+
+        def progress(pattern, depth, count):
+            print(f"  nhóm {pattern}: độ sâu {depth}, {count:,} trạng thái", file=sys.stderr)
+
+        pdb = PatternDatabase.build(partition, progress, get_geometry(args.size))
+        pdb.save(args.output)
+        print(f"✅ Đã ghi {pdb!r} vào {args.output} ({time.time() - start_time:.1f}s)")
+    else:
+        pdb = PatternDatabase.load(args.path)
+        for pattern, table in zip(pdb.patterns, pdb.tables):
+            print(f"Nhóm {pattern}: {len(table):,} mục, giá trị lớn nhất {max(table)}")
+        pdb.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""Giải hàng loạt puzzle song song trên tất cả các nhân CPU
+
+Mỗi bảng được giải trong một tiến trình riêng của ProcessPoolExecutor nên không
+bị giới hạn bởi GIL. Kết quả được trả về ngay khi từng bảng giải xong.
+
+Cách dùng:
+    python puzzle_batch.py boards.txt --workers 8 --timeout 30 > results.jsonl
+    cat boards.txt | python puzzle_batch.py - --algorithm ida
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from puzzle_cache import SolutionCache
+from puzzle_core import PuzzleSolver, deadline_stop_callback, geometry_for
+from puzzle_heuristics import HEURISTICS, create_heuristic
+
+# Bộ giải của tiến trình worker (khởi tạo một lần cho mỗi tiến trình)
+_worker_solver = None
+
+
+def _init_worker(pdb_path: Optional[str], cache_path: Optional[str] = None, heuristic: Optional[str] = None):
+    """Khởi tạo bộ giải trong tiến trình worker, tạo heuristic và mở cache một lần nếu có"""
+    global _worker_solver
+    heuristic = create_heuristic(heuristic or ('pdb' if pdb_path else 'manhattan'), pdb_path)
+    cache = SolutionCache(cache_path) if cache_path else None
+    _worker_solver = PuzzleSolver(heuristic=heuristic, cache=cache)
+
+
+def solve_one(solver: PuzzleSolver, index: int, board: List[int], timeout: Optional[float],
+              options: Dict) -> Dict:
+    """Giải một bảng, dừng khi vượt quá timeout (giây), trả về kết quả dạng dict"""
+    deadline = time.monotonic() + timeout if timeout else None
+    stop_callback = deadline_stop_callback(deadline) if deadline else None
+
+    solution, stats = solver.solve(board, stop_callback=stop_callback, **options)
+    timed_out = solution is None and deadline is not None and time.monotonic() > deadline
+
+    return {
+        'index': index,
+        'board': board,
+        'solved': solution is not None,
+        'timed_out': timed_out,
+        'moves': [state.last_move for state in solution[1:]] if solution else [],
+        'stats': stats,
+    }
+
+
+def _solve_task(index: int, board: List[int], timeout: Optional[float], options: Dict) -> Dict:
+    """Giải một bảng trong tiến trình worker"""
+    solver = _worker_solver if _worker_solver is not None else PuzzleSolver()
+    return solve_one(solver, index, board, timeout, options)
+
+
+def _task_result(future, index: int, board: List[int]) -> Dict:
+    """Kết quả của một task; lỗi khi giải bảng đó thành bản ghi có 'error' thay vì dừng cả lô"""
+    try:
+        return future.result()
+    except Exception as exc:
+        return {
+            'index': index,
+            'board': board,
+            'solved': False,
+            'timed_out': False,
+            'moves': [],
+            'error': f"{type(exc).__name__}: {exc}",
+        }
+
+
+def solve_batch(boards: Iterable[List[int]], workers: Optional[int] = None,
+                timeout: Optional[float] = None, pdb_path: Optional[str] = None,
+                cache_path: Optional[str] = None, heuristic: Optional[str] = None,
+                **solve_options) -> Iterator[Dict]:
+    """Giải nhiều bảng song song, trả về từng kết quả ngay khi xong (không theo thứ tự).
+    Bảng giải bị lỗi cho kết quả có khóa 'error' và các bảng còn lại vẫn được giải.
+
+    boards: iterable các bảng vuông, ví dụ 16 số (có thể là generator đọc từ file lớn)
+    workers: số tiến trình, mặc định bằng số nhân CPU
+    timeout: giới hạn thời gian giải cho mỗi bảng (giây)
+    pdb_path: file PatternDatabase nạp trong mỗi worker
+    cache_path: file sqlite của SolutionCache dùng chung giữa các worker
+    heuristic: tên heuristic (puzzle_heuristics.HEURISTICS), mặc định 'pdb' nếu có pdb_path
+    solve_options: tham số thêm cho PuzzleSolver.solve (algorithm, frontier_type)
+    """
+    workers = workers or os.cpu_count() or 1
+    # Giới hạn số task đang chờ để không đọc hết input vào bộ nhớ
+    max_pending = workers * 4
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(pdb_path, cache_path, heuristic)) as executor:
+        # future -> (index, board) để dựng bản ghi lỗi
+        tasks = {}
+        for index, board in enumerate(boards):
+            board = list(board)
+            tasks[executor.submit(_solve_task, index, board, timeout, solve_options)] = (index, board)
+            if len(tasks) >= max_pending:
+                done, _ = wait(tasks, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield _task_result(future, *tasks.pop(future))
+
+        while tasks:
+            done, _ = wait(tasks, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield _task_result(future, *tasks.pop(future))
+
+
+def parse_board(line: str) -> List[int]:
+    """Đọc một bảng từ dòng văn bản: các số cách nhau bởi dấu cách hoặc dấu phẩy.
+
+    Bảng vuông bất kỳ: 9 số (3x3), 16 số (4x4), 25 số (5x5), ...
+    """
+    numbers = [int(x) for x in line.replace(',', ' ').split()]
+    try:
+        valid = geometry_for(numbers).is_valid(numbers)
+    except ValueError:
+        valid = False
+    if not valid:
+        raise ValueError(f"Bảng không hợp lệ: {line.strip()}")
+    return numbers
+
+
+def read_boards(stream) -> Iterator[List[int]]:
+    """Đọc các bảng từ file, bỏ qua dòng trống và dòng chú thích (#)"""
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield parse_board(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Giải hàng loạt 15-puzzle song song")
+    parser.add_argument('input', help="File chứa mỗi dòng một bảng, '-' để đọc từ stdin")
+    parser.add_argument('--workers', type=int, default=None, help="Số tiến trình (mặc định: số nhân CPU)")
+    parser.add_argument('--timeout', type=float, default=None, help="Giới hạn thời gian cho mỗi bảng (giây)")
+    parser.add_argument('--algorithm', choices=['astar', 'ida'], default='astar')
+    parser.add_argument('--heuristic', choices=HEURISTICS, default=None,
+                        help="Heuristic (mặc định: pdb nếu có --pdb, ngược lại manhattan)")
+    parser.add_argument('--pdb', default=None, help="File PatternDatabase dùng làm heuristic")
+    parser.add_argument('--cache', default=None, help="File sqlite lưu lời giải đã tìm được")
+    args = parser.parse_args(argv)
+
+    stream = sys.stdin if args.input == '-' else open(args.input)
+    try:
+        for result in solve_batch(read_boards(stream), workers=args.workers, timeout=args.timeout,
+                                  pdb_path=args.pdb, cache_path=args.cache, heuristic=args.heuristic,
+                                  algorithm=args.algorithm):
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+if __name__ == '__main__':
+    main()
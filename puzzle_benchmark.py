@@ -0,0 +1,484 @@
+"""Benchmark các engine giải trên bộ bảng cố định và so sánh hai lần chạy
+
+Bộ bảng:
+- korf100: 100 bảng của Korf (1985) kèm độ dài lời giải tối ưu đã biết
+- random-D: bảng sinh bằng create_random_solvable_puzzle(D) với seed cố định
+
+Engine có dạng 'thuật_toán[:heuristic][@backend]', ví dụ astar, ida:walking-distance,
+astar:pdb, ida:pdb@python. Không có @backend thì dùng backend mặc định (C nếu đã
+chạy build_accel.py). Mỗi bảng được giải trong một tiến trình con riêng để đo
+peak RSS của đúng lần giải đó.
+
+Cách dùng:
+    python puzzle_benchmark.py run --engine astar --engine astar:linear-conflict \\
+        --corpus random-20 --corpus random-40 --output before.json
+    python puzzle_benchmark.py run --engine ida:pdb --corpus korf100 --limit 10 --timeout 60
+    python puzzle_benchmark.py run --engine ida@python --engine ida@c --corpus random-40
+    python puzzle_benchmark.py compare before.json after.json
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import puzzle_core
+from puzzle_core import BACKENDS, PuzzleSolver, PuzzleState, create_random_solvable_puzzle, deadline_stop_callback
+from puzzle_heuristics import HEURISTICS, create_heuristic
+from puzzle_instrument import peak_rss_kb
+
+# Korf (1985): bảng theo quy ước ô trống ở góc trên trái, kèm số bước tối ưu
+KORF_100 = (
+    ('14 13 15 7 11 12 9 5 6 0 2 1 4 8 10 3', 57),
+    ('13 5 4 10 9 12 8 14 2 3 7 1 0 15 11 6', 55),
+    ('14 7 8 2 13 11 10 4 9 12 5 0 3 6 1 15', 59),
+    ('5 12 10 7 15 11 14 0 8 2 1 13 3 4 9 6', 56),
+    ('4 7 14 13 10 3 9 12 11 5 6 15 1 2 8 0', 56),
+    ('14 7 1 9 12 3 6 15 8 11 2 5 10 0 4 13', 52),
+    ('2 11 15 5 13 4 6 7 12 8 10 1 9 3 14 0', 52),
+    ('12 11 15 3 8 0 4 2 6 13 9 5 14 1 10 7', 50),
+    ('3 14 9 11 5 4 8 2 13 12 6 7 10 1 15 0', 46),
+    ('13 11 8 9 0 15 7 10 4 3 6 14 5 12 2 1', 59),
+    ('5 9 13 14 6 3 7 12 10 8 4 0 15 2 11 1', 57),
+    ('14 1 9 6 4 8 12 5 7 2 3 0 10 11 13 15', 45),
+    ('3 6 5 2 10 0 15 14 1 4 13 12 9 8 11 7', 46),
+    ('7 6 8 1 11 5 14 10 3 4 9 13 15 2 0 12', 59),
+    ('13 11 4 12 1 8 9 15 6 5 14 2 7 3 10 0', 62),
+    ('1 3 2 5 10 9 15 6 8 14 13 11 12 4 7 0', 42),
+    ('15 14 0 4 11 1 6 13 7 5 8 9 3 2 10 12', 66),
+    ('6 0 14 12 1 15 9 10 11 4 7 2 8 3 5 13', 55),
+    ('7 11 8 3 14 0 6 15 1 4 13 9 5 12 2 10', 46),
+    ('6 12 11 3 13 7 9 15 2 14 8 10 4 1 5 0', 52),
+    ('12 8 14 6 11 4 7 0 5 1 10 15 3 13 9 2', 54),
+    ('14 3 9 1 15 8 4 5 11 7 10 13 0 2 12 6', 59),
+    ('10 9 3 11 0 13 2 14 5 6 4 7 8 15 1 12', 49),
+    ('7 3 14 13 4 1 10 8 5 12 9 11 2 15 6 0', 54),
+    ('11 4 2 7 1 0 10 15 6 9 14 8 3 13 5 12', 52),
+    ('5 7 3 12 15 13 14 8 0 10 9 6 1 4 2 11', 58),
+    ('14 1 8 15 2 6 0 3 9 12 10 13 4 7 5 11', 53),
+    ('13 14 6 12 4 5 1 0 9 3 10 2 15 11 8 7', 52),
+    ('9 8 0 2 15 1 4 14 3 10 7 5 11 13 6 12', 54),
+    ('12 15 2 6 1 14 4 8 5 3 7 0 10 13 9 11', 47),
+    ('12 8 15 13 1 0 5 4 6 3 2 11 9 7 14 10', 50),
+    ('14 10 9 4 13 6 5 8 2 12 7 0 1 3 11 15', 59),
+    ('14 3 5 15 11 6 13 9 0 10 2 12 4 1 7 8', 60),
+    ('6 11 7 8 13 2 5 4 1 10 3 9 14 0 12 15', 52),
+    ('1 6 12 14 3 2 15 8 4 5 13 9 0 7 11 10', 55),
+    ('12 6 0 4 7 3 15 1 13 9 8 11 2 14 5 10', 52),
+    ('8 1 7 12 11 0 10 5 9 15 6 13 14 2 3 4', 58),
+    ('7 15 8 2 13 6 3 12 11 0 4 10 9 5 1 14', 53),
+    ('9 0 4 10 1 14 15 3 12 6 5 7 11 13 8 2', 49),
+    ('11 5 1 14 4 12 10 0 2 7 13 3 9 15 6 8', 54),
+    ('8 13 10 9 11 3 15 6 0 1 2 14 12 5 4 7', 54),
+    ('4 5 7 2 9 14 12 13 0 3 6 11 8 1 15 10', 42),
+    ('11 15 14 13 1 9 10 4 3 6 2 12 7 5 8 0', 64),
+    ('12 9 0 6 8 3 5 14 2 4 11 7 10 1 15 13', 50),
+    ('3 14 9 7 12 15 0 4 1 8 5 6 11 10 2 13', 51),
+    ('8 4 6 1 14 12 2 15 13 10 9 5 3 7 0 11', 49),
+    ('6 10 1 14 15 8 3 5 13 0 2 7 4 9 11 12', 47),
+    ('8 11 4 6 7 3 10 9 2 12 15 13 0 1 5 14', 49),
+    ('10 0 2 4 5 1 6 12 11 13 9 7 15 3 14 8', 59),
+    ('12 5 13 11 2 10 0 9 7 8 4 3 14 6 15 1', 53),
+    ('10 2 8 4 15 0 1 14 11 13 3 6 9 7 5 12', 56),
+    ('10 8 0 12 3 7 6 2 1 14 4 11 15 13 9 5', 56),
+    ('14 9 12 13 15 4 8 10 0 2 1 7 3 11 5 6', 64),
+    ('12 11 0 8 10 2 13 15 5 4 7 3 6 9 14 1', 56),
+    ('13 8 14 3 9 1 0 7 15 5 4 10 12 2 6 11', 41),
+    ('3 15 2 5 11 6 4 7 12 9 1 0 13 14 10 8', 55),
+    ('5 11 6 9 4 13 12 0 8 2 15 10 1 7 3 14', 50),
+    ('5 0 15 8 4 6 1 14 10 11 3 9 7 12 2 13', 51),
+    ('15 14 6 7 10 1 0 11 12 8 4 9 2 5 13 3', 57),
+    ('11 14 13 1 2 3 12 4 15 7 9 5 10 6 8 0', 66),
+    ('6 13 3 2 11 9 5 10 1 7 12 14 8 4 0 15', 45),
+    ('4 6 12 0 14 2 9 13 11 8 3 15 7 10 1 5', 57),
+    ('8 10 9 11 14 1 7 15 13 4 0 12 6 2 5 3', 56),
+    ('5 2 14 0 7 8 6 3 11 12 13 15 4 10 9 1', 51),
+    ('7 8 3 2 10 12 4 6 11 13 5 15 0 1 9 14', 47),
+    ('11 6 14 12 3 5 1 15 8 0 10 13 9 7 4 2', 61),
+    ('7 1 2 4 8 3 6 11 10 15 0 5 14 12 13 9', 50),
+    ('7 3 1 13 12 10 5 2 8 0 6 11 14 15 4 9', 51),
+    ('6 0 5 15 1 14 4 9 2 13 8 10 11 12 7 3', 53),
+    ('15 1 3 12 4 0 6 5 2 8 14 9 13 10 7 11', 52),
+    ('5 7 0 11 12 1 9 10 15 6 2 3 8 4 13 14', 44),
+    ('12 15 11 10 4 5 14 0 13 7 1 2 9 8 3 6', 56),
+    ('6 14 10 5 15 8 7 1 3 4 2 0 12 9 11 13', 49),
+    ('14 13 4 11 15 8 6 9 0 7 3 1 2 10 12 5', 56),
+    ('14 4 0 10 6 5 1 3 9 2 13 15 12 7 8 11', 48),
+    ('15 10 8 3 0 6 9 5 1 14 13 11 7 2 12 4', 57),
+    ('0 13 2 4 12 14 6 9 15 1 10 3 11 5 8 7', 54),
+    ('3 14 13 6 4 15 8 9 5 12 10 0 2 7 1 11', 53),
+    ('0 1 9 7 11 13 5 3 14 12 4 2 8 6 10 15', 42),
+    ('11 0 15 8 13 12 3 5 10 1 4 6 14 9 7 2', 57),
+    ('13 0 9 12 11 6 3 5 15 8 1 10 4 14 2 7', 53),
+    ('14 10 2 1 13 9 8 11 7 3 6 12 15 5 4 0', 62),
+    ('12 3 9 1 4 5 10 2 6 11 15 0 14 7 13 8', 49),
+    ('15 8 10 7 0 12 14 1 5 9 6 3 13 11 4 2', 55),
+    ('4 7 13 10 1 2 9 6 12 8 14 5 3 0 11 15', 44),
+    ('6 0 5 10 11 12 9 2 1 7 4 3 14 8 13 15', 45),
+    ('9 5 11 10 13 0 2 1 8 6 14 12 4 7 3 15', 52),
+    ('15 2 12 11 14 13 9 5 1 3 8 7 0 10 6 4', 65),
+    ('11 1 7 4 10 13 3 8 9 14 0 15 6 5 2 12', 54),
+    ('5 4 7 1 11 12 14 15 10 13 8 6 2 0 9 3', 50),
+    ('9 7 5 2 14 15 12 10 11 3 6 1 8 13 0 4', 57),
+    ('3 2 7 9 0 15 12 4 6 11 5 14 8 13 10 1', 57),
+    ('13 9 14 6 12 8 1 2 3 4 0 7 5 10 11 15', 46),
+    ('5 7 11 8 0 14 9 13 10 12 3 15 6 1 4 2', 53),
+    ('4 3 6 13 7 15 9 0 10 5 8 11 2 12 1 14', 50),
+    ('1 7 15 14 2 6 4 9 12 11 13 3 0 8 5 10', 49),
+    ('9 14 5 7 8 15 1 2 10 4 13 6 12 0 11 3', 44),
+    ('0 11 3 12 5 2 1 9 8 10 14 15 7 4 13 6', 54),
+    ('7 15 4 0 10 9 2 5 12 11 13 6 1 3 14 8', 57),
+    ('11 4 0 8 6 10 5 13 12 7 14 3 1 2 9 15', 54),
+)
+
+RANDOM_SEED = 2024
+RANDOM_COUNT = 10
+DEFAULT_CORPORA = ('random-10', 'random-20', 'random-30', 'random-40')
+
+
+def korf_to_board(text: str) -> List[int]:
+    """Đổi bảng của Korf (đích 0 1 2 ... 15) sang đích của chương trình (1 ... 15 0).
+
+    Xoay 180 độ và đổi nhãn t -> 16 - t: đích của Korf thành đích ở đây, mọi
+    nước đi vẫn là nước đi hợp lệ nên số bước tối ưu không đổi.
+    """
+    old = [int(x) for x in text.split()]
+    board = [0] * 16
+    for square, tile in enumerate(old):
+        board[15 - square] = 16 - tile if tile else 0
+    return board
+
+
+def validate_korf_100():
+    """Kiểm tra dữ liệu Korf 100: hoán vị hợp lệ, giải được và độ dài cùng tính chẵn lẻ
+    với Manhattan (mỗi nước đi đổi Manhattan đúng 1 đơn vị)."""
+    checker = PuzzleSolver()
+    for number, (text, length) in enumerate(KORF_100, 1):
+        board = korf_to_board(text)
+        manhattan = PuzzleState(board).heuristic
+        if (sorted(board) != list(range(16)) or not checker.is_solvable(board)
+                or manhattan > length or (length - manhattan) % 2):
+            raise ValueError(f"Dữ liệu Korf 100 sai ở bảng {number}: {text}")
+
+
+def load_corpus(name: str, count: int = RANDOM_COUNT, seed: int = RANDOM_SEED) -> List[Tuple[str, List[int], Optional[int]]]:
+    """Danh sách (id, bảng, số bước tối ưu nếu biết) của một bộ bảng"""
+    if name == 'korf100':
+        validate_korf_100()
+        return [(f"korf-{number}", korf_to_board(text), length)
+                for number, (text, length) in enumerate(KORF_100, 1)]
+    if name.startswith('random-'):
+        depth = int(name[len('random-'):])
+        rng = random.Random(f"{seed}-{depth}")
+        return [(f"{name}-{i}", create_random_solvable_puzzle(depth, rng), None) for i in range(count)]
+    raise ValueError(f"Bộ bảng không hợp lệ: {name}")
+
+
+def parse_engine(spec: str) -> Tuple[str, str, Optional[str]]:
+    """'thuật_toán[:heuristic][@backend]' -> (algorithm, heuristic, backend hoặc None)"""
+    spec, _, backend = spec.partition('@')
+    algorithm, _, heuristic = spec.partition(':')
+    heuristic = heuristic or 'manhattan'
+    if algorithm not in ('astar', 'ida', 'bidirectional', 'hda'):
+        raise ValueError(f"Thuật toán không hợp lệ: {algorithm}")
+    if heuristic not in HEURISTICS:
+        raise ValueError(f"Heuristic không hợp lệ: {heuristic}")
+    if backend and backend not in BACKENDS:
+        raise ValueError(f"Backend không hợp lệ: {backend}")
+    if backend == 'c' and puzzle_core.DEFAULT_BACKEND != 'c':
+        raise ValueError("Chưa có backend C, hãy chạy: python build_accel.py")
+    return algorithm, heuristic, backend or None
+
+
+def _run_instance(spec: str, board: List[int], timeout: Optional[float], pdb_path: Optional[str]) -> Dict:
+    """Giải một bảng trong tiến trình con, trả về số liệu đo được"""
+    algorithm, heuristic, backend = parse_engine(spec)
+    solver = PuzzleSolver(heuristic=create_heuristic(heuristic, pdb_path), backend=backend)
+    baseline = peak_rss_kb()
+
+    # Đồng hồ chỉ được đọc sau mỗi vài trăm lần mở rộng để không làm sai nodes/giây
+    stop_callback = deadline_stop_callback(time.monotonic() + timeout) if timeout else None
+    start = time.perf_counter()
+    path, stats = solver.solve(board, stop_callback=stop_callback, algorithm=algorithm)
+    elapsed = time.perf_counter() - start
+
+    peak = peak_rss_kb()
+    # HDA* giải trong các tiến trình worker (con của tiến trình này, đã được join):
+    # RUSAGE_CHILDREN chỉ cho peak của worker lớn nhất nên tổng bộ nhớ được ước lượng
+    # trên bằng workers * peak đó, cộng phần tăng của tiến trình điều phối
+    workers = stats.get('workers', 0)
+    worker_peak = peak_rss_kb(children=True) if workers else 0
+    return {
+        'solved': path is not None,
+        'solution_length': len(path) - 1 if path is not None else None,
+        'explored': stats.get('explored', 0),
+        'time': elapsed,
+        'nodes_per_sec': stats.get('explored', 0) / elapsed if elapsed > 0 else 0.0,
+        # peak_rss_kb chỉ là tiến trình điều phối; rss_growth_kb gồm cả worker (nếu có)
+        'peak_rss_kb': peak,
+        'worker_peak_rss_kb': worker_peak,
+        'workers': workers,
+        'rss_growth_kb': peak - baseline + workers * worker_peak,
+        # Backend thực sự dùng: thuật toán/heuristic backend C không hỗ trợ chạy bằng Python
+        'backend': stats.get('backend', 'python'),
+    }
+
+
+def _instance_process(conn, spec: str, board: List[int], timeout: Optional[float], pdb_path: Optional[str]):
+    """Thân tiến trình con: gửi kết quả (hoặc exception) của _run_instance qua pipe"""
+    try:
+        conn.send(_run_instance(spec, board, timeout, pdb_path))
+    except Exception as e:
+        conn.send(e)
+    finally:
+        conn.close()
+
+
+def _run_isolated(spec: str, board: List[int], timeout: Optional[float], pdb_path: Optional[str]) -> Dict:
+    """Chạy _run_instance trong một tiến trình mới để peak RSS không bị lẫn giữa các bảng.
+
+    Không dùng multiprocessing.Pool vì tiến trình của Pool là daemon nên HDA*
+    không tạo được tiến trình worker.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_instance_process, args=(sender, spec, board, timeout, pdb_path))
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        raise RuntimeError(f"Tiến trình benchmark kết thúc bất thường (mã {process.exitcode})") from None
+    finally:
+        receiver.close()
+        process.join()
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def run_benchmark(engines: List[str], corpora: List[str], timeout: Optional[float] = None,
+                  pdb_path: Optional[str] = None, limit: Optional[int] = None,
+                  count: int = RANDOM_COUNT, seed: int = RANDOM_SEED, progress=None) -> Dict:
+    """Chạy mọi engine trên mọi bộ bảng, trả về kết quả dạng dict (ghi được ra JSON)"""
+    for spec in engines:
+        parse_engine(spec)
+
+    results = []
+    for corpus in corpora:
+        instances = load_corpus(corpus, count, seed)[:limit]
+        for spec in engines:
+            for instance_id, board, optimal in instances:
+                result = _run_isolated(spec, board, timeout, pdb_path)
+                result.update({'engine': spec, 'corpus': corpus, 'instance': instance_id,
+                               'optimal_length': optimal})
+                if optimal is not None and result['solved']:
+                    result['optimal'] = result['solution_length'] == optimal
+                results.append(result)
+                if progress:
+                    progress(result)
+
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'engines': engines,
+            'corpora': corpora,
+            'default_backend': puzzle_core.DEFAULT_BACKEND,
+            'timeout': timeout,
+            'random_seed': seed,
+            'random_count': count,
+        },
+        'results': results,
+        'summary': summarize(results),
+    }
+
+
+def summarize(results: List[Dict]) -> Dict:
+    """Tổng hợp theo từng cặp engine / bộ bảng"""
+    groups = {}
+    for result in results:
+        groups.setdefault(f"{result['engine']} / {result['corpus']}", []).append(result)
+
+    summary = {}
+    for name, group in groups.items():
+        solved = [r for r in group if r['solved']]
+        total_time = sum(r['time'] for r in group)
+        total_explored = sum(r['explored'] for r in group)
+        summary[name] = {
+            'instances': len(group),
+            'solved': len(solved),
+            'not_optimal': sum(1 for r in solved if r.get('optimal') is False),
+            'total_time': total_time,
+            'total_explored': total_explored,
+            'nodes_per_sec': total_explored / total_time if total_time > 0 else 0.0,
+            'mean_solution_length': (sum(r['solution_length'] for r in solved) / len(solved)
+                                     if solved else None),
+            'max_rss_growth_kb': max((r['rss_growth_kb'] for r in group), default=0),
+            'max_worker_peak_rss_kb': max((r.get('worker_peak_rss_kb', 0) for r in group), default=0),
+        }
+    return summary
+
+
+def _relative_increase(old: float, new: float) -> float:
+    return (new - old) / old if old else (float('inf') if new > old else 0.0)
+
+
+def compare_results(old: Dict, new: Dict, threshold: float = 0.1,
+                    time_threshold: float = 0.25) -> Iterator[str]:
+    """Sinh các dòng mô tả regression giữa hai file kết quả.
+
+    Độ dài lời giải, số bảng giải được và số node mở rộng là xác định nên được
+    so từng bảng; thời gian, tốc độ và bộ nhớ dao động nên chỉ so trên tổng của
+    mỗi cặp engine / bộ bảng, với ngưỡng riêng cho thời gian.
+    """
+    old_results = {(r['engine'], r['corpus'], r['instance']): r for r in old['results']}
+    for result in new['results']:
+        key = (result['engine'], result['corpus'], result['instance'])
+        before = old_results.get(key)
+        if before is None:
+            continue
+        label = ' / '.join(key)
+        if before['solved'] and not result['solved']:
+            yield f"{label}: không còn giải được"
+        elif before['solved'] and result['solved']:
+            if result['solution_length'] > before['solution_length']:
+                yield (f"{label}: lời giải dài hơn "
+                       f"({before['solution_length']} -> {result['solution_length']})")
+            increase = _relative_increase(before['explored'], result['explored'])
+            if increase > threshold:
+                yield (f"{label}: mở rộng nhiều node hơn {increase:+.0%} "
+                       f"({before['explored']:,} -> {result['explored']:,})")
+        if result.get('optimal') is False:
+            yield f"{label}: lời giải không tối ưu ({result['solution_length']} > {result['optimal_length']})"
+
+    for name, after in new['summary'].items():
+        before = old['summary'].get(name)
+        if before is None:
+            continue
+        increase = _relative_increase(before['total_time'], after['total_time'])
+        if increase > time_threshold:
+            yield f"{name}: tổng thời gian tăng {increase:+.0%} ({before['total_time']:.3f}s -> {after['total_time']:.3f}s)"
+        if after['nodes_per_sec'] < before['nodes_per_sec'] * (1 - time_threshold):
+            yield (f"{name}: tốc độ giảm ({before['nodes_per_sec']:,.0f} -> "
+                   f"{after['nodes_per_sec']:,.0f} node/s)")
+        increase = _relative_increase(before['max_rss_growth_kb'], after['max_rss_growth_kb'])
+        if increase > threshold and after['max_rss_growth_kb'] - before['max_rss_growth_kb'] > 1024:
+            yield (f"{name}: bộ nhớ tăng {increase:+.0%} ({before['max_rss_growth_kb']:,} KB -> "
+                   f"{after['max_rss_growth_kb']:,} KB)")
+
+
+def backend_speedups(results: List[Dict]) -> Iterator[str]:
+    """Sinh các dòng so sánh backend C với Python cho cùng thuật toán, heuristic và bộ bảng.
+
+    Chỉ cộng các bảng cả hai backend đều giải xong: bảng bị dừng vì timeout ở một
+    backend sẽ khiến tỉ lệ đo cả giới hạn thời gian thay vì tốc độ giải.
+    """
+    groups = {}
+    for result in results:
+        algorithm, heuristic, _ = parse_engine(result['engine'])
+        instances = groups.setdefault((f"{algorithm}:{heuristic}", result['corpus']), {})
+        backends = instances.setdefault(result['instance'], {})
+        backends.setdefault(result.get('backend', 'python'), result)
+
+    for (engine, corpus), instances in groups.items():
+        c_time = c_explored = py_time = py_explored = 0
+        common = compared = 0
+        for backends in instances.values():
+            if 'c' not in backends or 'python' not in backends:
+                continue
+            compared += 1
+            c_result, py_result = backends['c'], backends['python']
+            if not (c_result['solved'] and py_result['solved']):
+                continue
+            common += 1
+            c_time += c_result['time']
+            c_explored += c_result['explored']
+            py_time += py_result['time']
+            py_explored += py_result['explored']
+        if not compared:
+            continue
+        if c_time <= 0 or py_time <= 0:
+            yield f"{engine} / {corpus}: không có bảng nào cả hai backend đều giải xong"
+            continue
+        yield (f"{engine} / {corpus}: backend C nhanh gấp {py_time / c_time:.1f} lần "
+               f"trên {common}/{compared} bảng cả hai backend đều giải xong "
+               f"({py_time:.3f}s -> {c_time:.3f}s, {py_explored / py_time:,.0f} -> "
+               f"{c_explored / c_time:,.0f} node/s)")
+
+
+def print_summary(summary: Dict, stream=sys.stdout):
+    for name, s in summary.items():
+        length = f"{s['mean_solution_length']:.2f}" if s['mean_solution_length'] is not None else '-'
+        print(f"{name}: {s['solved']}/{s['instances']} giải được, {s['total_explored']:,} node, "
+              f"{s['total_time']:.3f}s, {s['nodes_per_sec']:,.0f} node/s, độ dài TB {length}, "
+              f"RSS tăng tối đa {s['max_rss_growth_kb']:,} KB"
+              + (f" (gồm worker, mỗi worker tối đa {s['max_worker_peak_rss_kb']:,} KB)"
+                 if s.get('max_worker_peak_rss_kb') else ''), file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark và so sánh các engine giải 15-puzzle")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run', help="Chạy benchmark và ghi kết quả JSON")
+    run_parser.add_argument('--engine', action='append',
+                            help="thuật_toán[:heuristic][@backend], có thể lặp lại (mặc định: astar)")
+    run_parser.add_argument('--corpus', action='append',
+                            help="korf100 hoặc random-D, có thể lặp lại "
+                                 f"(mặc định: {', '.join(DEFAULT_CORPORA)})")
+    run_parser.add_argument('--limit', type=int, help="Chỉ chạy N bảng đầu của mỗi bộ")
+    run_parser.add_argument('--count', type=int, default=RANDOM_COUNT, help="Số bảng của mỗi bộ random-D")
+    run_parser.add_argument('--seed', type=int, default=RANDOM_SEED)
+    run_parser.add_argument('--timeout', type=float, help="Giới hạn thời gian cho mỗi bảng (giây)")
+    run_parser.add_argument('--pdb', help="File PatternDatabase cho heuristic pdb")
+    run_parser.add_argument('--output', help="File JSON kết quả (mặc định: stdout)")
+
+    compare_parser = sub.add_parser('compare', help="So sánh hai file kết quả, báo regression")
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help="Ngưỡng tăng cho số node và bộ nhớ (mặc định 10%%)")
+    compare_parser.add_argument('--time-threshold', type=float, default=0.25,
+                                help="Ngưỡng tăng cho thời gian và giảm tốc độ (mặc định 25%%)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        def progress(result):
+            status = result['solution_length'] if result['solved'] else 'không giải được'
+            print(f"  {result['engine']} {result['instance']}: {status}, {result['explored']:,} node, "
+                  f"{result['time']:.3f}s", file=sys.stderr)
+
+        report = run_benchmark(args.engine or ['astar'], args.corpus or list(DEFAULT_CORPORA),
+                               timeout=args.timeout, pdb_path=args.pdb, limit=args.limit,
+                               count=args.count, seed=args.seed, progress=progress)
+        print_summary(report['summary'], sys.stderr)
+        for line in backend_speedups(report['results']):
+            print(f"⚡ {line}", file=sys.stderr)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        else:
+            json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+            print()
+    else:
+        with open(args.old) as f:
+            old = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        regressions = list(compare_results(old, new, args.threshold, args.time_threshold))
+        print_summary(new['summary'])
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("\n✅ Không có regression")
+
+
+if __name__ == '__main__':
+    main()
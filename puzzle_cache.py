@@ -0,0 +1,99 @@
+"""Cache lời giải tối ưu, key là bảng đã nén 64 bit
+
+Gồm hai lớp: LRU trong bộ nhớ (giới hạn số mục) và sqlite trên đĩa (tùy chọn)
+để dùng lại giữa các lần chạy. Khi lưu một lời giải tối ưu, mọi trạng thái
+trên đường đi đều được lưu kèm phần còn lại của đường đi (đoạn cuối của một
+đường đi tối ưu cũng tối ưu), nên một bảng nằm trên lời giải cũ được trả lời
+ngay mà không cần tìm kiếm. Key là key chung của bảng và ảnh đối xứng qua
+đường chéo (puzzle_symmetry.py), nên mỗi lời giải phục vụ được cả hai bảng.
+
+Cách dùng:
+    solver = PuzzleSolver(cache=SolutionCache('solutions.sqlite'))
+"""
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+from puzzle_core import PuzzleState, path_move_codes
+from puzzle_symmetry import canonical_key, mirror_moves
+
+
+class SolutionCache:
+    """Cache lời giải: LRU trong bộ nhớ + sqlite trên đĩa"""
+
+    def __init__(self, path: Optional[str] = None, capacity: int = 100000):
+        self.capacity = capacity
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._lock = threading.Lock()
+        self.db = None
+        if path:
+            self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self.db.execute('PRAGMA journal_mode=WAL')
+            self.db.execute('CREATE TABLE IF NOT EXISTS solutions (key BLOB PRIMARY KEY, moves BLOB NOT NULL)')
+            self.db.commit()
+
+    def _remember(self, key: int, moves: bytes):
+        """Thêm vào lớp LRU, bỏ mục cũ nhất khi vượt quá capacity"""
+        self.memory[key] = moves
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+
+    def lookup(self, board: List[int]) -> Optional[bytes]:
+        """Trả về dãy mã nước đi tối ưu đã lưu cho bảng (hoặc None)"""
+        key, mirrored = canonical_key(board)
+        with self._lock:
+            moves = self.memory.get(key)
+            if moves is not None:
+                self.memory.move_to_end(key)
+                self.hits += 1
+            elif self.db is not None:
+                row = self.db.execute('SELECT moves FROM solutions WHERE key = ?',
+                                      (key.to_bytes(8, 'big'),)).fetchone()
+                if row is not None:
+                    moves = bytes(row[0])
+                    self._remember(key, moves)
+                    self.hits += 1
+                    self.disk_hits += 1
+
+            if moves is None:
+                self.misses += 1
+                return None
+            # Lời giải được lưu cho bảng chuẩn; đổi hướng nếu bảng hỏi là ảnh đối xứng
+            return bytes(mirror_moves(moves)) if mirrored else moves
+
+    def store_path(self, path: List[PuzzleState]):
+        """Lưu lời giải tối ưu cho mọi trạng thái trên đường đi"""
+        codes = path_move_codes(path)
+        entries = []
+        for i, state in enumerate(path):
+            key, mirrored = canonical_key(state.board)
+            suffix = codes[i:]
+            entries.append((key, bytes(mirror_moves(suffix) if mirrored else suffix)))
+        with self._lock:
+            for key, moves in entries:
+                self._remember(key, moves)
+            if self.db is not None:
+                self.db.executemany('INSERT OR IGNORE INTO solutions (key, moves) VALUES (?, ?)',
+                                    [(key.to_bytes(8, 'big'), moves) for key, moves in entries])
+                self.db.commit()
+
+    def counters(self) -> dict:
+        """Bộ đếm hit/miss để đưa vào stats của solver"""
+        return {
+            'cache_hits': self.hits,
+            'cache_misses': self.misses,
+            'cache_disk_hits': self.disk_hits
+        }
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def __len__(self):
+        return len(self.memory)
@@ -0,0 +1,141 @@
+"""CLI không giao diện cho 15-Puzzle Solver (không import tkinter)
+
+Bảng được đọc từ tham số dòng lệnh, từ file (--file) hoặc từ stdin; kết quả
+được ghi ra dạng JSON, JSON lines hoặc CSV.
+
+Cách dùng:
+    python puzzle_cli.py "1 2 3 4 5 6 7 8 9 10 11 12 13 14 0 15"
+    python puzzle_cli.py --file boards.txt --format csv --output results.csv
+    cat boards.txt | python puzzle_cli.py --algorithm ida --workers 4 --format jsonl
+"""
+import argparse
+import csv
+import json
+import sys
+from typing import Dict, Iterable, Iterator, List
+
+from puzzle_batch import parse_board, read_boards, solve_batch, solve_one
+from puzzle_cache import SolutionCache
+from puzzle_core import FRONTIER_TYPES, MEMORY_LIMIT_ALGORITHMS, PuzzleSolver
+from puzzle_heuristics import HEURISTICS, create_heuristic
+
+CSV_FIELDS = ['index', 'board', 'solved', 'timed_out', 'solution_length',
+              'explored', 'max_frontier', 'time', 'heuristic', 'moves']
+
+
+def iter_boards(args) -> Iterator[List[int]]:
+    """Lấy các bảng theo thứ tự ưu tiên: tham số, --file, stdin"""
+    if args.boards:
+        for text in args.boards:
+            yield parse_board(text)
+    elif args.file:
+        with open(args.file) as f:
+            yield from read_boards(f)
+    else:
+        yield from read_boards(sys.stdin)
+
+
+def solve_boards(boards: Iterable[List[int]], workers: int = 1, timeout=None,
+                 pdb_path=None, cache_path=None, heuristic=None, **solve_options) -> Iterator[Dict]:
+    """Giải tuần tự trong tiến trình hiện tại, hoặc song song nếu workers > 1"""
+    if workers > 1:
+        yield from solve_batch(boards, workers=workers, timeout=timeout, pdb_path=pdb_path,
+                               cache_path=cache_path, heuristic=heuristic, **solve_options)
+        return
+
+    heuristic = heuristic or ('pdb' if pdb_path else 'manhattan')
+    solver = PuzzleSolver(heuristic=create_heuristic(heuristic, pdb_path),
+                          cache=SolutionCache(cache_path) if cache_path else None)
+    for index, board in enumerate(boards):
+        yield solve_one(solver, index, board, timeout, solve_options)
+
+
+def csv_row(result: Dict) -> Dict:
+    """Chuyển một kết quả thành một dòng CSV"""
+    stats = result['stats']
+    return {
+        'index': result['index'],
+        'board': ' '.join(map(str, result['board'])),
+        'solved': result['solved'],
+        'timed_out': result['timed_out'],
+        'solution_length': stats.get('solution_length', ''),
+        'explored': stats.get('explored', 0),
+        'max_frontier': stats.get('max_frontier', 0),
+        'time': f"{stats['time']:.6f}",
+        'heuristic': stats.get('heuristic', ''),
+        'moves': '; '.join(result['moves']),
+    }
+
+
+def write_results(results: Iterable[Dict], fmt: str, stream):
+    """Ghi kết quả ra stream; jsonl và csv được ghi ngay khi từng bảng xong"""
+    if fmt == 'json':
+        ordered = sorted(results, key=lambda r: r['index'])
+        json.dump(ordered, stream, ensure_ascii=False, indent=2)
+        stream.write('\n')
+    elif fmt == 'jsonl':
+        for result in results:
+            stream.write(json.dumps(result, ensure_ascii=False) + '\n')
+            stream.flush()
+    else:
+        writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for result in results:
+            writer.writerow(csv_row(result))
+            stream.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Giải 15-puzzle không cần giao diện đồ họa")
+    parser.add_argument('boards', nargs='*',
+                        help="Các bảng, mỗi bảng là 9, 16 hoặc 25 số trong một chuỗi (0 là ô trống)")
+    parser.add_argument('--file', help="File chứa mỗi dòng một bảng")
+    parser.add_argument('--format', choices=['json', 'jsonl', 'csv'], default='json')
+    parser.add_argument('--output', help="File kết quả (mặc định: stdout)")
+    parser.add_argument('--algorithm',
+                        choices=['astar', 'ida', 'weighted', 'anytime', 'constructive'],
+                        default='astar')
+    parser.add_argument('--frontier', choices=sorted(FRONTIER_TYPES), default='bucket')
+    parser.add_argument('--heuristic', choices=HEURISTICS,
+                        help="Heuristic (mặc định: pdb nếu có --pdb, ngược lại manhattan)")
+    parser.add_argument('--pdb', help="File PatternDatabase dùng làm heuristic")
+    parser.add_argument('--cache', help="File sqlite lưu lời giải đã tìm được")
+    parser.add_argument('--timeout', type=float, help="Giới hạn thời gian cho mỗi bảng (giây)")
+    parser.add_argument('--weight', type=float, help="Trọng số h cho weighted/anytime")
+    parser.add_argument('--epsilon', type=float, default=1.0,
+                        help="anytime: dừng khi lời giải <= epsilon * cận dưới (mặc định 1 = tối ưu)")
+    parser.add_argument('--deadline', type=float, help="anytime: thời gian tối đa (giây), trả về lời giải tốt nhất")
+    parser.add_argument('--constructive', action='store_true',
+                        help="anytime: lấy lời giải của bộ giải xây dựng làm lời giải đầu tiên")
+    parser.add_argument('--memory-limit', type=float,
+                        help="Giới hạn bộ nhớ tìm kiếm của A* (MB), vượt quá thì chuyển sang IDA*")
+    parser.add_argument('--workers', type=int, default=1, help="Số tiến trình giải song song")
+    args = parser.parse_args(argv)
+
+    options = {'algorithm': args.algorithm}
+    if args.memory_limit:
+        if args.algorithm not in MEMORY_LIMIT_ALGORITHMS:
+            parser.error(f"--memory-limit không dùng được với --algorithm {args.algorithm}")
+        options['memory_limit'] = int(args.memory_limit * 1024 * 1024)
+    if args.algorithm == 'astar':
+        options['frontier_type'] = args.frontier
+    elif args.algorithm in ('weighted', 'anytime'):
+        if args.weight is not None:
+            options['weight'] = args.weight
+        if args.algorithm == 'anytime':
+            options['epsilon'] = args.epsilon
+            options['deadline'] = args.deadline
+            options['constructive'] = args.constructive
+
+    results = solve_boards(iter_boards(args), workers=args.workers, timeout=args.timeout,
+                           pdb_path=args.pdb, cache_path=args.cache, heuristic=args.heuristic, **options)
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            write_results(results, args.format, f)
+    else:
+        write_results(results, args.format, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
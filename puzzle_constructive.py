@@ -0,0 +1,148 @@
+"""Bộ giải xây dựng (không tối ưu) cho thời gian trả lời cố định
+
+Giải lần lượt từng hàng từ trên xuống cho tới khi còn hai hàng, rồi từng cột
+của hai hàng cuối từ trái sang phải, cuối cùng là khối 2x2. Mỗi bước đưa một
+nhóm ô (một ô, cặp hai ô cuối của hàng/cột, hoặc ba ô của khối 2x2) về đúng
+chỗ mà không chạm vào các ô đã xếp xong.
+
+Với mỗi bước, bảng "nước đi tiếp theo" được tính sẵn một lần bằng BFS ngược
+trên trạng thái thu gọn (vị trí các ô trong nhóm + ô trống, các ô khác coi như
+giống nhau), nên khi giải chỉ còn tra bảng theo từng nước đi. Cuối cùng một
+bước rút gọn bỏ các nước đi tới rồi lui và các đoạn quay lại trạng thái cũ.
+
+Cách dùng:
+    moves = solve_constructive(board)      # dãy mã nước đi (chỉ số trong DIRECTIONS)
+"""
+from collections import deque
+from typing import Dict, List, Sequence, Tuple
+
+# Tịnh tiến của ô trống theo mã nước đi, cùng thứ tự với puzzle_core.DIRECTIONS
+_DELTAS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+_plans: Dict[Tuple[int, int], list] = {}
+
+
+def _neighbors(square: int, width: int, height: int):
+    """Các ô kề (mã nước đi của ô trống, ô đích)"""
+    row, col = divmod(square, width)
+    for code, (dr, dc) in enumerate(_DELTAS):
+        new_row, new_col = row + dr, col + dc
+        if 0 <= new_row < height and 0 <= new_col < width:
+            yield code, new_row * width + new_col
+
+
+def _steps(width: int, height: int) -> List[Tuple[int, ...]]:
+    """Các nhóm ô đích theo thứ tự xếp: hàng trên cùng trước, hai hàng cuối theo cột"""
+    steps = []
+    for row in range(height - 2):
+        base = row * width
+        steps.extend((base + col,) for col in range(width - 2))
+        steps.append((base + width - 2, base + width - 1))
+    for col in range(width - 2):
+        steps.append(((height - 2) * width + col, (height - 1) * width + col))
+    last = width * height - 1
+    steps.append((last - width - 1, last - width, last - 1))
+    return steps
+
+
+def _build_table(targets: Tuple[int, ...], region: frozenset, width: int, height: int) -> Dict:
+    """BFS ngược từ mọi trạng thái đích của nhóm: table[(vị trí nhóm..., ô trống)] = mã nước đi
+    tiếp theo của ô trống (None nếu đã xong)"""
+    table = {}
+    queue = deque()
+    for blank in region:
+        if blank not in targets:
+            state = targets + (blank,)
+            table[state] = None
+            queue.append(state)
+
+    while queue:
+        state = queue.popleft()
+        positions, blank = state[:-1], state[-1]
+        for code, square in _neighbors(blank, width, height):
+            if square not in region:
+                continue
+            # Ô trống đi tới square; nếu đó là ô trong nhóm thì ô đó về chỗ ô trống cũ
+            moved = tuple(blank if p == square else p for p in positions)
+            previous = moved + (square,)
+            if previous not in table:
+                # Từ previous, ô trống đi ngược lại (code ^ 1) để về state
+                table[previous] = code ^ 1
+                queue.append(previous)
+    return table
+
+
+def _get_plan(width: int, height: int) -> list:
+    """Danh sách (nhóm ô đích, bảng nước đi) cho kích thước bảng (sinh một lần khi cần)"""
+    plan = _plans.get((width, height))
+    if plan is None:
+        plan = []
+        region = set(range(width * height))
+        for targets in _steps(width, height):
+            plan.append((targets, _build_table(targets, frozenset(region), width, height)))
+            region.difference_update(targets)
+        _plans[(width, height)] = plan
+    return plan
+
+
+def shorten_moves(board: Sequence[int], move_codes: Sequence[int], width: int = 4) -> List[int]:
+    """Rút gọn dãy nước đi: bỏ cặp tới-lui rồi cắt các đoạn quay lại trạng thái đã gặp"""
+    codes = []
+    for code in move_codes:
+        if codes and codes[-1] == code ^ 1:
+            codes.pop()
+        else:
+            codes.append(code)
+
+    board = list(board)
+    blank = board.index(0)
+    offsets = [dr * width + dc for dr, dc in _DELTAS]
+    seen = {tuple(board): 0}
+    result = []
+    for code in codes:
+        target = blank + offsets[code]
+        board[blank], board[target] = board[target], 0
+        blank = target
+        result.append(code)
+        state = tuple(board)
+        index = seen.get(state)
+        if index is not None:
+            # Quay lại trạng thái sau nước thứ index: bỏ cả vòng lặp
+            for _ in range(len(result) - index):
+                result.pop()
+            seen = {key: i for key, i in seen.items() if i <= index}
+        else:
+            seen[state] = len(result)
+    return result
+
+
+def solve_constructive(board: Sequence[int], width: int = 4, height: int = 4,
+                       shorten: bool = True) -> List[int]:
+    """Dãy mã nước đi (chỉ số trong DIRECTIONS) đưa bảng về đích; ValueError nếu không giải được"""
+    if sorted(board) != list(range(width * height)):
+        raise ValueError("Bảng không hợp lệ")
+
+    current = list(board)
+    where = [0] * (width * height)
+    for square, tile in enumerate(current):
+        where[tile] = square
+    offsets = [dr * width + dc for dr, dc in _DELTAS]
+    moves = []
+
+    for targets, table in _get_plan(width, height):
+        tiles = [target + 1 for target in targets]
+        state = tuple(where[tile] for tile in tiles) + (where[0],)
+        code = table.get(state, False)
+        if code is False:
+            raise ValueError("Puzzle này không thể giải được")
+        while code is not None:
+            blank = where[0]
+            square = blank + offsets[code]
+            tile = current[square]
+            current[blank], current[square] = tile, 0
+            where[tile], where[0] = blank, square
+            moves.append(code)
+            state = tuple(where[t] for t in tiles) + (square,)
+            code = table[state]
+
+    return shorten_moves(board, moves, width) if shorten else moves
@@ -0,0 +1,1506 @@
+"""Lõi giải 15-puzzle: trạng thái, các cấu trúc tìm kiếm và bộ giải A*/IDA*
+
+Module này không phụ thuộc tkinter nên có thể import trên máy chủ không có
+giao diện (CLI, batch, benchmark). Giao diện đồ họa nằm trong puzzle_gui.py.
+
+Kích thước bảng không cố định: BoardGeometry giữ các bảng tính sẵn cho từng
+kích thước width x height (8-puzzle 3x3, 15-puzzle 4x4, 24-puzzle 5x5, ...).
+Các hằng MANHATTAN_TABLE, GOAL_KEY, pack_board, unpack_board là của bảng 4x4.
+
+Backend C tùy chọn (_puzzle_accel, sinh bằng python build_accel.py) thay vòng
+lặp trong của IDA* và việc sinh trạng thái con của A* cho bảng tới 4x4 với
+Manhattan hoặc PDB. Thiếu module (hoặc PUZZLE_BACKEND=python) thì dùng Python thuần.
+"""
+import functools
+import heapq
+import os
+import time
+from array import array
+import random
+from typing import List, Tuple, Optional
+
+if os.environ.get('PUZZLE_BACKEND', '').lower() == 'python':
+    _puzzle_accel = None
+else:
+    try:
+        import _puzzle_accel
+    except ImportError:
+        _puzzle_accel = None
+
+BACKENDS = ('c', 'python')
+# Backend mặc định của PuzzleSolver: 'c' nếu đã sinh module _puzzle_accel
+DEFAULT_BACKEND = 'python' if _puzzle_accel is None else 'c'
+
+
+# Hướng di chuyển ô trống (dr, dc) và tên nước đi của ô số; chỉ số là mã nước đi
+DIRECTIONS = (
+    (-1, 0, 'XUỐNG'),
+    (1, 0, 'LÊN'),
+    (0, -1, 'PHẢI'),
+    (0, 1, 'TRÁI')
+)
+
+_MOVE_CODES = {(dr, dc): code for code, (dr, dc, _) in enumerate(DIRECTIONS)}
+
+# Bảng có tối đa từng này ô được giải bằng bảng khoảng cách chính xác (3x3: 181440 trạng thái)
+SMALL_BOARD_SQUARES = 9
+
+class BoardGeometry:
+    """Các bảng tính sẵn cho một kích thước bảng width x height.
+    
+    Đích là 1..size-1 theo thứ tự, ô trống ở cuối. Bảng được nén thành số
+    nguyên, mỗi ô bits bit (4 bit tới 4x4, 5 bit cho 5x5), ô 0 ở bit thấp nhất.
+    Dùng get_geometry() để lấy bản dùng chung thay vì tạo mới.
+    """
+    
+    def __init__(self, width: int, height: int):
+        if width < 2 or height < 2:
+            raise ValueError(f"Kích thước bảng không hợp lệ: {width}x{height}")
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.bits = max(4, (self.size - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+        self.goal = list(range(1, self.size)) + [0]
+        self.goal_key = self.pack(self.goal)
+        # Khóa vừa 64 bit thì SearchArena lưu bằng array('Q'), ngược lại bằng list
+        self.key_typecode = 'Q' if self.bits * self.size <= 64 else None
+        # Typecode của h và vị trí ô trống trong SearchArena: h lớn nhất bị chặn bởi
+        # size * (width + height) (Manhattan cộng phần phạt của các heuristic khác),
+        # từ 6x6 trở lên không còn vừa một byte
+        self.heuristic_typecode = 'B' if self.size * (width + height) <= 0xFF else 'H'
+        self.blank_typecode = 'B' if self.size <= 0x100 else 'H'
+        # manhattan[tile][square]: khoảng cách Manhattan của ô số tới vị trí đích
+        self.manhattan = self.manhattan_table(self.goal)
+        # neighbors[square]: các cặp (mã nước đi, ô đích) hợp lệ của ô trống
+        self.neighbors = tuple(
+            tuple((code, (square // width + dr) * width + square % width + dc)
+                  for code, (dr, dc, _) in enumerate(DIRECTIONS)
+                  if 0 <= square // width + dr < height and 0 <= square % width + dc < width)
+            for square in range(self.size)
+        )
+        # successors[square][previous]: các bộ (mã nước đi, ô đích, dịch bit của ô đích,
+        # dịch bit của ô trống) khi ô trống ở square và nước vừa đi là previous; nước đi
+        # ngược previous ^ 1 (quay về trạng thái cha) đã được bỏ. previous = -1 (nút gốc)
+        # lấy phần tử cuối, gồm đủ mọi nước đi.
+        self.successors = tuple(
+            tuple(
+                tuple((code, target, self.bits * target, self.bits * square)
+                      for code, target in self.neighbors[square] if code != previous ^ 1)
+                for previous in (*range(len(DIRECTIONS)), -1)
+            )
+            for square in range(self.size)
+        )
+    
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (self.width, self.height)
+    
+    def pack(self, board: List[int]) -> int:
+        """Nén bảng thành một số nguyên"""
+        bits = self.bits
+        key = 0
+        for i in range(self.size - 1, -1, -1):
+            key = (key << bits) | board[i]
+        return key
+    
+    def unpack(self, key: int) -> List[int]:
+        """Giải nén số nguyên về danh sách ô"""
+        bits, mask = self.bits, self.mask
+        return [(key >> (bits * i)) & mask for i in range(self.size)]
+    
+    def manhattan_table(self, target: List[int]) -> Tuple[Tuple[int, ...], ...]:
+        """Bảng [tile][square] khoảng cách Manhattan tới vị trí của tile trong bảng target"""
+        width = self.width
+        where = [0] * self.size
+        for square, tile in enumerate(target):
+            where[tile] = square
+        return tuple(
+            tuple(0 if tile == 0 else abs(square // width - where[tile] // width)
+                  + abs(square % width - where[tile] % width) for square in range(self.size))
+            for tile in range(self.size)
+        )
+    
+    def is_valid(self, board: List[int]) -> bool:
+        """Bảng có đúng các số 0..size-1 không"""
+        return len(board) == self.size and set(board) == set(range(self.size))
+    
+    def __repr__(self):
+        return f"BoardGeometry({self.width}x{self.height})"
+
+_geometries = {}
+
+def get_geometry(width: int, height: Optional[int] = None) -> BoardGeometry:
+    """BoardGeometry dùng chung cho kích thước width x height (mặc định bảng vuông)"""
+    shape = (width, height or width)
+    geometry = _geometries.get(shape)
+    if geometry is None:
+        geometry = _geometries[shape] = BoardGeometry(*shape)
+    return geometry
+
+def geometry_for(board: List[int]) -> BoardGeometry:
+    """BoardGeometry của một bảng vuông, suy ra từ số ô"""
+    side = int(round(len(board) ** 0.5))
+    if side < 2 or side * side != len(board):
+        raise ValueError(f"Không suy ra được kích thước bảng {len(board)} ô, cần chỉ rõ width/height")
+    return get_geometry(side)
+
+GEOMETRY_4x4 = get_geometry(4)
+
+# Bảng khoảng cách Manhattan tính sẵn: MANHATTAN_TABLE[tile][square]
+MANHATTAN_TABLE = GEOMETRY_4x4.manhattan
+
+def pack_board(board: List[int]) -> int:
+    """Nén bảng thành một số nguyên 64 bit (4 bit cho mỗi ô, ô 0 ở bit thấp nhất)"""
+    key = 0
+    for i in range(15, -1, -1):
+        key = (key << 4) | board[i]
+    return key
+
+def unpack_board(key: int) -> List[int]:
+    """Giải nén số nguyên 64 bit về danh sách 16 ô"""
+    return [(key >> (4 * i)) & 15 for i in range(16)]
+
+GOAL_KEY = GEOMETRY_4x4.goal_key
+
+# Ước lượng bộ nhớ cho mỗi node A* (arena, best_g và frontier), đo bằng tracemalloc
+# khoảng 130-160 byte, cộng thêm phần dự phòng cho lúc dict/mảng tăng kích thước
+ASTAR_NODE_BYTES = 200
+# Thuật toán dùng được với memory_limit: A* chuyển sang IDA* khi chạm giới hạn, các
+# thuật toán còn lại có bộ nhớ bị chặn sẵn (IDA* tuyến tính theo độ sâu, bảng khoảng
+# cách và bộ giải xây dựng cố định). Bidirectional, weighted, anytime và HDA* không
+# giới hạn được số node nên báo lỗi thay vì bỏ qua giới hạn.
+MEMORY_LIMIT_ALGORITHMS = ('astar', 'ida', 'table', 'constructive')
+
+class Heuristic:
+    """Giao diện heuristic cho PuzzleSolver.
+    
+    Lớp con cài __call__(board) để tính đầy đủ và có thể cài update() để tính
+    lại theo hiệu số khi chỉ một ô di chuyển. Manhattan (heuristic=None) được
+    tính trực tiếp trong vòng lặp tìm kiếm nên không cần lớp riêng.
+    """
+    
+    name = 'heuristic'
+    # Kích thước bảng (width, height) mà heuristic dùng được
+    shape = (4, 4)
+    
+    def __call__(self, board: List[int]) -> int:
+        raise NotImplementedError
+    
+    def update(self, key: int, new_key: int, h: int, tile: int, from_index: int, to_index: int) -> int:
+        """Heuristic của trạng thái con new_key, sinh ra từ key (heuristic h) khi ô tile
+        đi từ from_index tới to_index. Mặc định tính lại từ đầu.
+        """
+        return self(get_geometry(*self.shape).unpack(new_key))
+    
+    def accel_tables(self):
+        """(các nhóm ô, các bảng) để backend C tính heuristic như PDB cộng dồn,
+        hoặc None nếu backend C không tính được heuristic này (dùng Python thuần)"""
+        return None
+    
+    def close(self):
+        """Giải phóng tài nguyên (nếu có)"""
+
+
+class PuzzleState:
+    """Lớp đại diện cho một trạng thái của puzzle (mặc định 4x4)"""
+    
+    __slots__ = ('key', 'moves', 'parent', 'move', 'heuristic_fn', 'blank',
+                 'heuristic', 'cost', 'geometry', '_move_name')
+    
+    def __init__(self, board: List[int], moves: int = 0, parent=None, last_move: str = '',
+                 heuristic_fn=None, geometry: Optional[BoardGeometry] = None):
+        # geometry mặc định được suy ra từ số ô của bảng vuông
+        self.geometry = geometry or geometry_for(board)
+        self.key = self.geometry.pack(board)
+        self.moves = moves
+        self.parent = parent
+        # Mã nước đi (chỉ số trong DIRECTIONS) sinh ra trạng thái này, -1 nếu không có
+        self.move = -1
+        self._move_name = last_move
+        self.heuristic_fn = heuristic_fn
+        self.blank = board.index(0)
+        self.heuristic = heuristic_fn(board) if heuristic_fn else self._calculate_manhattan(board)
+        self.cost = self.moves + self.heuristic
+    
+    @property
+    def board(self) -> List[int]:
+        """Danh sách các ô (giải nén từ key)"""
+        return self.geometry.unpack(self.key)
+    
+    @property
+    def empty_pos(self) -> Tuple[int, int]:
+        """Vị trí (hàng, cột) của ô trống"""
+        return divmod(self.blank, self.geometry.width)
+    
+    @property
+    def last_move(self) -> str:
+        """Mô tả nước đi vừa thực hiện, chỉ tạo chuỗi khi cần hiển thị"""
+        if self.move < 0 or self.parent is None:
+            return self._move_name
+        geometry = self.geometry
+        # Ô vừa di chuyển nằm ở vị trí ô trống cũ của trạng thái cha
+        tile = (self.key >> (geometry.bits * self.parent.blank)) & geometry.mask
+        return f"Di chuyển {tile} {DIRECTIONS[self.move][2]}"
+    
+    def _calculate_manhattan(self, board: List[int]) -> int:
+        """Tính Manhattan Distance - heuristic function"""
+        table = self.geometry.manhattan
+        distance = 0
+        for i in range(self.geometry.size):
+            distance += table[board[i]][i]
+        return distance
+    
+    def _make_child(self, key: int, blank: int, heuristic: int, move: int) -> 'PuzzleState':
+        """Tạo trạng thái con mà không tính lại vị trí ô trống và heuristic"""
+        child = PuzzleState.__new__(PuzzleState)
+        child.key = key
+        child.moves = self.moves + 1
+        child.parent = self
+        child.move = move
+        child._move_name = ''
+        child.heuristic_fn = self.heuristic_fn
+        child.blank = blank
+        child.heuristic = heuristic
+        child.cost = child.moves + heuristic
+        child.geometry = self.geometry
+        return child
+    
+    def _child(self, code: int, new_index: int, new_shift: int, empty_shift: int) -> 'PuzzleState':
+        """Trạng thái con theo một phần tử của geometry.successors"""
+        key = self.key
+        tile = (key >> new_shift) & self.geometry.mask
+        # Đổi chỗ ô số và ô trống trực tiếp trên key (ô trống có giá trị 0)
+        new_key = key ^ (tile << new_shift) ^ (tile << empty_shift)
+        
+        # Chỉ một ô thay đổi vị trí nên Manhattan được cập nhật theo hiệu số
+        if self.heuristic_fn is None:
+            manhattan = self.geometry.manhattan[tile]
+            heuristic = self.heuristic - manhattan[new_index] + manhattan[self.blank]
+        else:
+            heuristic = self.heuristic_fn.update(key, new_key, self.heuristic, tile,
+                                                 new_index, self.blank)
+        return self._make_child(new_key, new_index, heuristic, code)
+    
+    def is_goal(self) -> bool:
+        """Kiểm tra xem đã đạt trạng thái đích chưa"""
+        return self.key == self.geometry.goal_key
+    
+    def get_neighbors(self, include_parent: bool = False) -> List['PuzzleState']:
+        """Tạo các trạng thái kế tiếp có thể đạt được.
+        
+        Mặc định bỏ nước đi ngược nước vừa đi (sinh lại trạng thái cha); truyền
+        include_parent=True để lấy đủ mọi nước đi.
+        """
+        previous = -1 if include_parent else self.move
+        return [self._child(*successor) for successor in self.geometry.successors[self.blank][previous]]
+    
+    def apply_move(self, code: int) -> 'PuzzleState':
+        """Tạo trạng thái con theo mã nước đi (chỉ số trong DIRECTIONS)"""
+        for successor in self.geometry.successors[self.blank][-1]:
+            if successor[0] == code:
+                return self._child(*successor)
+        row, col = self.empty_pos
+        raise ValueError(f"Nước đi không hợp lệ: {DIRECTIONS[code][2]} từ ô ({row}, {col})")
+    
+    def __lt__(self, other):
+        # Cùng f(n) thì ưu tiên h(n) nhỏ hơn (tức là g(n) sâu hơn)
+        return (self.cost, self.heuristic) < (other.cost, other.heuristic)
+    
+    def __eq__(self, other):
+        return self.key == other.key
+    
+    def __hash__(self):
+        return hash(self.key)
+
+class SearchArena:
+    """Kho lưu node của A* dưới dạng các mảng song song thay vì chuỗi PuzzleState.
+    
+    Mỗi node là một chỉ số: key của bảng, chỉ số node cha, g, h, vị trí ô trống
+    và mã nước đi. Chỉ đường đi cuối cùng mới được dựng lại thành PuzzleState.
+    """
+    
+    def __init__(self, geometry: BoardGeometry = GEOMETRY_4x4):
+        self.geometry = geometry
+        # Khóa lớn hơn 64 bit (ví dụ 5x5) không vừa array('Q')
+        self.keys = array(geometry.key_typecode) if geometry.key_typecode else []
+        self.parents = array('i')
+        self.g = array('H')
+        self.h = array(geometry.heuristic_typecode)
+        self.blank = array(geometry.blank_typecode)
+        self.move = array('b')
+    
+    def add(self, key: int, parent: int, g: int, h: int, blank: int, move: int) -> int:
+        """Thêm một node và trả về chỉ số của nó"""
+        self.keys.append(key)
+        self.parents.append(parent)
+        self.g.append(g)
+        self.h.append(h)
+        self.blank.append(blank)
+        self.move.append(move)
+        return len(self.keys) - 1
+    
+    def __len__(self):
+        return len(self.keys)
+    
+    def path(self, node: int, heuristic_fn=None) -> List[PuzzleState]:
+        """Dựng lại đường đi từ gốc tới node thành danh sách PuzzleState"""
+        geometry = self.geometry
+        nodes = []
+        while node != -1:
+            nodes.append(node)
+            node = self.parents[node]
+        nodes.reverse()
+        
+        root = nodes[0]
+        path = [PuzzleState(geometry.unpack(self.keys[root]), heuristic_fn=heuristic_fn, geometry=geometry)]
+        for node in nodes[1:]:
+            parent = path[-1]
+            path.append(parent._make_child(self.keys[node], self.blank[node], self.h[node],
+                                           self.move[node]))
+        return path
+
+def build_path(initial_board: List[int], move_codes, heuristic_fn=None,
+               geometry: Optional[BoardGeometry] = None) -> List[PuzzleState]:
+    """Dựng đường đi PuzzleState từ bảng ban đầu và dãy mã nước đi"""
+    path = [PuzzleState(initial_board, heuristic_fn=heuristic_fn, geometry=geometry)]
+    for code in move_codes:
+        path.append(path[-1].apply_move(code))
+    return path
+
+def path_move_codes(path: List[PuzzleState]) -> List[int]:
+    """Hàm ngược của build_path: dãy mã nước đi giữa các trạng thái liên tiếp"""
+    codes = []
+    for state, child in zip(path, path[1:]):
+        delta = (child.empty_pos[0] - state.empty_pos[0], child.empty_pos[1] - state.empty_pos[1])
+        codes.append(_MOVE_CODES[delta])
+    return codes
+
+class HeapFrontier:
+    """Frontier dùng binary heap, ưu tiên f nhỏ nhất rồi g lớn nhất"""
+    
+    def __init__(self):
+        self.heap = []
+    
+    def push(self, f: int, g: int, node: int):
+        heapq.heappush(self.heap, (f, -g, node))
+    
+    def pop(self) -> Tuple[int, int]:
+        f, _, node = heapq.heappop(self.heap)
+        return f, node
+    
+    def peek_f(self) -> int:
+        """f nhỏ nhất hiện có trong frontier (không lấy ra)"""
+        return self.heap[0][0]
+    
+    def __len__(self):
+        return len(self.heap)
+
+class BucketFrontier:
+    """Frontier dạng mảng bucket theo f (số nguyên nhỏ), trong mỗi f chia tiếp theo g.
+    
+    Push và pop đều O(1) (khấu hao): con trỏ f nhỏ nhất chỉ lùi khi có node
+    với f nhỏ hơn được thêm vào, còn trong mỗi f thì lấy g lớn nhất trước.
+    """
+    
+    def __init__(self):
+        self.buckets = []   # buckets[f][g] -> danh sách node
+        self.counts = []    # số node trong mỗi f
+        self.top_g = []     # g lớn nhất có thể còn node trong mỗi f
+        self.min_f = 0
+        self.size = 0
+    
+    def push(self, f: int, g: int, node: int):
+        while len(self.buckets) <= f:
+            self.buckets.append([])
+            self.counts.append(0)
+            self.top_g.append(-1)
+        level = self.buckets[f]
+        while len(level) <= g:
+            level.append([])
+        level[g].append(node)
+        self.counts[f] += 1
+        if g > self.top_g[f]:
+            self.top_g[f] = g
+        if f < self.min_f:
+            self.min_f = f
+        self.size += 1
+    
+    def pop(self) -> Tuple[int, int]:
+        if not self.size:
+            raise IndexError("pop from empty frontier")
+        f = self.min_f
+        while not self.counts[f]:
+            f += 1
+        self.min_f = f
+        
+        level = self.buckets[f]
+        g = self.top_g[f]
+        while not level[g]:
+            g -= 1
+        self.top_g[f] = g
+        
+        self.counts[f] -= 1
+        self.size -= 1
+        return f, level[g].pop()
+    
+    def peek_f(self) -> int:
+        """f nhỏ nhất hiện có trong frontier (không lấy ra)"""
+        if not self.size:
+            raise IndexError("peek from empty frontier")
+        while not self.counts[self.min_f]:
+            self.min_f += 1
+        return self.min_f
+    
+    def __len__(self):
+        return self.size
+
+FRONTIER_TYPES = {
+    'heap': HeapFrontier,
+    'bucket': BucketFrontier,
+}
+
+class ProgressChannel:
+    """Kênh tiến trình giữa thread giải và thread giao diện, không dùng khóa.
+    
+    Thread giải gọi channel(...) như một progress_callback: chỉ gán một tuple
+    (thao tác nguyên tử) nên không bao giờ phải chờ. Thread giao diện đọc bản
+    mới nhất bằng latest() theo nhịp của nó (ví dụ root.after); các bản cũ hơn
+    bị ghi đè nên không có hàng đợi tăng dần.
+    """
+    
+    def __init__(self):
+        self.snapshot = None
+    
+    def __call__(self, explored: int, frontier_size: int, heuristic: int, cost: int):
+        self.snapshot = (explored, frontier_size, heuristic, cost)
+    
+    def latest(self) -> Optional[Tuple[int, int, int, int]]:
+        """Bản tiến trình mới nhất (explored, frontier_size, heuristic, cost) hoặc None"""
+        return self.snapshot
+    
+    def reset(self):
+        self.snapshot = None
+
+# Số lần gọi stop_callback giữa hai lần đọc đồng hồ của deadline_stop_callback
+DEADLINE_CHECK_INTERVAL = 256
+
+def deadline_stop_callback(deadline: float, check_interval: int = DEADLINE_CHECK_INTERVAL):
+    """stop_callback dừng tìm kiếm khi time.monotonic() vượt deadline.
+    
+    Bộ giải gọi stop_callback ở mỗi lần mở rộng node nên đồng hồ chỉ được đọc sau
+    mỗi check_interval lần gọi; đã hết giờ thì các lần gọi sau đều trả về True.
+    """
+    countdown = check_interval
+    
+    def stop_callback() -> bool:
+        nonlocal countdown
+        countdown -= 1
+        if countdown:
+            return False
+        if time.monotonic() > deadline:
+            countdown = 1
+            return True
+        countdown = check_interval
+        return False
+    
+    return stop_callback
+
+class PuzzleSolver:
+    """Bộ giải puzzle sử dụng thuật toán A*"""
+    
+    def __init__(self, heuristic=None, cache=None, width: Optional[int] = None, height: Optional[int] = None,
+                 backend: Optional[str] = None, instrumentation=None):
+        # heuristic: Heuristic (ví dụ PatternDatabase) hoặc tên trong puzzle_heuristics.HEURISTICS,
+        # mặc định (None) là Manhattan
+        if isinstance(heuristic, str):
+            from puzzle_heuristics import create_heuristic
+            heuristic = create_heuristic(heuristic)
+        self.heuristic = heuristic
+        # backend: 'c' (cần python build_accel.py), 'python', hoặc None để dùng DEFAULT_BACKEND
+        backend = backend or DEFAULT_BACKEND
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend không hợp lệ: {backend}")
+        if backend == 'c' and _puzzle_accel is None:
+            raise ImportError("Chưa sinh backend C, hãy chạy: python build_accel.py")
+        self.backend = backend
+        # instrumentation: SearchInstrumentation (puzzle_instrument.py) đo thời gian từng pha,
+        # tốc độ node, hệ số phân nhánh... của mỗi lần giải; None thì không đo
+        self.instrumentation = instrumentation
+        # cache: SolutionCache (puzzle_cache.py) dùng lại lời giải đã tìm được (chỉ bảng 4x4)
+        self.cache = cache
+        # Kích thước bảng cố định; None thì suy ra từ số ô của từng bảng vuông
+        self.geometry = get_geometry(width, height) if width else None
+        self.explored_count = 0
+        self.max_frontier_size = 0
+        self.is_solving = False
+        # Khoảng thời gian tối thiểu (giây) giữa hai lần gọi progress_callback
+        self.progress_interval = 0.1
+        self._next_progress = 0.0
+    
+    def _progress_due(self) -> bool:
+        """Đã đủ progress_interval kể từ lần báo tiến trình trước chưa.
+        
+        Chỉ được gọi mỗi 256 node nên việc đọc đồng hồ không ảnh hưởng tốc độ tìm kiếm.
+        """
+        now = time.monotonic()
+        if now < self._next_progress:
+            return False
+        self._next_progress = now + self.progress_interval
+        return True
+    
+    @property
+    def heuristic_name(self) -> str:
+        """Tên heuristic đang dùng (được ghi vào stats)"""
+        return 'manhattan' if self.heuristic is None else self.heuristic.name
+    
+    def geometry_for(self, board: List[int]) -> BoardGeometry:
+        """BoardGeometry của bảng; kiểm tra bảng hợp lệ và heuristic dùng được cho kích thước này"""
+        geometry = self.geometry or geometry_for(board)
+        if not geometry.is_valid(board):
+            raise ValueError(f"Bảng không hợp lệ cho kích thước {geometry.width}x{geometry.height}")
+        if self.heuristic is not None and self.heuristic.shape != geometry.shape:
+            width, height = self.heuristic.shape
+            raise ValueError(f"Heuristic {self.heuristic_name} chỉ dùng cho bảng {width}x{height}")
+        return geometry
+    
+    def _engine(self, geometry: BoardGeometry):
+        """Engine của backend C cho bảng và heuristic hiện tại, None nếu phải dùng Python thuần.
+        
+        Engine giữ buffer của các bảng PDB nên được tạo cho từng lần giải, không
+        giữ lại (PatternDatabase.close() cần giải phóng được mmap).
+        """
+        if self.backend != 'c' or geometry.key_typecode is None:
+            return None
+        patterns = tables = None
+        if self.heuristic is not None:
+            accel_tables = self.heuristic.accel_tables()
+            if accel_tables is None:
+                return None
+            patterns, tables = accel_tables
+        manhattan = bytes(distance for row in geometry.manhattan for distance in row)
+        return _puzzle_accel.Engine(geometry.width, geometry.height, geometry.bits, manhattan,
+                                    patterns, tables)
+    
+    def is_solvable(self, board: List[int]) -> bool:
+        """Kiểm tra xem puzzle có giải được không"""
+        inversions = 0
+        flat_board = [x for x in board if x != 0]
+        
+        for i in range(len(flat_board)):
+            for j in range(i + 1, len(flat_board)):
+                if flat_board[i] > flat_board[j]:
+                    inversions += 1
+        
+        geometry = self.geometry or geometry_for(board)
+        # Chiều rộng lẻ: mỗi nước đi giữ nguyên tính chẵn lẻ của số nghịch thế
+        if geometry.width % 2 == 1:
+            return inversions % 2 == 0
+        
+        empty_row = geometry.height - (board.index(0) // geometry.width)
+        
+        if empty_row % 2 == 1:
+            return inversions % 2 == 0
+        else:
+            return inversions % 2 == 1
+    
+    def solve(self, initial_board: List[int], progress_callback=None, stop_callback=None,
+              algorithm: str = 'astar', frontier_type: str = 'bucket', memory_limit: Optional[int] = None,
+              **options):
+        """Giải puzzle bằng thuật toán A* (hoặc IDA* nếu algorithm='ida', HDA* song song nếu 'hda',
+        A* hai chiều nếu 'bidirectional' - chỉ để so sánh, xem solve_bidirectional -,
+        weighted A* nếu 'weighted', anytime nếu 'anytime', bộ giải xây dựng không tối ưu
+        nếu 'constructive', bảng khoảng cách chính xác nếu 'table').
+        
+        frontier_type chọn cấu trúc frontier của A*: 'bucket' hoặc 'heap'.
+        memory_limit (byte) giới hạn bộ nhớ tìm kiếm của A*, xem solve_astar; với thuật
+        toán ngoài MEMORY_LIMIT_ALGORITHMS thì báo ValueError.
+        options là tham số riêng của solve_weighted / solve_anytime (weight, epsilon,
+        deadline, solution_callback, constructive).
+        Nếu solver có cache, lời giải tối ưu đã lưu được dùng lại ngay; lời giải
+        chưa chắc tối ưu (stats['optimal'] False) không được lưu vào cache.
+        Bảng nhỏ (tối đa SMALL_BOARD_SQUARES ô, ví dụ 3x3) với algorithm='astar'
+        được giải bằng bảng khoảng cách chính xác (solve_table) nếu bảng đã được
+        sinh (python distance_table.py build) hoặc đã nạp; ngược lại dùng A*.
+        Nếu solver có instrumentation, lần tìm kiếm được đo và báo cáo nằm trong
+        stats['instrumentation'].
+        """
+        geometry = self.geometry_for(initial_board)
+        if memory_limit is not None and algorithm not in MEMORY_LIMIT_ALGORITHMS:
+            raise ValueError(f"Thuật toán {algorithm} không giới hạn được bộ nhớ (memory_limit), "
+                             f"chỉ dùng được với: {', '.join(MEMORY_LIMIT_ALGORITHMS)}")
+        search = self._solve_uncached
+        if self.instrumentation is not None:
+            search = functools.partial(self.instrumentation.run, self._solve_uncached)
+        if self.cache is None or geometry.shape != (4, 4):
+            path, stats = search(initial_board, progress_callback, stop_callback,
+                                 algorithm, frontier_type, memory_limit, options)
+            stats['heuristic'] = self.heuristic_name
+            return path, stats
+        
+        start_time = time.time()
+        cached_moves = self.cache.lookup(initial_board)
+        if cached_moves is not None:
+            path = build_path(initial_board, cached_moves, self.heuristic)
+            stats = {
+                'solvable': True,
+                'time': time.time() - start_time,
+                'explored': 0,
+                'max_frontier': 0,
+                'solution_length': len(path) - 1,
+                'cache_hit': True
+            }
+        else:
+            path, stats = search(initial_board, progress_callback, stop_callback,
+                                 algorithm, frontier_type, memory_limit, options)
+            stats['cache_hit'] = False
+            if path is not None and stats.get('optimal', True):
+                self.cache.store_path(path)
+        
+        stats.update(self.cache.counters())
+        stats['heuristic'] = self.heuristic_name
+        return path, stats
+    
+    def _solve_uncached(self, initial_board: List[int], progress_callback, stop_callback,
+                        algorithm: str, frontier_type: str, memory_limit: Optional[int] = None,
+                        options: Optional[dict] = None):
+        """Chọn thuật toán theo algorithm và giải"""
+        options = options or {}
+        geometry = self.geometry_for(initial_board)
+        if algorithm == 'weighted':
+            return self.solve_weighted(initial_board, progress_callback, stop_callback, **options)
+        if algorithm == 'anytime':
+            return self.solve_anytime(initial_board, progress_callback, stop_callback, **options)
+        if options:
+            raise ValueError(f"Tham số {', '.join(options)} không dùng được với thuật toán {algorithm}")
+        if algorithm == 'ida':
+            return self.solve_ida_star(initial_board, progress_callback, stop_callback)
+        if algorithm == 'bidirectional':
+            return self.solve_bidirectional(initial_board, progress_callback, stop_callback)
+        if algorithm == 'constructive':
+            return self.solve_constructive(initial_board)
+        if algorithm == 'table':
+            return self.solve_table(initial_board)
+        if algorithm == 'hda':
+            if geometry.shape != (4, 4):
+                raise ValueError("HDA* chỉ hỗ trợ bảng 4x4")
+            from puzzle_parallel import solve_parallel
+            from puzzle_heuristics import HEURISTIC_CLASSES, HEURISTICS
+            # Worker tự tạo lại heuristic theo tên (PDB được nạp lại từ file)
+            if self.heuristic is not None and type(self.heuristic) is not HEURISTIC_CLASSES.get(self.heuristic_name):
+                raise ValueError(f"HDA* chỉ hỗ trợ heuristic tạo lại được theo tên ({', '.join(HEURISTICS)}), "
+                                 f"không dùng được {type(self.heuristic).__name__}")
+            pdb_path = getattr(self.heuristic, 'path', None)
+            if self.heuristic_name == 'pdb' and pdb_path is None:
+                raise ValueError("HDA* chỉ hỗ trợ PatternDatabase nạp từ file")
+            self.is_solving = True
+            result = solve_parallel(initial_board, heuristic=self.heuristic_name, pdb_path=pdb_path,
+                                    pdb_reflect=getattr(self.heuristic, 'reflect', False),
+                                    progress_callback=progress_callback,
+                                    stop_callback=lambda: not self.is_solving or bool(stop_callback and stop_callback()))
+            self.is_solving = False
+            return result
+        if algorithm != 'astar':
+            raise ValueError(f"Thuật toán không hợp lệ: {algorithm}")
+        if geometry.size <= SMALL_BOARD_SQUARES:
+            from distance_table import distance_table_available
+            # Chỉ dùng bảng đã có sẵn: sinh bảng mất cỡ một giây, lâu hơn A* trên bảng nhỏ
+            if distance_table_available(geometry):
+                return self.solve_table(initial_board)
+        return self.solve_astar(initial_board, progress_callback, stop_callback, frontier_type, memory_limit)
+    
+    def solve_astar(self, initial_board: List[int], progress_callback=None, stop_callback=None,
+                    frontier_type: str = 'bucket', memory_limit: Optional[int] = None):
+        """Giải puzzle bằng thuật toán A*.
+        
+        Nếu có memory_limit (byte), số node được giới hạn theo ước lượng
+        ASTAR_NODE_BYTES mỗi node. Khi chạm giới hạn, A* giải phóng arena và
+        frontier rồi chuyển sang IDA* (bộ nhớ tuyến tính) với ngưỡng ban đầu là
+        f nhỏ nhất trong frontier - một cận dưới của lời giải tối ưu nên lời giải
+        vẫn tối ưu. stats['mode'] cho biết thuật toán nào kết thúc việc tìm kiếm.
+        """
+        if frontier_type not in FRONTIER_TYPES:
+            raise ValueError(f"Loại frontier không hợp lệ: {frontier_type}")
+        
+        start_time = time.time()
+        geometry = self.geometry_for(initial_board)
+        successors, mask = geometry.successors, geometry.mask
+        manhattan, goal_key = geometry.manhattan, geometry.goal_key
+        self.is_solving = True
+            
+        if not self.is_solvable(initial_board):
+            return None, {
+                'solvable': False,
+                'time': time.time() - start_time,
+                'explored': 0,
+                'max_frontier': 0
+            }
+        
+        initial_state = PuzzleState(initial_board, heuristic_fn=self.heuristic, geometry=geometry)
+        
+        if initial_state.is_goal():
+            return [initial_state], {
+                'solvable': True,
+                'time': time.time() - start_time,
+                'explored': 0,
+                'max_frontier': 0,
+                'solution_length': 0
+            }
+        
+        # Node được lưu trong arena; frontier chứa chỉ số node.
+        # best_g[key] là g tốt nhất đã đưa vào frontier, CLOSED khi key đã được mở rộng,
+        # nên bản sao kém hơn của cùng một trạng thái không bao giờ được push.
+        CLOSED = -1
+        arena = SearchArena(geometry)
+        root = arena.add(initial_state.key, -1, 0, initial_state.heuristic, initial_state.blank, -1)
+        frontier = FRONTIER_TYPES[frontier_type]()
+        frontier.push(initial_state.cost, 0, root)
+        best_g = {initial_state.key: 0}
+        open_count = 1
+        max_open_count = 1
+        heuristic_fn = self.heuristic
+        engine = self._engine(geometry)
+        # Khi đo đạc, frontier, best_g và heuristic được bọc để đo thời gian từng pha;
+        # heuristic_fn vẫn là heuristic gốc để dựng đường đi
+        instrumentation = self.instrumentation
+        search_heuristic = heuristic_fn
+        if instrumentation is not None:
+            frontier = instrumentation.timed_frontier(frontier)
+            best_g = instrumentation.timed_table(best_g)
+            search_heuristic = instrumentation.timed_heuristic(heuristic_fn, manhattan)
+        node_budget = memory_limit // ASTAR_NODE_BYTES if memory_limit is not None else None
+        
+        self.explored_count = 0
+        self.max_frontier_size = 0
+        
+        while frontier and self.is_solving:
+            if node_budget is not None and len(arena) >= node_budget:
+                bound = frontier.peek_f()
+                astar_explored = self.explored_count
+                arena = frontier = best_g = engine = None
+                path, stats = self.solve_ida_star(initial_board, progress_callback, stop_callback,
+                                                  initial_bound=bound)
+                stats.update({
+                    'time': time.time() - start_time,
+                    'explored': astar_explored + stats['explored'],
+                    'explored_astar': astar_explored,
+                    'mode': 'ida',
+                    'memory_limit': memory_limit
+                })
+                return path, stats
+            
+            if stop_callback and stop_callback():
+                self.is_solving = False
+                break
+                
+            self.max_frontier_size = max(self.max_frontier_size, len(frontier))
+            
+            cost, node = frontier.pop()
+            key = arena.keys[node]
+            
+            # Bản sao đã bị thay bởi g tốt hơn (hoặc trạng thái đã đóng)
+            if best_g[key] != arena.g[node]:
+                continue
+            
+            best_g[key] = CLOSED
+            open_count -= 1
+            self.explored_count += 1
+            h = arena.h[node]
+            
+            # Callback để cập nhật GUI (giới hạn theo thời gian, xem _progress_due)
+            if progress_callback and not self.explored_count & 255 and self._progress_due():
+                progress_callback(self.explored_count, len(frontier), h, cost)
+            
+            if key == goal_key:
+                path = arena.path(node, heuristic_fn)
+                
+                self.is_solving = False
+                return path, {
+                    'solvable': True,
+                    'time': time.time() - start_time,
+                    'explored': self.explored_count,
+                    'max_frontier': self.max_frontier_size,
+                    'max_frontier_unique': max_open_count,
+                    'solution_length': len(path) - 1,
+                    'mode': 'astar',
+                    'backend': 'python' if engine is None else 'c'
+                }
+            
+            g = arena.g[node] + 1
+            empty_index = arena.blank[node]
+            if instrumentation is not None:
+                instrumentation.expanded(g - 1, cost, len(successors[empty_index][arena.move[node]]))
+            
+            if engine is not None:
+                # Backend C sinh sẵn (mã nước đi, key, ô trống, h) của các trạng thái con
+                for code, new_key, new_index, new_h in engine.expand(key, empty_index, arena.move[node], h):
+                    old_g = best_g.get(new_key)
+                    if old_g is None:
+                        open_count += 1
+                    elif old_g == CLOSED or old_g <= g:
+                        continue
+                    best_g[new_key] = g
+                    child = arena.add(new_key, node, g, new_h, new_index, code)
+                    frontier.push(g + new_h, g, child)
+            else:
+                # Bảng successors đã bỏ nước đi ngược nên node cha không bị sinh lại
+                for code, new_index, new_shift, empty_shift in successors[empty_index][arena.move[node]]:
+                    tile = (key >> new_shift) & mask
+                    new_key = key ^ (tile << new_shift) ^ (tile << empty_shift)
+                    
+                    old_g = best_g.get(new_key)
+                    if old_g is None:
+                        open_count += 1
+                    elif old_g == CLOSED or old_g <= g:
+                        continue
+                    best_g[new_key] = g
+                    
+                    if search_heuristic is None:
+                        new_h = h - manhattan[tile][new_index] + manhattan[tile][empty_index]
+                    else:
+                        new_h = search_heuristic.update(key, new_key, h, tile, new_index, empty_index)
+                    
+                    child = arena.add(new_key, node, g, new_h, new_index, code)
+                    frontier.push(g + new_h, g, child)
+            
+            if open_count > max_open_count:
+                max_open_count = open_count
+        
+        self.is_solving = False
+        return None, {
+            'solvable': False,
+            'time': time.time() - start_time,
+            'explored': self.explored_count,
+            'max_frontier': self.max_frontier_size,
+            'max_frontier_unique': max_open_count,
+            'mode': 'astar',
+            'backend': 'python' if engine is None else 'c'
+        }
+
+    def solve_ida_star(self, initial_board: List[int], progress_callback=None, stop_callback=None,
+                       initial_bound: Optional[int] = None):
+        """Giải puzzle bằng IDA* - bộ nhớ chỉ tăng tuyến tính theo độ sâu lời giải.
+        
+        initial_bound là cận dưới đã biết của độ dài lời giải (ví dụ từ A* bị
+        giới hạn bộ nhớ) để bỏ qua các vòng lặp có ngưỡng nhỏ hơn.
+        """
+        start_time = time.time()
+        geometry = self.geometry_for(initial_board)
+        self.is_solving = True
+        
+        if not self.is_solvable(initial_board):
+            return None, {
+                'solvable': False,
+                'time': time.time() - start_time,
+                'explored': 0,
+                'max_frontier': 0
+            }
+        
+        initial_state = PuzzleState(initial_board, heuristic_fn=self.heuristic, geometry=geometry)
+        
+        if initial_state.is_goal():
+            return [initial_state], {
+                'solvable': True,
+                'time': time.time() - start_time,
+                'explored': 0,
+                'max_frontier': 0,
+                'solution_length': 0
+            }
+        
+        self.explored_count = 0
+        self.max_frontier_size = 0
+        successors, mask, goal_key = geometry.successors, geometry.mask, geometry.goal_key
+        manhattan = geometry.manhattan
+        heuristic_fn = self.heuristic
+        instrumentation = self.instrumentation
+        search_heuristic = heuristic_fn
+        if instrumentation is not None:
+            search_heuristic = instrumentation.timed_heuristic(heuristic_fn, manhattan)
+        
+        # Chỉ giữ dãy mã nước đi của đường đi hiện tại thay vì frontier và tập explored
+        codes = []
+        
+        def search(key: int, g: int, h: int, blank: int, previous: int, bound: int) -> int:
+            """Tìm kiếm theo chiều sâu có giới hạn f(n) <= bound, trả về -1 nếu tìm thấy đích"""
+            f = g + h
+            if f > bound:
+                return f
+            if key == goal_key:
+                return -1
+            if stop_callback and stop_callback():
+                self.is_solving = False
+            if not self.is_solving:
+                return float('inf')
+            
+            self.explored_count += 1
+            if g >= self.max_frontier_size:
+                self.max_frontier_size = g + 1
+            if instrumentation is not None:
+                instrumentation.expanded(g, f, len(successors[blank][previous]))
+            
+            # Callback để cập nhật GUI (giới hạn theo thời gian, xem _progress_due)
+            if progress_callback and not self.explored_count & 255 and self._progress_due():
+                progress_callback(self.explored_count, g + 1, h, f)
+            
+            next_bound = float('inf')
+            # Bảng successors đã bỏ nước đi ngược nên không quay lại trạng thái trước đó
+            for code, new_index, new_shift, empty_shift in successors[blank][previous]:
+                tile = (key >> new_shift) & mask
+                new_key = key ^ (tile << new_shift) ^ (tile << empty_shift)
+                if search_heuristic is None:
+                    new_h = h - manhattan[tile][new_index] + manhattan[tile][blank]
+                else:
+                    new_h = search_heuristic.update(key, new_key, h, tile, new_index, blank)
+                codes.append(code)
+                result = search(new_key, g + 1, new_h, new_index, code, bound)
+                if result == -1:
+                    return -1
+                if result < next_bound:
+                    next_bound = result
+                codes.pop()
+            return next_bound
+        
+        engine = self._engine(geometry)
+        
+        def poll(explored: int, depth: int, h: int, f: int) -> bool:
+            """Backend C gọi định kỳ trong khi tìm kiếm; trả về True để dừng"""
+            if stop_callback and stop_callback():
+                self.is_solving = False
+            if progress_callback and self._progress_due():
+                progress_callback(self.explored_count + explored, depth, h, f)
+            if instrumentation is not None:
+                instrumentation.sample_rate(self.explored_count + explored)
+            return not self.is_solving
+        
+        bound = max(initial_state.cost, initial_bound or 0)
+        iterations = 0
+        while self.is_solving:
+            iterations += 1
+            iteration_start = self.explored_count
+            if engine is None:
+                result = search(initial_state.key, 0, initial_state.heuristic, initial_state.blank, -1, bound)
+            else:
+                result, found, explored, depth, _ = engine.ida(initial_state.key, initial_state.blank,
+                                                               initial_state.heuristic, bound, poll)
+                self.explored_count += explored
+                self.max_frontier_size = max(self.max_frontier_size, depth)
+                codes[:] = found
+                if result is None:
+                    result = float('inf')
+            if instrumentation is not None:
+                instrumentation.bound_finished(bound, self.explored_count - iteration_start)
+            if result == -1:
+                self.is_solving = False
+                path = build_path(initial_board, codes, heuristic_fn, geometry)
+                return path, {
+                    'solvable': True,
+                    'time': time.time() - start_time,
+                    'explored': self.explored_count,
+                    'max_frontier': self.max_frontier_size,
+                    'solution_length': len(path) - 1,
+                    'iterations': iterations,
+                    'backend': 'python' if engine is None else 'c'
+                }
+            if result == float('inf'):
+                break
+            bound = result
+        
+        self.is_solving = False
+        return None, {
+            'solvable': False,
+            'time': time.time() - start_time,
+            'explored': self.explored_count,
+            'max_frontier': self.max_frontier_size,
+            'iterations': iterations,
+            'backend': 'python' if engine is None else 'c'
+        }
+
+    def solve_bidirectional(self, initial_board: List[int], progress_callback=None, stop_callback=None):
+        """Giải puzzle bằng A* hai chiều (front-to-end): một phía tìm từ trạng thái ban đầu
+        về đích, phía kia tìm ngược từ đích về trạng thái ban đầu.
+        
+        Phía ngược luôn dùng Manhattan tới bảng ban đầu, không dùng self.heuristic
+        (LC/WD/PDB chỉ đo khoảng cách tới đích và không đổi nhãn được để đo tới một
+        bảng bất kỳ vì ô trống không nằm ở vị trí đích), và không có gì được dùng lại
+        giữa các lần giải. Vì vậy chế độ này kém hơn solve_astar với cùng heuristic
+        (với PDB: 3.3 triệu so với 120 nghìn node mở rộng) và chỉ được giữ để so sánh
+        trong benchmark, không phải một tùy chọn hiệu năng.
+        
+        Hai frontier được sắp theo độ ưu tiên của MMe (Holte và cộng sự, 2016)
+        pr = max(f, 2g + 1) nên hai phía gặp nhau ở giữa, và mỗi lần mở rộng phía có
+        pr nhỏ nhất. Dừng khi chi phí đường đi tốt nhất qua điểm gặp nhau
+        U <= max(C, gmin_tiến + gmin_lùi + 1) với C là pr nhỏ nhất và gmin là g nhỏ
+        nhất của các node còn mở ở mỗi phía;
+        cả hai đều là cận dưới của mọi đường đi chưa tìm thấy nên lời giải vẫn tối ưu.
+        """
+        start_time = time.time()
+        geometry = self.geometry_for(initial_board)
+        successors, mask = geometry.successors, geometry.mask
+        self.is_solving = True
+        
+        if not self.is_solvable(initial_board):
+            return None, {
+                'solvable': False,
+                'time': time.time() - start_time,
+                'explored': 0,
+                'max_frontier': 0
+            }
+        
+        initial_state = PuzzleState(initial_board, heuristic_fn=self.heuristic, geometry=geometry)
+        
+        if initial_state.is_goal():
+            return [initial_state], {
+                'solvable': True,
+                'time': time.time() - start_time,
+                'explored': 0,
+                'max_frontier': 0,
+                'solution_length': 0
+            }
+        
+        # Bảng Manhattan tới trạng thái ban đầu cho phía tìm ngược
+        to_start_table = geometry.manhattan_table(initial_board)
+        
+        def make_side(key, h, blank, table, heuristic_fn):
+            frontier = BucketFrontier()
+            frontier.push(h, 0, key)
+            return {
+                # open_g[g]: số node còn mở có g đó; g_min: không lớn hơn g nhỏ nhất còn mở
+                'open_g': [1],
+                'g_min': 0,
+                'frontier': frontier,
+                'g': {key: 0},
+                'h': {key: h},
+                'blank': {key: blank},
+                'parent': {key: None},
+                'closed': set(),
+                'table': table,
+                'heuristic_fn': heuristic_fn,
+                'explored': 0
+            }
+        
+        forward = make_side(initial_state.key, initial_state.heuristic, initial_state.blank,
+                            geometry.manhattan, self.heuristic)
+        goal_h = sum(to_start_table[tile][square] for square, tile in enumerate(geometry.goal))
+        backward = make_side(geometry.goal_key, goal_h, geometry.size - 1, to_start_table, None)
+        
+        best_cost = float('inf')
+        meeting_key = None
+        self.explored_count = 0
+        self.max_frontier_size = 0
+        
+        def open_node(side, g):
+            open_g = side['open_g']
+            while len(open_g) <= g:
+                open_g.append(0)
+            open_g[g] += 1
+            if g < side['g_min']:
+                side['g_min'] = g
+        
+        def g_min(side):
+            """g nhỏ nhất của các node còn mở (vô cùng nếu không còn node nào)"""
+            open_g, g = side['open_g'], side['g_min']
+            while g < len(open_g) and not open_g[g]:
+                g += 1
+            side['g_min'] = g
+            return g if g < len(open_g) else float('inf')
+        
+        def expand(side, other):
+            """Mở rộng một node của side, trả về chi phí đường đi tốt nhất mới (nếu có)"""
+            nonlocal best_cost, meeting_key
+            priority, key = side['frontier'].pop()
+            g = side['g'][key]
+            h = side['h'][key]
+            f = g + h
+            # Bỏ bản sao cũ (đã có g tốt hơn nên pr nhỏ hơn) hoặc node đã đóng
+            if key in side['closed'] or max(f, 2 * g + 1) != priority:
+                return
+            side['closed'].add(key)
+            side['open_g'][g] -= 1
+            side['explored'] += 1
+            self.explored_count += 1
+            
+            if progress_callback and not self.explored_count & 255 and self._progress_due():
+                progress_callback(self.explored_count, len(forward['frontier']) + len(backward['frontier']),
+                                  h, f)
+            
+            table = side['table']
+            heuristic_fn = side['heuristic_fn']
+            empty_index = side['blank'][key]
+            parent = side['parent'][key]
+            previous = parent[1] if parent is not None else -1
+            child_g = g + 1
+            for code, new_index, new_shift, empty_shift in successors[empty_index][previous]:
+                tile = (key >> new_shift) & mask
+                new_key = key ^ (tile << new_shift) ^ (tile << empty_shift)
+                
+                old_g = side['g'].get(new_key)
+                if old_g is not None and old_g <= child_g:
+                    continue
+                if heuristic_fn is None:
+                    new_h = h - table[tile][new_index] + table[tile][empty_index]
+                else:
+                    new_h = heuristic_fn.update(key, new_key, h, tile, new_index, empty_index)
+                
+                if old_g is not None and new_key not in side['closed']:
+                    side['open_g'][old_g] -= 1
+                open_node(side, child_g)
+                side['g'][new_key] = child_g
+                side['h'][new_key] = new_h
+                side['blank'][new_key] = new_index
+                side['parent'][new_key] = (key, code)
+                side['closed'].discard(new_key)
+                side['frontier'].push(max(child_g + new_h, 2 * child_g + 1), child_g, new_key)
+                
+                # Hai phía gặp nhau: cập nhật đường đi tốt nhất
+                other_g = other['g'].get(new_key)
+                if other_g is not None and child_g + other_g < best_cost:
+                    best_cost = child_g + other_g
+                    meeting_key = new_key
+        
+        while forward['frontier'] and backward['frontier'] and self.is_solving:
+            if stop_callback and stop_callback():
+                self.is_solving = False
+                break
+            
+            forward_priority = forward['frontier'].peek_f()
+            backward_priority = backward['frontier'].peek_f()
+            if best_cost <= max(min(forward_priority, backward_priority),
+                                g_min(forward) + g_min(backward) + 1):
+                break
+            
+            frontier_size = len(forward['frontier']) + len(backward['frontier'])
+            self.max_frontier_size = max(self.max_frontier_size, frontier_size)
+            
+            # Mở rộng phía có pr nhỏ hơn, bằng nhau thì phía có frontier nhỏ hơn
+            if (forward_priority, len(forward['frontier'])) <= (backward_priority, len(backward['frontier'])):
+                expand(forward, backward)
+            else:
+                expand(backward, forward)
+        
+        stats = {
+            'time': time.time() - start_time,
+            'explored': self.explored_count,
+            'explored_forward': forward['explored'],
+            'explored_backward': backward['explored'],
+            'max_frontier': self.max_frontier_size,
+            'mode': 'bidirectional',
+            'backend': 'python'
+        }
+        
+        if meeting_key is None or not self.is_solving:
+            self.is_solving = False
+            stats['solvable'] = False
+            return None, stats
+        self.is_solving = False
+        
+        # Nửa đầu: từ trạng thái ban đầu tới điểm gặp; nửa sau: đi ngược chuỗi cha của phía đích
+        codes = []
+        key = meeting_key
+        while forward['parent'][key] is not None:
+            key, code = forward['parent'][key]
+            codes.append(code)
+        codes.reverse()
+        key = meeting_key
+        while backward['parent'][key] is not None:
+            key, code = backward['parent'][key]
+            codes.append(code ^ 1)
+        
+        path = build_path(initial_board, codes, self.heuristic, geometry)
+        stats['solvable'] = True
+        stats['solution_length'] = len(path) - 1
+        return path, stats
+    
+    def solve_constructive(self, initial_board: List[int]):
+        """Giải nhanh từng hàng rồi từng cột (puzzle_constructive), lời giải không tối ưu.
+        
+        Thời gian gần như không phụ thuộc độ khó của bảng nên dùng được làm lời
+        giải dự phòng trong khi các thuật toán tối ưu còn đang chạy.
+        """
+        from puzzle_constructive import solve_constructive
+        
+        start_time = time.time()
+        geometry = self.geometry_for(initial_board)
+        if not self.is_solvable(initial_board):
+            return None, {
+                'solvable': False,
+                'time': time.time() - start_time,
+                'explored': 0,
+                'max_frontier': 0
+            }
+        
+        codes = solve_constructive(initial_board, geometry.width, geometry.height)
+        path = build_path(initial_board, codes, self.heuristic, geometry)
+        return path, {
+            'solvable': True,
+            'time': time.time() - start_time,
+            'explored': 0,
+            'max_frontier': 0,
+            'solution_length': len(codes),
+            'mode': 'constructive',
+            'optimal': not codes
+        }
+    
+    def solve_table(self, initial_board: List[int]):
+        """Giải bảng nhỏ (tối đa SMALL_BOARD_SQUARES ô) bằng bảng khoảng cách chính xác.
+        
+        Mỗi bước chọn nước đi làm khoảng cách giảm 1 nên lời giải tối ưu mà không
+        cần tìm kiếm; bảng được nạp từ file hoặc sinh một lần cho mỗi kích thước
+        rồi ghi ra file cho các tiến trình sau (distance_table.load_distance_table).
+        """
+        from distance_table import load_distance_table
+        
+        start_time = time.time()
+        geometry = self.geometry_for(initial_board)
+        if not self.is_solvable(initial_board):
+            return None, {
+                'solvable': False,
+                'time': time.time() - start_time,
+                'explored': 0,
+                'max_frontier': 0
+            }
+        
+        codes = load_distance_table(geometry).solve(initial_board)
+        path = build_path(initial_board, codes, self.heuristic, geometry)
+        return path, {
+            'solvable': True,
+            'time': time.time() - start_time,
+            'explored': len(codes),
+            'max_frontier': 0,
+            'solution_length': len(codes),
+            'mode': 'table'
+        }
+    
+    def solve_weighted(self, initial_board: List[int], progress_callback=None, stop_callback=None,
+                       weight: float = 2.0):
+        """Weighted A*: ưu tiên f = g + weight * h, dừng ở lời giải đầu tiên.
+        
+        Lời giải dài không quá weight lần lời giải tối ưu (heuristic admissible).
+        """
+        return self.solve_anytime(initial_board, progress_callback, stop_callback,
+                                  weight=weight, epsilon=weight, first_only=True)
+    
+    def solve_anytime(self, initial_board: List[int], progress_callback=None, stop_callback=None,
+                      deadline: Optional[float] = None, epsilon: float = 1.0, weight: float = 3.0,
+                      solution_callback=None, first_only: bool = False, constructive: bool = False):
+        """Anytime weighted A*: tìm nhanh một lời giải bằng weighted A* rồi cải thiện dần.
+        
+        Mỗi lần có lời giải tốt hơn, weight giảm một nửa (không nhỏ hơn 1) và
+        frontier được sắp lại theo weight mới như ARA*; node có g + h không nhỏ
+        hơn lời giải hiện có bị bỏ. Việc tìm kiếm dừng khi:
+        - lời giải hiện có <= epsilon * cận dưới (g + h nhỏ nhất trong frontier),
+        - frontier rỗng (lời giải hiện có là tối ưu),
+        - quá deadline (giây tính từ lúc gọi) hoặc stop_callback trả về True.
+        
+        solution_callback(path, stats) được gọi trong thread giải với mỗi lời giải
+        tốt hơn; stats['optimal'] cho biết lời giải cuối đã được chứng minh tối ưu chưa.
+        Nếu constructive=True, lời giải của solve_constructive được lấy làm lời giải
+        đầu tiên nên luôn có kết quả ngay cả khi deadline rất ngắn.
+        """
+        start_time = time.time()
+        geometry = self.geometry_for(initial_board)
+        successors, mask = geometry.successors, geometry.mask
+        manhattan, goal_key = geometry.manhattan, geometry.goal_key
+        self.is_solving = True
+        mode = 'weighted' if first_only else 'anytime'
+        
+        if not self.is_solvable(initial_board):
+            return None, {
+                'solvable': False,
+                'time': time.time() - start_time,
+                'explored': 0,
+                'max_frontier': 0
+            }
+        
+        initial_state = PuzzleState(initial_board, heuristic_fn=self.heuristic, geometry=geometry)
+        
+        if initial_state.is_goal():
+            return [initial_state], {
+                'solvable': True,
+                'time': time.time() - start_time,
+                'explored': 0,
+                'max_frontier': 0,
+                'solution_length': 0,
+                'mode': mode,
+                'optimal': True
+            }
+        
+        end_time = start_time + deadline if deadline is not None else None
+        heuristic_fn = self.heuristic
+        arena = SearchArena(geometry)
+        root = arena.add(initial_state.key, -1, 0, initial_state.heuristic, initial_state.blank, -1)
+        heap = [(weight * initial_state.heuristic, 0, root)]
+        best_g = {initial_state.key: 0}
+        # Số mục trong heap theo f = g + h (không trọng số): f nhỏ nhất là cận dưới của lời giải tối ưu
+        f_counts = [0] * (initial_state.cost + 1)
+        f_counts[initial_state.cost] = 1
+        lower = initial_state.cost
+        
+        incumbent = float('inf')
+        best_node = None
+        solutions = 0
+        first_solution_time = None
+        constructive_codes = None
+        
+        self.explored_count = 0
+        self.max_frontier_size = 0
+        
+        if constructive:
+            from puzzle_constructive import solve_constructive
+            constructive_codes = solve_constructive(initial_board, geometry.width, geometry.height)
+            incumbent = len(constructive_codes)
+            solutions = 1
+            first_solution_time = time.time() - start_time
+            if solution_callback:
+                solution_callback(build_path(initial_board, constructive_codes, heuristic_fn, geometry), {
+                    'solution_length': incumbent,
+                    'time': first_solution_time,
+                    'explored': 0,
+                    'weight': weight,
+                    'lower_bound': lower,
+                    'suboptimality': incumbent / lower
+                })
+        
+        while heap and self.is_solving:
+            if stop_callback and stop_callback():
+                self.is_solving = False
+                break
+            if end_time is not None and time.time() > end_time:
+                break
+            
+            while not f_counts[lower]:
+                lower += 1
+            if incumbent <= epsilon * lower:
+                break
+            
+            self.max_frontier_size = max(self.max_frontier_size, len(heap))
+            _, neg_g, node = heapq.heappop(heap)
+            g = -neg_g
+            h = arena.h[node]
+            f_counts[g + h] -= 1
+            key = arena.keys[node]
+            # Bản sao cũ hoặc không thể cho lời giải tốt hơn
+            if best_g[key] != g or g + h >= incumbent:
+                continue
+            
+            self.explored_count += 1
+            if first_only:
+                # Weighted A* không mở lại node đã mở rộng (giới hạn weight vẫn đúng)
+                best_g[key] = -1
+            if progress_callback and not self.explored_count & 255 and self._progress_due():
+                progress_callback(self.explored_count, len(heap), h, g + h)
+            
+            if key == goal_key:
+                incumbent = g
+                best_node = node
+                solutions += 1
+                if first_solution_time is None:
+                    first_solution_time = time.time() - start_time
+                if solution_callback:
+                    solution_callback(arena.path(node, heuristic_fn), {
+                        'solution_length': g,
+                        'time': time.time() - start_time,
+                        'explored': self.explored_count,
+                        'weight': weight,
+                        'lower_bound': lower,
+                        'suboptimality': g / lower
+                    })
+                if first_only:
+                    break
+                if weight > 1:
+                    # Giảm weight và sắp lại frontier (bỏ luôn bản sao cũ và node bị cắt)
+                    weight = max(1.0, weight / 2)
+                    entries = []
+                    f_counts = [0] * (incumbent + 1)
+                    for _, neg_g, other in heap:
+                        other_g, other_h = -neg_g, arena.h[other]
+                        if best_g[arena.keys[other]] == other_g and other_g + other_h < incumbent:
+                            entries.append((other_g + weight * other_h, neg_g, other))
+                            f_counts[other_g + other_h] += 1
+                    heap = entries
+                    heapq.heapify(heap)
+                    lower = min(lower, incumbent)
+                continue
+            
+            child_g = g + 1
+            empty_index = arena.blank[node]
+            for code, new_index, new_shift, empty_shift in successors[empty_index][arena.move[node]]:
+                tile = (key >> new_shift) & mask
+                new_key = key ^ (tile << new_shift) ^ (tile << empty_shift)
+                
+                # Ở chế độ anytime, node đã mở rộng vẫn được mở lại khi tìm thấy g tốt hơn
+                old_g = best_g.get(new_key)
+                if old_g is not None and old_g <= child_g:
+                    continue
+                
+                if heuristic_fn is None:
+                    new_h = h - manhattan[tile][new_index] + manhattan[tile][empty_index]
+                else:
+                    new_h = heuristic_fn.update(key, new_key, h, tile, new_index, empty_index)
+                f = child_g + new_h
+                if f >= incumbent:
+                    continue
+                
+                best_g[new_key] = child_g
+                child = arena.add(new_key, node, child_g, new_h, new_index, code)
+                heapq.heappush(heap, (child_g + weight * new_h, -child_g, child))
+                while len(f_counts) <= f:
+                    f_counts.append(0)
+                f_counts[f] += 1
+                if f < lower:
+                    lower = f
+        
+        self.is_solving = False
+        stats = {
+            'solvable': best_node is not None or constructive_codes is not None,
+            'time': time.time() - start_time,
+            'explored': self.explored_count,
+            'max_frontier': self.max_frontier_size,
+            'mode': mode,
+            'solutions': solutions,
+            'first_solution_time': first_solution_time,
+            'weight': weight
+        }
+        if best_node is None and constructive_codes is None:
+            return None, stats
+        
+        # Frontier đã hết (hoặc chỉ còn node bị cắt) thì lời giải hiện có là tối ưu
+        if not any(best_g[arena.keys[n]] == -neg_g and -neg_g + arena.h[n] < incumbent
+                   for _, neg_g, n in heap):
+            lower = incumbent
+        else:
+            while not f_counts[lower]:
+                lower += 1
+            lower = min(lower, incumbent)
+        if best_node is not None:
+            path = arena.path(best_node, heuristic_fn)
+        else:
+            path = build_path(initial_board, constructive_codes, heuristic_fn, geometry)
+        stats.update({
+            'solution_length': incumbent,
+            'lower_bound': lower,
+            'suboptimality': incumbent / lower,
+            'optimal': incumbent == lower
+        })
+        return path, stats
+
+def create_random_solvable_puzzle(moves: int = 1000, rng: Optional[random.Random] = None,
+                                  width: int = 4, height: Optional[int] = None) -> List[int]:
+    """Tạo puzzle ngẫu nhiên có thể giải được (mặc định 4x4).
+    
+    Xáo trộn từ trạng thái đích bằng moves nước đi ngẫu nhiên (không đi ngược
+    nước vừa đi); truyền rng (random.Random có seed) để tạo lại đúng bộ bảng.
+    """
+    rng = rng or random
+    geometry = get_geometry(width, height)
+    puzzle = geometry.goal[:]
+    empty_pos = geometry.size - 1
+    previous = -1
+    
+    # Xáo trộn bằng cách thực hiện các bước di chuyển hợp lệ
+    for _ in range(moves):
+        candidates = [square for _, square in geometry.neighbors[empty_pos] if square != previous]
+        new_pos = rng.choice(candidates)
+        puzzle[empty_pos], puzzle[new_pos] = puzzle[new_pos], puzzle[empty_pos]
+        previous, empty_pos = empty_pos, new_pos
+    
+    return puzzle
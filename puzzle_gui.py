@@ -0,0 +1,838 @@
+"""Giao diện đồ họa tkinter cho 15-Puzzle Solver"""
+import tkinter as tk
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+import threading
+
+from pattern_database import load_default_pattern_database
+from puzzle_cache import SolutionCache
+from puzzle_core import ProgressChannel, PuzzleSolver, PuzzleState, create_random_solvable_puzzle, get_geometry
+from puzzle_instrument import SearchInstrumentation
+
+class PuzzleGUI:
+    """Giao diện đồ họa cho 15-Puzzle"""
+    
+    def __init__(self, size: int = 4):
+        self.root = tk.Tk()
+        self.root.title("15-Puzzle Solver - Thuật toán A*")
+        self.root.geometry("1000x700")
+        self.root.configure(bg='#2C3E50')
+        
+        # Dữ liệu puzzle (bảng vuông size x size, mặc định 4x4)
+        self.geometry = get_geometry(size)
+        self.current_board = self.geometry.goal[:]
+        self.solution_path = []
+        # PDB mặc định chỉ dùng cho bảng 4x4, kích thước khác dùng Manhattan
+        self.pattern_database = load_default_pattern_database()
+        self.solver = PuzzleSolver(heuristic=self.pattern_database if size == 4 else None,
+                                   cache=SolutionCache())
+        self.is_solving = False
+        self.replay_index = 0
+        # Thread giải chỉ ghi vào kênh này; giao diện đọc lại bằng root.after
+        self.progress_channel = ProgressChannel()
+        self.progress_poll_ms = 100
+        # Chế độ anytime: lời giải tạm thời do thread giải ghi vào, poll_progress hiển thị
+        self.anytime_deadline = 10.0
+        self.interim_solution = None
+        # Kết quả cuối của thread giải: ('done', solution, stats) hoặc ('error', thông báo);
+        # poll_progress đọc lại và gọi solve_completed / solve_error trong main thread
+        self.solve_result = None
+        # Thread giải đang chạy và cờ dừng riêng của lần giải đó: is_solving chỉ về False
+        # khi thread đã kết thúc nên không thể bắt đầu lần giải mới chồng lên lần cũ
+        self.solve_thread = None
+        self.stop_event = threading.Event()
+        # Đo đạc tìm kiếm: chỉ gắn vào solver khi bật ô 📈 lúc bắt đầu giải
+        self.instrumentation = SearchInstrumentation()
+        
+        # Tạo giao diện
+        self.create_widgets()
+        self.update_display()
+        
+    def create_widgets(self):
+        """Tạo các widget cho giao diện"""
+        
+        # Header
+        header_frame = tk.Frame(self.root, bg='#2C3E50')
+        header_frame.pack(pady=20)
+        
+        title_label = tk.Label(header_frame, text="🧩 15-PUZZLE SOLVER", 
+                              font=('Arial', 24, 'bold'), fg='#ECF0F1', bg='#2C3E50')
+        title_label.pack()
+        
+        subtitle_label = tk.Label(header_frame, text="Giải bài toán 15 ô số bằng Thuật toán A* (Trí tuệ nhân tạo)",
+                                 font=('Arial', 12), fg='#BDC3C7', bg='#2C3E50')
+        subtitle_label.pack(pady=5)
+        
+        # Algorithm info
+        algo_frame = tk.LabelFrame(self.root, text="🧠 Thuật toán A*", 
+                                  font=('Arial', 12, 'bold'), fg='#ECF0F1', bg='#34495E')
+        algo_frame.pack(pady=10, padx=20, fill='x')
+        
+        algo_text = """f(n) = g(n) + h(n)
+• g(n): Chi phí từ trạng thái ban đầu đến n (số bước đã đi)
+• h(n): Heuristic Manhattan Distance (ước tính đến đích)  
+• f(n): Tổng ước tính chi phí để đi qua trạng thái n"""
+        
+        tk.Label(algo_frame, text=algo_text, font=('Arial', 10), 
+                fg='#ECF0F1', bg='#34495E', justify='left').pack(pady=10)
+        
+        # Main content frame
+        main_frame = tk.Frame(self.root, bg='#2C3E50')
+        main_frame.pack(expand=True, fill='both', padx=20)
+        
+        # Left side - Puzzle
+        left_frame = tk.Frame(main_frame, bg='#2C3E50')
+        left_frame.pack(side='left', fill='both', expand=True)
+        
+        # Puzzle frame
+        puzzle_frame = tk.LabelFrame(left_frame, text="🎯 Bảng Puzzle", 
+                                   font=('Arial', 12, 'bold'), fg='#ECF0F1', bg='#34495E')
+        puzzle_frame.pack(pady=10, fill='both', expand=True)
+        
+        # Puzzle grid
+        self.puzzle_frame = tk.Frame(puzzle_frame, bg='#34495E')
+        self.puzzle_frame.pack(pady=20)
+        
+        self.buttons = []
+        self.create_tiles()
+        
+        # Control buttons
+        control_frame = tk.Frame(left_frame, bg='#2C3E50')
+        control_frame.pack(pady=10)
+        
+        self.shuffle_btn = tk.Button(control_frame, text="🎲 Xáo trộn", 
+                                   command=self.shuffle_puzzle,
+                                   bg='#E74C3C', fg='white', font=('Arial', 10, 'bold'),
+                                   padx=20, pady=5)
+        self.shuffle_btn.pack(side='left', padx=5)
+        
+        self.reset_btn = tk.Button(control_frame, text="🔄 Reset",
+                                 command=self.reset_puzzle,
+                                 bg='#F39C12', fg='white', font=('Arial', 10, 'bold'),
+                                 padx=20, pady=5)
+        self.reset_btn.pack(side='left', padx=5)
+        
+        self.demo_btn = tk.Button(control_frame, text="📚 Demo",
+                                command=self.load_demo_puzzle,
+                                bg='#9B59B6', fg='white', font=('Arial', 10, 'bold'),
+                                padx=20, pady=5)
+        self.demo_btn.pack(side='left', padx=5)
+        
+        # Solve button
+        self.solve_btn = tk.Button(left_frame, text="🤖 GIẢI BẰNG A* ALGORITHM",
+                                 command=self.solve_puzzle,
+                                 bg='#27AE60', fg='white', font=('Arial', 12, 'bold'),
+                                 pady=10)
+        self.solve_btn.pack(pady=(20, 5), fill='x')
+        
+        self.anytime_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(left_frame, text="⚡ Anytime: hiện lời giải đầu tiên ngay rồi cải thiện dần",
+                       variable=self.anytime_var, font=('Arial', 10), fg='#ECF0F1', bg='#2C3E50',
+                       selectcolor='#34495E', activebackground='#2C3E50').pack(pady=(0, 10))
+        
+        self.instrument_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(left_frame, text="📈 Đo đạc tìm kiếm: thời gian từng pha, node/s, RSS",
+                       variable=self.instrument_var, font=('Arial', 10), fg='#ECF0F1', bg='#2C3E50',
+                       selectcolor='#34495E', activebackground='#2C3E50').pack(pady=(0, 10))
+        
+        # Progress bar
+        self.progress_var = tk.DoubleVar()
+        self.progress_bar = ttk.Progressbar(left_frame, variable=self.progress_var, 
+                                          mode='indeterminate')
+        
+        # Right side - Stats and Solution
+        right_frame = tk.Frame(main_frame, bg='#2C3E50')
+        right_frame.pack(side='right', fill='both', expand=True, padx=(20, 0))
+        
+        # Stats frame
+        stats_frame = tk.LabelFrame(right_frame, text="📊 Thống kê Thuật toán A*",
+                                  font=('Arial', 12, 'bold'), fg='#ECF0F1', bg='#34495E')
+        stats_frame.pack(fill='x', pady=10)
+        
+        # Stats grid
+        stats_inner = tk.Frame(stats_frame, bg='#34495E')
+        stats_inner.pack(pady=15, padx=10, fill='x')
+        
+        # Row 1
+        tk.Label(stats_inner, text="Trạng thái khám phá:", 
+                font=('Arial', 10), fg='#ECF0F1', bg='#34495E').grid(row=0, column=0, sticky='w', pady=5)
+        self.explored_label = tk.Label(stats_inner, text="0", 
+                                     font=('Arial', 10, 'bold'), fg='#3498DB', bg='#34495E')
+        self.explored_label.grid(row=0, column=1, sticky='e', pady=5)
+        
+        # Row 2
+        tk.Label(stats_inner, text="Frontier tối đa:", 
+                font=('Arial', 10), fg='#ECF0F1', bg='#34495E').grid(row=1, column=0, sticky='w', pady=5)
+        self.frontier_label = tk.Label(stats_inner, text="0", 
+                                     font=('Arial', 10, 'bold'), fg='#E74C3C', bg='#34495E')
+        self.frontier_label.grid(row=1, column=1, sticky='e', pady=5)
+        
+        # Row 3
+        tk.Label(stats_inner, text="Độ sâu giải pháp:", 
+                font=('Arial', 10), fg='#ECF0F1', bg='#34495E').grid(row=2, column=0, sticky='w', pady=5)
+        self.depth_label = tk.Label(stats_inner, text="0", 
+                                   font=('Arial', 10, 'bold'), fg='#F39C12', bg='#34495E')
+        self.depth_label.grid(row=2, column=1, sticky='e', pady=5)
+        
+        # Row 4
+        tk.Label(stats_inner, text="Thời gian thực thi:", 
+                font=('Arial', 10), fg='#ECF0F1', bg='#34495E').grid(row=3, column=0, sticky='w', pady=5)
+        self.time_label = tk.Label(stats_inner, text="0ms", 
+                                  font=('Arial', 10, 'bold'), fg='#27AE60', bg='#34495E')
+        self.time_label.grid(row=3, column=1, sticky='e', pady=5)
+        
+        # Row 5
+        heuristic_caption = ("Manhattan Distance:" if self.solver.heuristic is None
+                             else f"Heuristic {self.solver.heuristic_name}:")
+        tk.Label(stats_inner, text=heuristic_caption, 
+                font=('Arial', 10), fg='#ECF0F1', bg='#34495E').grid(row=4, column=0, sticky='w', pady=5)
+        self.manhattan_label = tk.Label(stats_inner, text="0", 
+                                      font=('Arial', 10, 'bold'), fg='#9B59B6', bg='#34495E')
+        self.manhattan_label.grid(row=4, column=1, sticky='e', pady=5)
+        
+        # Row 6
+        tk.Label(stats_inner, text="Chi phí hiện tại f(n):", 
+                font=('Arial', 10), fg='#ECF0F1', bg='#34495E').grid(row=5, column=0, sticky='w', pady=5)
+        self.cost_label = tk.Label(stats_inner, text="0", 
+                                  font=('Arial', 10, 'bold'), fg='#E67E22', bg='#34495E')
+        self.cost_label.grid(row=5, column=1, sticky='e', pady=5)
+        
+        # Row 7: tóm tắt đo đạc (khi bật 📈 Đo đạc tìm kiếm)
+        tk.Label(stats_inner, text="Đo đạc:", 
+                font=('Arial', 10), fg='#ECF0F1', bg='#34495E').grid(row=6, column=0, sticky='nw', pady=5)
+        self.instrument_label = tk.Label(stats_inner, text="—", font=('Arial', 9), fg='#1ABC9C',
+                                         bg='#34495E', justify='right', wraplength=320)
+        self.instrument_label.grid(row=6, column=1, sticky='e', pady=5)
+        
+        # Configure grid weights
+        stats_inner.grid_columnconfigure(1, weight=1)
+        
+        # Solution frame
+        solution_frame = tk.LabelFrame(right_frame, text="🎯 Lời giải từng bước",
+                                     font=('Arial', 12, 'bold'), fg='#ECF0F1', bg='#34495E')
+        solution_frame.pack(fill='both', expand=True, pady=10)
+        
+        # Solution text area
+        self.solution_text = scrolledtext.ScrolledText(solution_frame, height=15, width=40,
+                                                      font=('Consolas', 9), 
+                                                      bg='#2C3E50', fg='#ECF0F1',
+                                                      insertbackground='#ECF0F1')
+        self.solution_text.pack(pady=10, padx=10, fill='both', expand=True)
+        
+        # Replay controls
+        replay_frame = tk.Frame(solution_frame, bg='#34495E')
+        replay_frame.pack(pady=10)
+        
+        self.replay_btn = tk.Button(replay_frame, text="🎬 Replay",
+                                  command=self.start_replay,
+                                  bg='#8E44AD', fg='white', font=('Arial', 10, 'bold'),
+                                  state='disabled')
+        self.replay_btn.pack(side='left', padx=5)
+        
+        self.stop_btn = tk.Button(replay_frame, text="⏹️ Dừng",
+                                command=self.stop_solving,
+                                bg='#E74C3C', fg='white', font=('Arial', 10, 'bold'),
+                                state='disabled')
+        self.stop_btn.pack(side='left', padx=5)
+        
+        # Status bar
+        self.status_var = tk.StringVar()
+        self.status_var.set("Sẵn sàng - Nhấn 'Xáo trộn' để bắt đầu")
+        status_bar = tk.Label(self.root, textvariable=self.status_var,
+                            font=('Arial', 10), fg='#ECF0F1', bg='#34495E',
+                            relief='sunken', anchor='w')
+        status_bar.pack(side='bottom', fill='x')
+    
+    def create_tiles(self):
+        """Tạo lưới nút cho bảng theo kích thước hiện tại"""
+        for btn in self.buttons:
+            btn.destroy()
+        self.buttons = []
+        for i in range(self.geometry.size):
+            row, col = divmod(i, self.geometry.width)
+            btn = tk.Button(self.puzzle_frame, text="", width=4, height=2,
+                           font=('Arial', 16, 'bold'), 
+                           command=lambda r=row, c=col: self.tile_clicked(r, c))
+            btn.grid(row=row, column=col, padx=2, pady=2)
+            self.buttons.append(btn)
+    
+    def set_board_size(self, size: int):
+        """Đổi kích thước bảng (3x3, 4x4, 5x5) và xáo trộn bảng mới"""
+        if self.is_solving or size == self.geometry.width:
+            return
+        self.geometry = get_geometry(size)
+        self.solver.heuristic = self.pattern_database if size == 4 else None
+        self.create_tiles()
+        self.shuffle_puzzle()
+        self.status_var.set(f"Đã chuyển sang bảng {size}x{size} - Sẵn sàng giải!")
+    
+    def update_display(self):
+        """Cập nhật hiển thị puzzle"""
+        for i in range(self.geometry.size):
+            btn = self.buttons[i]
+            value = self.current_board[i]
+            
+            if value == 0:
+                btn.config(text="", bg='#7F8C8D', state='disabled',
+                          relief='sunken')
+            else:
+                btn.config(text=str(value), bg='#3498DB', fg='white',
+                          state='normal', relief='raised',
+                          activebackground='#2980B9')
+        
+        # Cập nhật stats
+        current_state = PuzzleState(self.current_board, heuristic_fn=self.solver.heuristic)
+        self.manhattan_label.config(text=str(current_state.heuristic))
+        self.cost_label.config(text=str(current_state.cost))
+        
+        # Kiểm tra win condition
+        if current_state.is_goal():
+            self.status_var.set("🎉 Chúc mừng! Bạn đã giải thành công puzzle!")
+            messagebox.showinfo("Thành công!", "🎉 Chúc mừng! Bạn đã hoàn thành puzzle!")
+    
+    def tile_clicked(self, row, col):
+        """Xử lý khi click vào ô"""
+        if self.is_solving:
+            return
+            
+        clicked_index = row * self.geometry.width + col
+        empty_index = self.current_board.index(0)
+        empty_row, empty_col = divmod(empty_index, self.geometry.width)
+        
+        # Kiểm tra có thể di chuyển không
+        if (abs(row - empty_row) == 1 and col == empty_col) or \
+           (abs(col - empty_col) == 1 and row == empty_row):
+            # Di chuyển ô
+            self.current_board[clicked_index], self.current_board[empty_index] = \
+                self.current_board[empty_index], self.current_board[clicked_index]
+            
+            # Hiệu ứng animation
+            self.buttons[clicked_index].config(relief='sunken')
+            self.root.after(100, lambda: self.update_display())
+    
+    def shuffle_puzzle(self):
+        """Xáo trộn puzzle"""
+        if self.is_solving:
+            return
+            
+        # Tạo puzzle ngẫu nhiên bằng cách thực hiện các bước hợp lệ
+        self.current_board = create_random_solvable_puzzle(1000, width=self.geometry.width,
+                                                           height=self.geometry.height)
+        
+        self.update_display()
+        self.clear_solution()
+        self.status_var.set("Đã xáo trộn puzzle - Sẵn sàng giải!")
+    
+    def reset_puzzle(self):
+        """Reset puzzle về trạng thái đích"""
+        if self.is_solving:
+            return
+            
+        self.current_board = self.geometry.goal[:]
+        self.update_display()
+        self.clear_solution()
+        self.status_var.set("Đã reset puzzle về trạng thái đích")
+    
+    def load_demo_puzzle(self):
+        """Load puzzle demo khó"""
+        if self.is_solving:
+            return
+            
+        # Puzzle khó với Manhattan distance cao (kích thước khác: xáo trộn ít bước)
+        if self.geometry.shape == (4, 4):
+            self.current_board = [5, 1, 3, 4, 2, 6, 8, 12, 9, 10, 7, 11, 13, 14, 0, 15]
+        else:
+            self.current_board = create_random_solvable_puzzle(30, width=self.geometry.width,
+                                                               height=self.geometry.height)
+        self.update_display()
+        self.clear_solution()
+        self.status_var.set("Đã load puzzle demo khó - Manhattan Distance cao!")
+    
+    def on_interim_solution(self, path, stats):
+        """Nhận lời giải tạm thời từ thread giải (chỉ lưu lại, không gọi Tk)"""
+        self.interim_solution = (path, stats)
+    
+    def poll_progress(self):
+        """Cập nhật tiến trình từ kênh (chạy trong main thread qua root.after).
+        
+        Tiếp tục poll tới khi thread giải ghi kết quả cuối và đã kết thúc, kể cả sau
+        khi bấm Dừng.
+        """
+        if self.solve_result is not None and not self.solve_thread.is_alive():
+            result, self.solve_result = self.solve_result, None
+            if result[0] == 'done':
+                self.solve_completed(*result[1:])
+            else:
+                self.solve_error(result[1])
+            return
+        
+        interim, self.interim_solution = self.interim_solution, None
+        if interim is not None and self.is_solving:
+            path, stats = interim
+            self.solution_path = path
+            self.display_solution()
+            self.depth_label.config(text=str(stats['solution_length']))
+            self.replay_btn.config(state='normal')
+            self.status_var.set(f"⚡ Lời giải {stats['solution_length']} bước sau {stats['time']:.3f}s "
+                                f"(tối đa {stats['suboptimality']:.2f} lần tối ưu) - đang cải thiện...")
+        
+        snapshot = self.progress_channel.latest()
+        if snapshot is not None:
+            explored, frontier_size, heuristic, cost = snapshot
+            self.explored_label.config(text=f"{explored:,}")
+            self.frontier_label.config(text=f"{frontier_size:,}")
+            self.manhattan_label.config(text=str(heuristic))
+            self.cost_label.config(text=str(cost))
+        self.root.after(self.progress_poll_ms, self.poll_progress)
+    
+    def solve_puzzle(self):
+        """Giải puzzle bằng A*"""
+        if self.is_solving or (self.solve_thread is not None and self.solve_thread.is_alive()):
+            return
+            
+        if PuzzleState(self.current_board).is_goal():
+            messagebox.showinfo("Thông báo", "Puzzle đã được giải rồi!")
+            return
+        
+        # Kiểm tra tính khả giải
+        if not self.solver.is_solvable(self.current_board):
+            messagebox.showerror("Lỗi", "Puzzle này không thể giải được!\n\n" +
+                               "Puzzle 15 chỉ có thể giải nếu số inversion phù hợp với vị trí ô trống.")
+            return
+        
+        # Bắt đầu giải trong thread riêng
+        self.is_solving = True
+        self.solve_btn.config(state='disabled', text="🔄 Đang giải...")
+        self.stop_btn.config(state='normal')
+        self.progress_bar.pack(pady=10, fill='x')
+        self.progress_bar.start()
+        
+        self.status_var.set("🤖 Đang chạy thuật toán A*... Vui lòng đợi")
+        
+        # Clear previous solution
+        self.clear_solution()
+        
+        # Start solving in background thread
+        anytime = self.anytime_var.get()
+        self.interim_solution = None
+        self.solve_result = None
+        self.instrumentation.last_report = None
+        self.solver.instrumentation = self.instrumentation if self.instrument_var.get() else None
+        stop_event = self.stop_event = threading.Event()
+        
+        def solve_thread():
+            try:
+                options = {}
+                if anytime:
+                    # Lời giải xây dựng có ngay lập tức, sau đó anytime A* cải thiện dần
+                    options = {'algorithm': 'anytime', 'deadline': self.anytime_deadline,
+                               'constructive': True, 'solution_callback': self.on_interim_solution}
+                solution, stats = self.solver.solve(self.current_board, 
+                                                  progress_callback=self.progress_channel,
+                                                  stop_callback=stop_event.is_set,
+                                                  **options)
+                
+                # Không gọi Tk từ thread này: poll_progress cập nhật GUI trong main thread
+                self.solve_result = ('done', solution, stats)
+                
+            except Exception as e:
+                self.solve_result = ('error', str(e))
+        
+        self.progress_channel.reset()
+        self.solve_thread = threading.Thread(target=solve_thread, daemon=True)
+        self.solve_thread.start()
+        self.root.after(self.progress_poll_ms, self.poll_progress)
+    
+    def solve_completed(self, solution, stats):
+        """Hoàn thành giải puzzle"""
+        self.is_solving = False
+        self.solve_btn.config(state='normal', text="🤖 GIẢI BẰNG A* ALGORITHM")
+        self.stop_btn.config(state='disabled')
+        self.progress_bar.stop()
+        self.progress_bar.pack_forget()
+        
+        report = stats.get('instrumentation')
+        if report:
+            self.instrument_label.config(text='\n'.join(self.instrumentation.summary_lines(report)))
+        
+        if solution:
+            # Cập nhật stats
+            self.explored_label.config(text=f"{stats['explored']:,}")
+            self.frontier_label.config(text=f"{stats['max_frontier']:,}")
+            self.depth_label.config(text=str(stats['solution_length']))
+            self.time_label.config(text=f"{stats['time']:.3f}s")
+            
+            # Hiển thị solution
+            self.solution_path = solution
+            self.display_solution()
+            self.replay_btn.config(state='normal')
+            
+            self.status_var.set(f"✅ Tìm thấy lời giải trong {stats['solution_length']} bước! " +
+                              f"Khám phá {stats['explored']:,} trạng thái.")
+            
+            headline = ("🎉 Tìm thấy lời giải tối ưu!" if stats.get('optimal', True) else
+                        f"⚡ Lời giải tốt nhất trong thời gian cho phép "
+                        f"(tối đa {stats['suboptimality']:.2f} lần tối ưu)")
+            messagebox.showinfo("Thành công!", 
+                              f"{headline}\n\n" +
+                              f"📏 Số bước: {stats['solution_length']}\n" +
+                              f"🔍 Trạng thái khám phá: {stats['explored']:,}\n" +
+                              f"⏱️ Thời gian: {stats['time']:.3f}s")
+        elif self.stop_event.is_set():
+            self.status_var.set("⏹️ Đã dừng quá trình giải")
+        else:
+            self.status_var.set("❌ Không tìm thấy lời giải trong thời gian cho phép")
+            messagebox.showerror("Thất bại", "❌ Không thể tìm thấy lời giải!")
+    
+    def solve_error(self, error_msg):
+        """Xử lý lỗi khi giải"""
+        self.is_solving = False
+        self.solve_btn.config(state='normal', text="🤖 GIẢI BẰNG A* ALGORITHM")
+        self.stop_btn.config(state='disabled')
+        self.progress_bar.stop()
+        self.progress_bar.pack_forget()
+        
+        self.status_var.set(f"❌ Lỗi: {error_msg}")
+        messagebox.showerror("Lỗi", f"❌ Có lỗi xảy ra: {error_msg}")
+    
+    def stop_solving(self):
+        """Yêu cầu thread giải dừng; nút Giải chỉ bật lại khi thread đã kết thúc (poll_progress)"""
+        if not self.is_solving:
+            return
+        self.stop_event.set()
+        self.solver.is_solving = False
+        self.stop_btn.config(state='disabled')
+        self.status_var.set("⏹️ Đang dừng quá trình giải...")
+    
+    def display_solution(self):
+        """Hiển thị lời giải"""
+        self.solution_text.delete(1.0, tk.END)
+        self.solution_text.insert(tk.END, "🎯 LỜI GIẢI TỪNG BƯỚC:\n")
+        self.solution_text.insert(tk.END, "=" * 50 + "\n\n")
+        
+        for i, state in enumerate(self.solution_path):
+            step_text = f"Bước {i}: {state.last_move if state.last_move else 'Trạng thái ban đầu'}\n"
+            step_text += f"g(n)={state.moves}, h(n)={state.heuristic}, f(n)={state.cost}\n"
+            board = state.board
+            
+            # Hiển thị board
+            width = self.geometry.width
+            for row in range(self.geometry.height):
+                row_text = "│"
+                for col in range(width):
+                    val = board[row * width + col]
+                    if val == 0:
+                        row_text += "    │"
+                    else:
+                        row_text += f" {val:2d} │"
+                step_text += row_text + "\n"
+            
+            step_text += "\n" + "-" * 30 + "\n\n"
+            self.solution_text.insert(tk.END, step_text)
+    
+    def clear_solution(self):
+        """Xóa lời giải"""
+        self.solution_text.delete(1.0, tk.END)
+        self.solution_path = []
+        self.replay_btn.config(state='disabled')
+        
+        # Reset stats
+        self.explored_label.config(text="0")
+        self.frontier_label.config(text="0")
+        self.depth_label.config(text="0")
+        self.time_label.config(text="0ms")
+        self.instrument_label.config(text="—")
+    
+    def export_instrumentation(self):
+        """Ghi số liệu đo đạc của lần giải gần nhất ra file JSON"""
+        if self.instrumentation.last_report is None:
+            messagebox.showinfo("Thông báo", "Chưa có số liệu đo đạc!\n\n" +
+                              "Bật '📈 Đo đạc tìm kiếm' rồi giải một puzzle (lời giải lấy từ cache không được đo).")
+            return
+        path = filedialog.asksaveasfilename(title="Xuất số liệu đo đạc", defaultextension='.json',
+                                            filetypes=[("JSON", "*.json")])
+        if path:
+            self.instrumentation.save(path)
+            self.status_var.set(f"💾 Đã ghi số liệu đo đạc vào {path}")
+    
+    def start_replay(self):
+        """Bắt đầu replay animation"""
+        if not self.solution_path:
+            return
+            
+        self.replay_index = 0
+        self.replay_btn.config(state='disabled', text="🎬 Đang replay...")
+        self.replay_step()
+    
+    def replay_step(self):
+        """Thực hiện một bước replay"""
+        if self.replay_index >= len(self.solution_path):
+            self.replay_btn.config(state='normal', text="🎬 Replay")
+            self.status_var.set("🎬 Hoàn thành replay animation")
+            return
+        
+        # Cập nhật board
+        state = self.solution_path[self.replay_index]
+        self.current_board = state.board
+        self.update_display()
+        
+        # Cập nhật status
+        step_info = f"Replay bước {self.replay_index}: {state.last_move if state.last_move else 'Ban đầu'}"
+        self.status_var.set(step_info)
+        
+        # Highlight step trong solution text
+        self.highlight_current_step()
+        
+        self.replay_index += 1
+        self.root.after(1000, self.replay_step)  # Delay 1 giây
+    
+    def highlight_current_step(self):
+        """Highlight bước hiện tại trong solution text"""
+        self.solution_text.tag_remove('highlight', 1.0, tk.END)
+        
+        # Tìm và highlight bước hiện tại
+        content = self.solution_text.get(1.0, tk.END)
+        step_marker = f"Bước {self.replay_index}:"
+        
+        start_pos = content.find(step_marker)
+        if start_pos != -1:
+            start_index = f"1.{start_pos}"
+            end_pos = content.find(f"Bước {self.replay_index + 1}:", start_pos)
+            if end_pos == -1:
+                end_index = tk.END
+            else:
+                end_index = f"1.{end_pos}"
+            
+            self.solution_text.tag_add('highlight', start_index, end_index)
+            self.solution_text.tag_config('highlight', background='#3498DB', foreground='white')
+            self.solution_text.see(start_index)
+    
+    def create_custom_puzzle(self):
+        """Tạo cửa sổ nhập puzzle tùy chỉnh"""
+        if self.is_solving:
+            return
+            
+        custom_window = tk.Toplevel(self.root)
+        custom_window.title("Nhập Puzzle Tùy chỉnh")
+        custom_window.geometry("400x300")
+        custom_window.configure(bg='#2C3E50')
+        custom_window.transient(self.root)
+        custom_window.grab_set()
+        
+        # Center window
+        custom_window.update_idletasks()
+        x = (custom_window.winfo_screenwidth() // 2) - (400 // 2)
+        y = (custom_window.winfo_screenheight() // 2) - (300 // 2)
+        custom_window.geometry(f"+{x}+{y}")
+        
+        squares = self.geometry.size
+        tk.Label(custom_window, text=f"Nhập {squares} số từ 0-{squares - 1} (0 là ô trống)",
+                font=('Arial', 12, 'bold'), fg='#ECF0F1', bg='#2C3E50').pack(pady=20)
+        
+        tk.Label(custom_window, text="Ví dụ: " + ' '.join(map(str, self.geometry.goal)),
+                font=('Arial', 10), fg='#BDC3C7', bg='#2C3E50').pack(pady=5)
+        
+        entry_var = tk.StringVar()
+        entry = tk.Entry(custom_window, textvariable=entry_var, width=50, 
+                        font=('Arial', 12), justify='center')
+        entry.pack(pady=20)
+        entry.focus()
+        
+        def apply_custom():
+            try:
+                numbers = list(map(int, entry_var.get().split()))
+                if not self.geometry.is_valid(numbers):
+                    messagebox.showerror("Lỗi", f"Phải nhập đúng {squares} số từ 0-{squares - 1}!")
+                    return
+                
+                self.current_board = numbers
+                self.update_display()
+                self.clear_solution()
+                custom_window.destroy()
+                self.status_var.set("Đã áp dụng puzzle tùy chỉnh")
+                
+            except ValueError:
+                messagebox.showerror("Lỗi", "Vui lòng nhập số hợp lệ!")
+        
+        button_frame = tk.Frame(custom_window, bg='#2C3E50')
+        button_frame.pack(pady=20)
+        
+        tk.Button(button_frame, text="✅ Áp dụng", command=apply_custom,
+                 bg='#27AE60', fg='white', font=('Arial', 10, 'bold'),
+                 padx=20, pady=5).pack(side='left', padx=10)
+        
+        tk.Button(button_frame, text="❌ Hủy", command=custom_window.destroy,
+                 bg='#E74C3C', fg='white', font=('Arial', 10, 'bold'),
+                 padx=20, pady=5).pack(side='left', padx=10)
+        
+        # Bind Enter key
+        entry.bind('<Return>', lambda e: apply_custom())
+    
+    def show_algorithm_details(self):
+        """Hiển thị chi tiết thuật toán A*"""
+        details_window = tk.Toplevel(self.root)
+        details_window.title("Chi tiết Thuật toán A*")
+        details_window.geometry("600x500")
+        details_window.configure(bg='#2C3E50')
+        details_window.transient(self.root)
+        
+        # Center window
+        details_window.update_idletasks()
+        x = (details_window.winfo_screenwidth() // 2) - (600 // 2)
+        y = (details_window.winfo_screenheight() // 2) - (500 // 2)
+        details_window.geometry(f"+{x}+{y}")
+        
+        text_widget = scrolledtext.ScrolledText(details_window, font=('Arial', 11),
+                                              bg='#34495E', fg='#ECF0F1',
+                                              insertbackground='#ECF0F1')
+        text_widget.pack(expand=True, fill='both', padx=20, pady=20)
+        
+        algorithm_text = """🧠 THUẬT TOÁN A* (A-STAR SEARCH)
+
+📖 GIỚI THIỆU:
+A* là thuật toán tìm kiếm có thông tin (informed search) được sử dụng rộng rãi 
+trong trí tuệ nhân tạo để tìm đường đi tối ưu từ trạng thái ban đầu đến đích.
+
+🔬 CÔNG THỨC ĐÁNH GIÁ:
+f(n) = g(n) + h(n)
+
+Trong đó:
+• g(n): Chi phí thực tế từ trạng thái ban đầu đến trạng thái n
+• h(n): Heuristic - ước tính chi phí từ n đến trạng thái đích
+• f(n): Tổng ước tính chi phí của đường đi qua n
+
+🎯 HEURISTIC - MANHATTAN DISTANCE:
+Với puzzle 15, chúng ta sử dụng Manhattan Distance làm heuristic:
+• Tính tổng khoảng cách theo trục x và y của mỗi ô đến vị trí đích
+• Công thức: |x1-x2| + |y1-y2| cho mỗi ô
+• Đây là heuristic "admissible" - không bao giờ overestimate chi phí thực tế
+
+⚙️ CÁCH HOẠT ĐỘNG:
+1. Bắt đầu với trạng thái ban đầu trong frontier (priority queue)
+2. Lặp lại cho đến khi tìm thấy đích:
+   - Chọn trạng thái có f(n) nhỏ nhất từ frontier
+   - Nếu là đích → hoàn thành
+   - Nếu không → mở rộng trạng thái này
+   - Thêm các trạng thái kế tiếp vào frontier
+   - Đánh dấu trạng thái hiện tại đã khám phá
+
+🎮 ĐẶC ĐIỂM PUZZLE 15:
+• Không phải puzzle nào cũng có thể giải được
+• Chỉ 50% các cấu hình ngẫu nhiên có thể giải
+• Kiểm tra bằng "inversion count" và vị trí ô trống
+
+📈 ĐỘ PHỨC TẠP:
+• Time Complexity: O(b^d) trong trường hợp xấu nhất
+• Space Complexity: O(b^d)
+• Với puzzle khó có thể cần khám phá hàng chục nghìn trạng thái
+
+🏆 ƯU ĐIỂM A*:
+• Đảm bảo tìm được lời giải tối ưu (nếu heuristic admissible)
+• Hiệu quả hơn các thuật toán tìm kiếm mù (blind search)
+• Có thể điều chỉnh heuristic để cân bằng tốc độ và tối ưu
+
+💡 HEURISTIC KHÁC CÓ THỂ SỬ DỤNG:
+• Linear Conflict: Phát hiện xung đột trong cùng hàng/cột
+• Pattern Database: Lưu trữ chi phí tối ưu cho các mẫu con
+• Walking Distance: Kết hợp Manhattan với walking distance"""
+
+        text_widget.insert(tk.END, algorithm_text)
+        text_widget.config(state='disabled')
+    
+    def run(self):
+        """Chạy ứng dụng"""
+        # Thêm menu bar
+        menubar = tk.Menu(self.root)
+        self.root.config(menu=menubar)
+        
+        # File menu
+        file_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="📁 File", menu=file_menu)
+        file_menu.add_command(label="🎲 Puzzle ngẫu nhiên", command=self.shuffle_puzzle)
+        file_menu.add_command(label="✏️ Nhập tùy chỉnh", command=self.create_custom_puzzle)
+        file_menu.add_command(label="📚 Puzzle demo", command=self.load_demo_puzzle)
+        file_menu.add_command(label="💾 Xuất số liệu đo đạc (JSON)", command=self.export_instrumentation)
+        file_menu.add_separator()
+        file_menu.add_command(label="❌ Thoát", command=self.root.quit)
+        
+        # Kích thước bảng
+        size_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="📐 Kích thước", menu=size_menu)
+        for size in (3, 4, 5):
+            size_menu.add_command(label=f"{size}x{size} ({size * size - 1}-puzzle)",
+                                  command=lambda n=size: self.set_board_size(n))
+        
+        # Help menu
+        help_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="❓ Trợ giúp", menu=help_menu)
+        help_menu.add_command(label="🧠 Chi tiết thuật toán A*", command=self.show_algorithm_details)
+        help_menu.add_command(label="ℹ️ Hướng dẫn", command=self.show_instructions)
+        
+        # Bắt đầu với puzzle xáo trộn
+        self.shuffle_puzzle()
+        
+        # Chạy main loop
+        self.root.mainloop()
+    
+    def show_instructions(self):
+        """Hiển thị hướng dẫn sử dụng"""
+        instructions_window = tk.Toplevel(self.root)
+        instructions_window.title("Hướng dẫn sử dụng")
+        instructions_window.geometry("500x400")
+        instructions_window.configure(bg='#2C3E50')
+        instructions_window.transient(self.root)
+        
+        # Center window
+        instructions_window.update_idletasks()
+        x = (instructions_window.winfo_screenwidth() // 2) - (500 // 2)
+        y = (instructions_window.winfo_screenheight() // 2) - (400 // 2)
+        instructions_window.geometry(f"+{x}+{y}")
+        
+        text_widget = scrolledtext.ScrolledText(instructions_window, font=('Arial', 11),
+                                              bg='#34495E', fg='#ECF0F1',
+                                              insertbackground='#ECF0F1')
+        text_widget.pack(expand=True, fill='both', padx=20, pady=20)
+        
+        instructions_text = """🎮 HƯỚNG DẪN SỬ DỤNG 15-PUZZLE SOLVER
+
+🎯 MỤC TIÊU:
+Sắp xếp các số từ 1-15 theo thứ tự tăng dần, với ô trống ở cuối.
+
+🎲 BẮT ĐẦU:
+1. Nhấn "Xáo trộn" để tạo puzzle ngẫu nhiên
+2. Hoặc chọn "Demo" để thử puzzle mẫu khó
+3. Hoặc nhập puzzle tùy chỉnh qua menu File
+
+🎮 CHƠI THỦ CÔNG:
+• Click vào các ô số cạnh ô trống để di chuyển
+• Chỉ có thể di chuyển ô kề với ô trống
+
+🤖 GIẢI TỰ ĐỘNG:
+• Nhấn "GIẢI BẰNG A* ALGORITHM" để AI giải
+• Theo dõi thống kê thuật toán realtime
+• Xem lời giải từng bước sau khi hoàn thành
+
+🎬 TÍNH NĂNG REPLAY:
+• Xem animation từng bước của lời giải
+• Theo dõi cách AI di chuyển từng ô
+
+📊 THỐNG KÊ THUẬT TOÁN:
+• Trạng thái khám phá: Số state AI đã xem xét
+• Frontier tối đa: Kích thước queue lớn nhất
+• Độ sâu giải pháp: Số bước tối ưu
+• Manhattan Distance: Giá trị heuristic hiện tại
+• Chi phí f(n): Tổng g(n) + h(n)
+
+💡 MẸO:
+• Không phải puzzle nào cũng giải được (chỉ ~50%)
+• Puzzle khó có thể mất vài phút để giải
+• Manhattan Distance càng thấp càng gần đích
+• A* đảm bảo tìm lời giải tối ưu (ít bước nhất)
+
+🔬 VỀ THUẬT TOÁN A*:
+• Tìm kiếm có thông tin (informed search)
+• Sử dụng heuristic để định hướng tìm kiếm
+• Kết hợp ưu điểm của Dijkstra và Greedy Search
+• Được dùng rộng rãi trong AI, robotics, game development"""
+
+        text_widget.insert(tk.END, instructions_text)
+        text_widget.config(state='disabled')
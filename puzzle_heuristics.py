@@ -0,0 +1,206 @@
+"""Các heuristic có sẵn cho PuzzleSolver: Manhattan + linear conflict, walking distance
+
+Cả hai đều admissible, consistent và được cập nhật theo hiệu số khi một ô di
+chuyển: mỗi hàng/cột được tra bằng bảng tính sẵn theo 16 bit tương ứng của key.
+
+- linear-conflict: Manhattan + 2 * (số ô ít nhất phải bỏ khỏi mỗi hàng/cột để
+  các ô đang ở đúng hàng/cột đích không chắn đường nhau).
+- walking-distance: số bước tối thiểu của bài toán nới lỏng chỉ xét mỗi ô đang
+  ở hàng nào (và riêng cột nào), tính sẵn bằng BFS trên ma trận đếm.
+
+Cách dùng:
+    solver = PuzzleSolver(heuristic='walking-distance')
+    solver = PuzzleSolver(heuristic=create_heuristic('pdb', 'pdb_663.bin'))
+"""
+import os
+from array import array
+from collections import deque
+from typing import List, Optional, Sequence
+
+from pattern_database import DEFAULT_PDB_PATH, PatternDatabase
+from puzzle_core import MANHATTAN_TABLE, Heuristic, pack_board
+
+HEURISTICS = ('manhattan', 'linear-conflict', 'walking-distance', 'pdb')
+
+_GOAL_ROW = [0] + [(tile - 1) // 4 for tile in range(1, 16)]
+_GOAL_COL = [0] + [(tile - 1) % 4 for tile in range(1, 16)]
+
+
+def line_removals(goals: Sequence[int]) -> int:
+    """Số ô ít nhất phải bỏ khỏi một hàng/cột để các ô còn lại đúng thứ tự.
+
+    goals là dãy 4 giá trị: 0 nếu ô không thuộc hàng/cột này, ngược lại là vị
+    trí đích trong hàng/cột cộng 1. Kết quả = số ô thuộc hàng - dãy tăng dài nhất.
+    """
+    values = [g for g in goals if g]
+    longest = [1] * len(values)
+    for i in range(len(values)):
+        for j in range(i):
+            if values[j] < values[i]:
+                longest[i] = max(longest[i], longest[j] + 1)
+    return len(values) - max(longest, default=0)
+
+
+# Mã của một hàng/cột: sum(goals[k] * 5**k); LINE_REMOVALS[mã] là số ô phải bỏ
+LINE_REMOVALS = bytes(line_removals([(code // 5 ** k) % 5 for k in range(4)]) for code in range(5 ** 4))
+
+
+def _column_bits(key: int, col: int) -> int:
+    """Gom 4 ô của cột col thành 16 bit (ô hàng 0 ở 4 bit thấp) như một hàng"""
+    shift = 4 * col
+    return (((key >> shift) & 0xF) | ((key >> (shift + 12)) & 0xF0)
+            | ((key >> (shift + 24)) & 0xF00) | ((key >> (shift + 36)) & 0xF000))
+
+
+def _line_table(values: Sequence[int], weights: Sequence[int], combine, typecode: str) -> array:
+    """Bảng 65536 mục cho một hàng/cột: combine(values[n0]*w0 + ... + values[n3]*w3)"""
+    a = [values[t] * weights[0] for t in range(16)]
+    b = [values[t] * weights[1] for t in range(16)]
+    c = [values[t] * weights[2] for t in range(16)]
+    d = [values[t] * weights[3] for t in range(16)]
+    return array(typecode, [combine(z + y + x + w) for z in d for y in c for x in b for w in a])
+
+
+_conflict_tables = None
+
+
+def _get_conflict_tables():
+    """Bảng số ô phải bỏ của 4 hàng và 4 cột (sinh một lần khi cần)"""
+    global _conflict_tables
+    if _conflict_tables is None:
+        powers = (1, 5, 25, 125)
+        rows = [_line_table([_GOAL_COL[t] + 1 if t and _GOAL_ROW[t] == r else 0 for t in range(16)],
+                            powers, LINE_REMOVALS.__getitem__, 'B') for r in range(4)]
+        cols = [_line_table([_GOAL_ROW[t] + 1 if t and _GOAL_COL[t] == c else 0 for t in range(16)],
+                            powers, LINE_REMOVALS.__getitem__, 'B') for c in range(4)]
+        _conflict_tables = (rows, cols)
+    return _conflict_tables
+
+
+class LinearConflictHeuristic(Heuristic):
+    """Manhattan + linear conflict (hàng và cột)"""
+
+    name = 'linear-conflict'
+
+    def __init__(self):
+        self.rows, self.cols = _get_conflict_tables()
+
+    def __call__(self, board: List[int]) -> int:
+        key = pack_board(board)
+        manhattan = sum(MANHATTAN_TABLE[tile][i] for i, tile in enumerate(board))
+        conflicts = 0
+        for line in range(4):
+            conflicts += self.rows[line][(key >> (16 * line)) & 0xFFFF]
+            conflicts += self.cols[line][_column_bits(key, line)]
+        return manhattan + 2 * conflicts
+
+    def update(self, key: int, new_key: int, h: int, tile: int, from_index: int, to_index: int) -> int:
+        h += MANHATTAN_TABLE[tile][to_index] - MANHATTAN_TABLE[tile][from_index]
+        # Ô đi ngang chỉ đổi hai cột, đi dọc chỉ đổi hai hàng
+        if from_index // 4 == to_index // 4:
+            for col in (from_index % 4, to_index % 4):
+                table = self.cols[col]
+                h += 2 * (table[_column_bits(new_key, col)] - table[_column_bits(key, col)])
+        else:
+            for row in (from_index // 4, to_index // 4):
+                table = self.rows[row]
+                shift = 16 * row
+                h += 2 * (table[(new_key >> shift) & 0xFFFF] - table[(key >> shift) & 0xFFFF])
+        return h
+
+
+def _walking_distances() -> dict:
+    """BFS trên ma trận đếm m[r][g] = số ô ở hàng r có hàng đích g (3 bit mỗi mục).
+
+    Một bước đổi ô trống (hàng có 3 ô) với một ô ở hàng kề. Kết quả dùng chung
+    cho chiều dọc và chiều ngang vì đích đối xứng qua đường chéo.
+    """
+    goal = sum(4 << (3 * (5 * r)) for r in range(3)) + (3 << (3 * 15))
+    distances = {goal: 0}
+    layer = deque([(goal, 3)])
+    while layer:
+        code, blank = layer.popleft()
+        depth = distances[code] + 1
+        for other in (blank - 1, blank + 1):
+            if not 0 <= other < 4:
+                continue
+            for g in range(4):
+                shift = 3 * (4 * other + g)
+                if (code >> shift) & 7:
+                    new_code = code - (1 << shift) + (1 << (3 * (4 * blank + g)))
+                    if new_code not in distances:
+                        distances[new_code] = depth
+                        layer.append((new_code, other))
+    return distances
+
+
+_walking_tables = None
+
+
+def _get_walking_tables():
+    """Bảng khoảng cách và bảng mã ma trận đếm cho từng hàng/cột (sinh một lần khi cần)"""
+    global _walking_tables
+    if _walking_tables is None:
+        distances = _walking_distances()
+        weights = (1, 1, 1, 1)
+        rows = [_line_table([1 << (3 * (4 * r + _GOAL_ROW[t])) if t else 0 for t in range(16)],
+                            weights, int, 'Q') for r in range(4)]
+        cols = [_line_table([1 << (3 * (4 * c + _GOAL_COL[t])) if t else 0 for t in range(16)],
+                            weights, int, 'Q') for c in range(4)]
+        _walking_tables = (distances, rows, cols)
+    return _walking_tables
+
+
+class WalkingDistanceHeuristic(Heuristic):
+    """Walking distance: khoảng cách đi dọc + khoảng cách đi ngang"""
+
+    name = 'walking-distance'
+
+    def __init__(self):
+        self.distances, self.rows, self.cols = _get_walking_tables()
+
+    def _vertical_code(self, key: int) -> int:
+        rows = self.rows
+        return (rows[0][key & 0xFFFF] + rows[1][(key >> 16) & 0xFFFF]
+                + rows[2][(key >> 32) & 0xFFFF] + rows[3][(key >> 48) & 0xFFFF])
+
+    def _horizontal_code(self, key: int) -> int:
+        cols = self.cols
+        return (cols[0][_column_bits(key, 0)] + cols[1][_column_bits(key, 1)]
+                + cols[2][_column_bits(key, 2)] + cols[3][_column_bits(key, 3)])
+
+    def __call__(self, board: List[int]) -> int:
+        key = pack_board(board)
+        return self.distances[self._vertical_code(key)] + self.distances[self._horizontal_code(key)]
+
+    def update(self, key: int, new_key: int, h: int, tile: int, from_index: int, to_index: int) -> int:
+        # Đi ngang không đổi ma trận hàng, đi dọc không đổi ma trận cột
+        if from_index // 4 == to_index // 4:
+            old_code = self._horizontal_code(key)
+            goal, from_line, to_line = _GOAL_COL[tile], from_index % 4, to_index % 4
+        else:
+            old_code = self._vertical_code(key)
+            goal, from_line, to_line = _GOAL_ROW[tile], from_index // 4, to_index // 4
+        new_code = old_code - (1 << (3 * (4 * from_line + goal))) + (1 << (3 * (4 * to_line + goal)))
+        return h - self.distances[old_code] + self.distances[new_code]
+
+
+# Lớp của từng heuristic tạo lại được theo tên (create_heuristic), ví dụ trong worker HDA*
+HEURISTIC_CLASSES = {
+    'linear-conflict': LinearConflictHeuristic,
+    'walking-distance': WalkingDistanceHeuristic,
+    'pdb': PatternDatabase,
+}
+
+
+def create_heuristic(name: str, pdb_path: Optional[str] = None, reflect: bool = False) -> Optional[Heuristic]:
+    """Tạo heuristic theo tên; 'manhattan' trả về None (Manhattan tính trực tiếp trong solver)"""
+    if name == 'manhattan':
+        return None
+    if name == 'linear-conflict':
+        return LinearConflictHeuristic()
+    if name == 'walking-distance':
+        return WalkingDistanceHeuristic()
+    if name == 'pdb':
+        return PatternDatabase.load(pdb_path or os.environ.get('PUZZLE_PDB', DEFAULT_PDB_PATH), reflect=reflect)
+    raise ValueError(f"Heuristic không hợp lệ: {name}")
@@ -0,0 +1,431 @@
+"""Đo đạc quá trình tìm kiếm của PuzzleSolver
+
+SearchInstrumentation gắn vào PuzzleSolver(instrumentation=...) và ghi lại cho
+mỗi lần giải (lời giải lấy từ cache thì không đo):
+- thời gian từng pha: tính heuristic, thao tác frontier (heap), kiểm tra trùng
+  lặp (best_g) và phần còn lại của vòng lặp (expansion: sinh trạng thái con,
+  arena, bookkeeping),
+- tốc độ node/giây theo thời gian,
+- hệ số phân nhánh theo độ sâu g,
+- histogram f của các node được mở rộng và số node của từng ngưỡng f (IDA*),
+- peak RSS của tiến trình,
+- tùy chọn: cProfile hoặc lấy mẫu stack quanh lần giải.
+
+Số liệu theo node chỉ có ở A* và IDA*; thuật toán khác chỉ có thời gian, tốc
+độ, peak RSS và profile. Với backend C, sinh trạng thái con và heuristic của
+A* nằm trong C nên được tính vào expansion, còn IDA* chạy hẳn trong C nên chỉ
+có ngưỡng f và tốc độ node. Mỗi thao tác được đo bằng time.perf_counter nên
+tìm kiếm chậm đi đáng kể khi bật: nên đọc tỉ lệ giữa các pha hơn là thời gian
+tuyệt đối. Khi tắt (instrumentation=None) vòng lặp chỉ tốn một phép so sánh.
+
+Cách dùng:
+    instrumentation = SearchInstrumentation(profile='sample')
+    solver = PuzzleSolver(instrumentation=instrumentation)
+    path, stats = solver.solve(board)
+    print(stats['instrumentation']['phases'])
+    instrumentation.save('search.json')
+
+    python puzzle_instrument.py "5 1 2 3 ..." --algorithm ida --profile cprofile --output search.json
+"""
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:
+    # Windows không có module resource
+    resource = None
+
+PHASES = ('expansion', 'heuristic', 'heap', 'duplicate')
+PHASE_LABELS = {
+    'expansion': 'mở rộng',
+    'heuristic': 'heuristic',
+    'heap': 'frontier',
+    'duplicate': 'trùng lặp',
+}
+PROFILERS = (None, 'cprofile', 'sample')
+
+
+def peak_rss_kb(children: bool = False) -> int:
+    """Peak RSS của tiến trình hiện tại (KB), 0 nếu hệ điều hành không hỗ trợ.
+
+    children=True: peak RSS của tiến trình con lớn nhất đã kết thúc và được join
+    (ví dụ worker của HDA*), không phải tổng của các tiến trình con.
+    """
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # macOS trả về byte, Linux trả về KB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _function_label(filename: str, line: int, name: str) -> str:
+    """Tên hàm dạng file.py:dòng(hàm)"""
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+class _TimedFrontier:
+    """Bọc frontier của A*, cộng thời gian push/pop/peek_f vào pha heap"""
+
+    def __init__(self, frontier, instrumentation: 'SearchInstrumentation'):
+        self.frontier = frontier
+        self.instrumentation = instrumentation
+
+    def push(self, f: int, g: int, node: int):
+        start = time.perf_counter()
+        self.frontier.push(f, g, node)
+        self.instrumentation.phases['heap'] += time.perf_counter() - start
+
+    def pop(self):
+        start = time.perf_counter()
+        item = self.frontier.pop()
+        self.instrumentation.phases['heap'] += time.perf_counter() - start
+        return item
+
+    def peek_f(self) -> int:
+        start = time.perf_counter()
+        f = self.frontier.peek_f()
+        self.instrumentation.phases['heap'] += time.perf_counter() - start
+        return f
+
+    def __len__(self):
+        return len(self.frontier)
+
+
+class _TimedTable(dict):
+    """best_g của A*, cộng thời gian tra cứu vào pha duplicate"""
+
+    def __init__(self, table: dict, instrumentation: 'SearchInstrumentation'):
+        super().__init__(table)
+        self.instrumentation = instrumentation
+
+    def get(self, key, default=None):
+        start = time.perf_counter()
+        value = dict.get(self, key, default)
+        self.instrumentation.phases['duplicate'] += time.perf_counter() - start
+        return value
+
+    def __getitem__(self, key):
+        start = time.perf_counter()
+        value = dict.__getitem__(self, key)
+        self.instrumentation.phases['duplicate'] += time.perf_counter() - start
+        return value
+
+
+class _TimedHeuristic:
+    """Bọc heuristic (None là Manhattan tính trực tiếp), cộng thời gian update vào pha heuristic"""
+
+    def __init__(self, heuristic_fn, manhattan, instrumentation: 'SearchInstrumentation'):
+        self.heuristic_fn = heuristic_fn
+        self.manhattan = manhattan
+        self.instrumentation = instrumentation
+
+    def update(self, key: int, new_key: int, h: int, tile: int, from_index: int, to_index: int) -> int:
+        start = time.perf_counter()
+        if self.heuristic_fn is None:
+            new_h = h - self.manhattan[tile][from_index] + self.manhattan[tile][to_index]
+        else:
+            new_h = self.heuristic_fn.update(key, new_key, h, tile, from_index, to_index)
+        self.instrumentation.phases['heuristic'] += time.perf_counter() - start
+        return new_h
+
+
+class _StackSampler(threading.Thread):
+    """Thread phụ lấy mẫu stack của thread giải mỗi interval giây.
+
+    Chỉ lấy được mẫu khi thread giải nhả GIL, nên khi IDA* chạy trong backend C
+    các mẫu dồn vào hàm poll.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name='puzzle-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = 0
+        self.own = {}       # số mẫu hàm nằm ở đỉnh stack
+        self.total = {}     # số mẫu hàm nằm trong stack (đệ quy chỉ tính một lần)
+        self.stopping = threading.Event()
+
+    def run(self):
+        while not self.stopping.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            code = frame.f_code
+            label = _function_label(code.co_filename, code.co_firstlineno, code.co_name)
+            self.own[label] = self.own.get(label, 0) + 1
+            seen = set()
+            while frame is not None:
+                code = frame.f_code
+                label = _function_label(code.co_filename, code.co_firstlineno, code.co_name)
+                if label not in seen:
+                    seen.add(label)
+                    self.total[label] = self.total.get(label, 0) + 1
+                frame = frame.f_back
+
+    def stop(self):
+        self.stopping.set()
+        self.join()
+
+    def report(self, top: int) -> Dict:
+        samples = self.samples or 1
+        functions = sorted(self.total, key=lambda label: (self.own.get(label, 0), self.total[label]),
+                           reverse=True)[:top]
+        return {
+            'type': 'sample',
+            'interval': self.interval,
+            'samples': self.samples,
+            'functions': [{
+                'function': label,
+                'own': self.own.get(label, 0),
+                'own_share': self.own.get(label, 0) / samples,
+                'total': self.total[label],
+                'total_share': self.total[label] / samples,
+            } for label in functions],
+        }
+
+
+def _cprofile_report(profiler: cProfile.Profile, top: int, path: Optional[str]) -> Dict:
+    """top hàm tốn nhiều thời gian riêng nhất; path (nếu có) nhận file .prof cho pstats/snakeviz"""
+    if path:
+        profiler.dump_stats(path)
+    entries = pstats.Stats(profiler).stats
+    rows = sorted(entries.items(), key=lambda item: item[1][2], reverse=True)[:top]
+    return {
+        'type': 'cprofile',
+        'path': path,
+        'functions': [{
+            'function': _function_label(*function),
+            'calls': calls,
+            'tottime': tottime,
+            'cumtime': cumtime,
+        } for function, (_, calls, tottime, cumtime, _) in rows],
+    }
+
+
+class SearchInstrumentation:
+    """Bộ đo gắn vào PuzzleSolver; mỗi lần giải ghi đè số liệu của lần trước.
+
+    profile: None, 'cprofile' hoặc 'sample' (lấy mẫu stack mỗi sample_interval giây).
+    rate_interval: khoảng cách tối thiểu (giây) giữa hai mẫu tốc độ node.
+    top: số hàm giữ lại trong báo cáo profile.
+    profile_path: file .prof ghi kết quả cProfile đầy đủ.
+    """
+
+    def __init__(self, profile: Optional[str] = None, sample_interval: float = 0.005,
+                 rate_interval: float = 0.1, top: int = 20, profile_path: Optional[str] = None):
+        if profile not in PROFILERS:
+            raise ValueError(f"Profiler không hợp lệ: {profile}")
+        self.profile = profile
+        self.sample_interval = sample_interval
+        self.rate_interval = rate_interval
+        self.top = top
+        self.profile_path = profile_path
+        # Báo cáo của lần giải gần nhất (cũng được ghi vào stats['instrumentation'])
+        self.last_report = None
+        self.reset()
+
+    def reset(self):
+        """Xóa số liệu, bắt đầu đo từ thời điểm này"""
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.expanded_count = 0
+        self.expanded_by_depth = []
+        self.generated_by_depth = []
+        self.f_histogram = {}
+        self.f_bounds = []
+        self.node_rate = []
+        self.start = time.perf_counter()
+        self._next_rate = self.start + self.rate_interval
+
+    def timed_frontier(self, frontier) -> _TimedFrontier:
+        return _TimedFrontier(frontier, self)
+
+    def timed_table(self, table: dict) -> _TimedTable:
+        return _TimedTable(table, self)
+
+    def timed_heuristic(self, heuristic_fn, manhattan) -> _TimedHeuristic:
+        return _TimedHeuristic(heuristic_fn, manhattan, self)
+
+    def expanded(self, g: int, f: int, generated: int):
+        """Một node ở độ sâu g với f = g + h được mở rộng thành generated trạng thái con"""
+        if g >= len(self.expanded_by_depth):
+            missing = g + 1 - len(self.expanded_by_depth)
+            self.expanded_by_depth.extend([0] * missing)
+            self.generated_by_depth.extend([0] * missing)
+        self.expanded_by_depth[g] += 1
+        self.generated_by_depth[g] += generated
+        self.f_histogram[f] = self.f_histogram.get(f, 0) + 1
+        self.expanded_count += 1
+        if not self.expanded_count & 1023:
+            self.sample_rate(self.expanded_count)
+
+    def bound_finished(self, bound: int, explored: int):
+        """IDA* xong một vòng lặp với ngưỡng bound sau khi mở rộng explored node"""
+        self.f_bounds.append({'bound': bound, 'explored': explored})
+
+    def sample_rate(self, explored: int):
+        """Ghi một mẫu tốc độ nếu đã đủ rate_interval kể từ mẫu trước"""
+        now = time.perf_counter()
+        if now >= self._next_rate:
+            self._next_rate = now + self.rate_interval
+            self._add_rate_sample(now, explored)
+
+    def _add_rate_sample(self, now: float, explored: int):
+        elapsed = now - self.start
+        if self.node_rate:
+            previous_time, previous_explored = self.node_rate[-1]['time'], self.node_rate[-1]['explored']
+        else:
+            previous_time, previous_explored = 0.0, 0
+        interval = elapsed - previous_time
+        self.node_rate.append({
+            'time': elapsed,
+            'explored': explored,
+            'nodes_per_sec': (explored - previous_explored) / interval if interval > 0 else 0.0,
+        })
+
+    def run(self, solve, *args, **kwargs):
+        """Gọi solve(*args, **kwargs) -> (path, stats) dưới profiler đã chọn,
+        ghi báo cáo vào stats['instrumentation'] và last_report"""
+        self.reset()
+        rss_start = peak_rss_kb()
+        profiler = sampler = None
+        if self.profile == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+        elif self.profile == 'sample':
+            sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+            sampler.start()
+        try:
+            path, stats = solve(*args, **kwargs)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            if sampler is not None:
+                sampler.stop()
+        now = time.perf_counter()
+        self._add_rate_sample(now, stats.get('explored', self.expanded_count))
+
+        profile = None
+        if profiler is not None:
+            profile = _cprofile_report(profiler, self.top, self.profile_path)
+        elif sampler is not None:
+            profile = sampler.report(self.top)
+        self.last_report = self._build_report(stats, now - self.start, rss_start, profile)
+        stats['instrumentation'] = self.last_report
+        return path, stats
+
+    def _build_report(self, stats: Dict, elapsed: float, rss_start: int, profile: Optional[Dict]) -> Dict:
+        phases = None
+        if self.expanded_count:
+            # expansion là phần còn lại sau khi trừ các pha được đo riêng
+            phases = dict(self.phases)
+            inner = phases['heuristic'] + phases['heap'] + phases['duplicate']
+            phases['expansion'] = max(elapsed - inner, 0.0)
+        branching = [{
+            'depth': depth,
+            'expanded': expanded,
+            'generated': generated,
+            'branching_factor': generated / expanded,
+        } for depth, (expanded, generated) in enumerate(zip(self.expanded_by_depth, self.generated_by_depth))
+            if expanded]
+        total_generated = sum(self.generated_by_depth)
+        explored = stats.get('explored', 0)
+        peak = peak_rss_kb()
+        return {
+            'backend': stats.get('backend', 'python'),
+            'time': elapsed,
+            'explored': explored,
+            'nodes_per_sec': explored / elapsed if elapsed > 0 else 0.0,
+            'phases': phases,
+            'node_rate': self.node_rate,
+            'branching_factor': total_generated / self.expanded_count if self.expanded_count else None,
+            'branching': branching,
+            'f_histogram': [{'f': f, 'expanded': count} for f, count in sorted(self.f_histogram.items())],
+            'f_bounds': self.f_bounds,
+            'peak_rss_kb': peak,
+            'rss_growth_kb': peak - rss_start,
+            'profile': profile,
+        }
+
+    def save(self, path: str, report: Optional[Dict] = None):
+        """Ghi báo cáo (mặc định last_report) ra file JSON"""
+        report = report or self.last_report
+        if report is None:
+            raise ValueError("Chưa có số liệu đo đạc nào")
+        with open(path, 'w') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    def summary_lines(self, report: Optional[Dict] = None) -> List[str]:
+        """Tóm tắt vài dòng của báo cáo (dùng cho bảng thống kê của giao diện)"""
+        report = report or self.last_report
+        if report is None:
+            return []
+        lines = []
+        phases = report['phases']
+        if phases:
+            total = sum(phases.values()) or 1.0
+            lines.append("Pha: " + " · ".join(f"{PHASE_LABELS[name]} {phases[name] / total:.0%}"
+                                               for name in PHASES))
+        line = f"{report['nodes_per_sec']:,.0f} node/s"
+        if report['branching_factor'] is not None:
+            line += f" · b = {report['branching_factor']:.2f}"
+        lines.append(line + f" · RSS tối đa {report['peak_rss_kb'] / 1024:.1f} MB")
+        if report['f_bounds']:
+            bounds = report['f_bounds']
+            lines.append(f"IDA*: {len(bounds)} ngưỡng f, {bounds[0]['bound']} → {bounds[-1]['bound']}")
+        profile = report['profile']
+        if profile and profile['functions']:
+            lines.append(f"Nóng nhất: {profile['functions'][0]['function']}")
+        return lines
+
+
+def main(argv=None):
+    from puzzle_batch import parse_board
+    from puzzle_core import BACKENDS, FRONTIER_TYPES, PuzzleSolver
+    from puzzle_heuristics import HEURISTICS, create_heuristic
+
+    parser = argparse.ArgumentParser(description="Giải một bảng và đo đạc quá trình tìm kiếm")
+    parser.add_argument('board', help="Bảng gồm 9, 16 hoặc 25 số trong một chuỗi (0 là ô trống)")
+    parser.add_argument('--algorithm', choices=['astar', 'ida', 'weighted', 'anytime'],
+                        default='astar')
+    parser.add_argument('--frontier', choices=sorted(FRONTIER_TYPES), default='bucket')
+    parser.add_argument('--heuristic', choices=HEURISTICS,
+                        help="Heuristic (mặc định: pdb nếu có --pdb, ngược lại manhattan)")
+    parser.add_argument('--pdb', help="File PatternDatabase dùng làm heuristic")
+    parser.add_argument('--backend', choices=BACKENDS, help="Mặc định: C nếu đã chạy build_accel.py")
+    parser.add_argument('--profile', choices=[name for name in PROFILERS if name],
+                        help="Chạy kèm cProfile hoặc lấy mẫu stack")
+    parser.add_argument('--profile-output', help="cprofile: file .prof đầy đủ (xem bằng pstats/snakeviz)")
+    parser.add_argument('--top', type=int, default=20, help="Số hàm giữ lại trong báo cáo profile")
+    parser.add_argument('--output', help="File JSON ghi báo cáo (mặc định: chỉ in tóm tắt)")
+    args = parser.parse_args(argv)
+
+    heuristic = args.heuristic or ('pdb' if args.pdb else 'manhattan')
+    instrumentation = SearchInstrumentation(profile=args.profile, top=args.top,
+                                            profile_path=args.profile_output)
+    solver = PuzzleSolver(heuristic=create_heuristic(heuristic, args.pdb), backend=args.backend,
+                          instrumentation=instrumentation)
+    options = {'frontier_type': args.frontier} if args.algorithm == 'astar' else {}
+    path, stats = solver.solve(parse_board(args.board), algorithm=args.algorithm, **options)
+
+    if path is None:
+        print(f"❌ Không tìm được lời giải ({stats['explored']:,} node, {stats['time']:.3f}s)", file=sys.stderr)
+    else:
+        print(f"✅ {len(path) - 1} bước, {stats['explored']:,} node, {stats['time']:.3f}s", file=sys.stderr)
+    for line in instrumentation.summary_lines():
+        print(f"📈 {line}", file=sys.stderr)
+    if args.output:
+        instrumentation.save(args.output)
+        print(f"💾 Đã ghi {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
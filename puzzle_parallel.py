@@ -0,0 +1,322 @@
+"""HDA* - A* song song phân hoạch theo hash cho một bài toán khó
+
+Mỗi tiến trình worker sở hữu một phần không gian trạng thái (chọn theo hash của
+key 64 bit) và giữ open/closed riêng. Worker chạy bất đồng bộ, không có vòng
+đồng bộ: mỗi lượt nó nhận các lô node gửi cho mình, mở rộng tối đa batch_size
+node có f < chi phí lời giải tốt nhất (incumbent, dùng chung qua một Value) rồi
+gửi node thuộc worker khác thành từng lô qua hàng đợi.
+
+Worker tìm thấy lời giải tốt hơn thì hạ incumbent và gửi đường đi cho
+coordinator. Coordinator định kỳ gửi lượt dò (probe) tới mọi worker; mỗi worker
+trả lời có còn việc không (còn node f < incumbent) cùng số lô đã gửi và đã
+nhận. Khi hai lượt dò liên tiếp đều thấy mọi worker rảnh và tổng số lô đã gửi
+bằng tổng đã nhận, không đổi giữa hai lượt (đếm bốn bộ đếm kiểu Mattern), thì
+không còn lô nào đang trên đường và không worker nào còn node có thể cho lời
+giải tốt hơn, nên incumbent là tối ưu.
+
+Cách dùng (so sánh với solve tuần tự trên cùng bảng):
+    python puzzle_parallel.py "0 12 9 13 15 11 10 14 3 7 2 5 4 8 6 1" --workers 4
+"""
+import argparse
+import heapq
+import multiprocessing
+import os
+import queue
+import time
+from typing import List, Optional
+
+from pattern_database import PatternDatabase
+from puzzle_core import GEOMETRY_4x4, GOAL_KEY, MANHATTAN_TABLE, PuzzleSolver, PuzzleState, build_path
+from puzzle_heuristics import create_heuristic
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+# Giá trị incumbent khi chưa có lời giải (lớn hơn mọi độ dài lời giải)
+_NO_SOLUTION = 1 << 30
+
+
+def owner_of(key: int, workers: int) -> int:
+    """Worker sở hữu trạng thái (hash nhân Fibonacci để phân bố đều)"""
+    return (((key * _HASH_MULTIPLIER) & _MASK64) >> 40) % workers
+
+
+def _decode_moves(path: int, length: int) -> List[int]:
+    """Giải nén dãy mã nước đi (2 bit mỗi nước, nước đầu ở bit thấp)"""
+    return [(path >> (2 * i)) & 3 for i in range(length)]
+
+
+def _hda_worker(wid: int, workers: int, initial_board: List[int], heuristic: str, pdb_path: Optional[str],
+                pdb_reflect: bool, batch_size: int, inboxes, reports, incumbent):
+    """Thân tiến trình worker: lỗi được gửi về coordinator thay vì làm worker chết im lặng"""
+    try:
+        _hda_search(wid, workers, initial_board, heuristic, pdb_path, pdb_reflect, batch_size,
+                    inboxes, reports, incumbent)
+    except Exception as e:
+        reports.put(('error', wid, f"{type(e).__name__}: {e}"))
+
+
+def _hda_search(wid: int, workers: int, initial_board: List[int], heuristic: str, pdb_path: Optional[str],
+                pdb_reflect: bool, batch_size: int, inboxes, reports, incumbent):
+    """Vòng lặp của một worker HDA*"""
+    heuristic_fn = create_heuristic(heuristic, pdb_path, pdb_reflect)
+    successors = GEOMETRY_4x4.successors
+    inbox = inboxes[wid]
+
+    # nodes[key] = [g, h, blank, path, closed]
+    nodes = {}
+    open_list = []
+    expansions = 0
+    # Số lô đã gửi / đã nhận, dùng để phát hiện kết thúc
+    sent = received = 0
+
+    def insert(key, g, h, blank, path):
+        node = nodes.get(key)
+        # Nhận node nếu chưa gặp hoặc có g tốt hơn (kể cả node đã đóng - mở lại)
+        if node is not None and node[0] <= g:
+            return
+        nodes[key] = [g, h, blank, path, False]
+        if key == GOAL_KEY:
+            with incumbent.get_lock():
+                improved = g < incumbent.value
+                if improved:
+                    incumbent.value = g
+            if improved:
+                reports.put(('solution', g, path))
+            return
+        heapq.heappush(open_list, (g + h, -g, key))
+
+    def min_f() -> float:
+        """f nhỏ nhất của các node còn hợp lệ trong open (bỏ bản sao cũ ở đỉnh heap)"""
+        while open_list:
+            f, neg_g, key = open_list[0]
+            node = nodes[key]
+            if node[4] or node[0] != -neg_g:
+                heapq.heappop(open_list)
+                continue
+            return f
+        return float('inf')
+
+    root = PuzzleState(initial_board, heuristic_fn=heuristic_fn)
+    if owner_of(root.key, workers) == wid:
+        insert(root.key, 0, root.heuristic, root.blank, 0)
+
+    while True:
+        working = min_f() < incumbent.value
+        # Nhận lô node và lệnh; khi không còn việc thì chờ trên hàng đợi
+        while True:
+            try:
+                message = inbox.get_nowait() if working else inbox.get(timeout=0.1)
+            except queue.Empty:
+                break
+            kind = message[0]
+            if kind == 'nodes':
+                received += 1
+                for child in message[1]:
+                    insert(*child)
+                working = min_f() < incumbent.value
+            elif kind == 'probe':
+                worker_min_f = min_f()
+                reports.put(('probe', wid, message[1], worker_min_f >= incumbent.value, sent, received,
+                             expansions, len(open_list), worker_min_f))
+            else:
+                if heuristic_fn is not None:
+                    heuristic_fn.close()
+                return
+        if not working:
+            continue
+
+        bound = incumbent.value
+        outgoing = [[] for _ in range(workers)]
+        expanded = 0
+        while open_list and expanded < batch_size:
+            f, neg_g, key = open_list[0]
+            if f >= bound:
+                break
+            heapq.heappop(open_list)
+            node = nodes[key]
+            if node[4] or node[0] != -neg_g:
+                continue
+            node[4] = True
+            expanded += 1
+
+            g, h, empty_index, path, _ = node
+            child_g = g + 1
+            # Mã nước đi cuối cùng nằm ở 2 bit cao nhất của path (không có ở nút gốc)
+            previous = (path >> (2 * (g - 1))) & 3 if g else -1
+            for code, new_index, new_shift, empty_shift in successors[empty_index][previous]:
+                tile = (key >> new_shift) & 15
+                new_key = key ^ (tile << new_shift) ^ (tile << empty_shift)
+                if heuristic_fn is None:
+                    new_h = h - MANHATTAN_TABLE[tile][new_index] + MANHATTAN_TABLE[tile][empty_index]
+                else:
+                    new_h = heuristic_fn.update(key, new_key, h, tile, new_index, empty_index)
+                if child_g + new_h >= bound:
+                    continue
+                child = (new_key, child_g, new_h, new_index, path | (code << (2 * g)))
+                target = owner_of(new_key, workers)
+                if target == wid:
+                    insert(*child)
+                    if new_key == GOAL_KEY:
+                        bound = incumbent.value
+                else:
+                    outgoing[target].append(child)
+
+        expansions += expanded
+        for target, children in enumerate(outgoing):
+            if children:
+                inboxes[target].put(('nodes', children))
+                sent += 1
+
+
+def _get_report(reports, processes):
+    """Chờ báo cáo của một worker, báo lỗi nếu có worker đã chết"""
+    while True:
+        try:
+            return reports.get(timeout=1)
+        except queue.Empty:
+            if not all(process.is_alive() for process in processes):
+                raise RuntimeError("Một worker HDA* đã dừng bất thường")
+
+
+def solve_parallel(initial_board: List[int], workers: Optional[int] = None, batch_size: int = 500,
+                   heuristic: Optional[str] = None, pdb_path: Optional[str] = None, pdb_reflect: bool = False,
+                   progress_callback=None, stop_callback=None, probe_interval: float = 0.01):
+    """Giải một bảng bằng HDA*, trả về (path, stats) như PuzzleSolver.solve.
+
+    heuristic là tên trong puzzle_heuristics.HEURISTICS; mặc định là 'pdb' nếu có
+    pdb_path, ngược lại 'manhattan'. probe_interval (giây) là khoảng nghỉ giữa
+    hai lượt dò kết thúc khi còn worker đang bận.
+
+    stats có thêm 'workers', 'worker_expansions' (số node mỗi worker mở rộng) và
+    'probes' (số lượt dò). Chỉ hỗ trợ bảng 4x4.
+    """
+    if len(initial_board) != 16:
+        raise ValueError("HDA* chỉ hỗ trợ bảng 4x4")
+    start_time = time.time()
+    workers = workers or os.cpu_count() or 1
+    heuristic = heuristic or ('pdb' if pdb_path else 'manhattan')
+    checker = PuzzleSolver()
+
+    if not checker.is_solvable(initial_board):
+        return None, {
+            'solvable': False,
+            'time': time.time() - start_time,
+            'explored': 0,
+            'max_frontier': 0
+        }
+
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue() for _ in range(workers)]
+    reports = context.Queue()
+    # Chi phí lời giải tốt nhất dùng chung; _NO_SOLUTION khi chưa có
+    incumbent = context.Value('i', _NO_SOLUTION)
+    processes = [
+        context.Process(target=_hda_worker, daemon=True,
+                        args=(wid, workers, initial_board, heuristic, pdb_path, pdb_reflect, batch_size,
+                              inboxes, reports, incumbent))
+        for wid in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    best_cost = float('inf')
+    best_path = 0
+    worker_expansions = [0] * workers
+    max_frontier = 0
+    probes = 0
+    previous_counts = None
+    finished = False
+
+    try:
+        while True:
+            if stop_callback and stop_callback():
+                break
+            probes += 1
+            for inbox in inboxes:
+                inbox.put(('probe', probes))
+
+            replies = {}
+            while len(replies) < workers:
+                message = _get_report(reports, processes)
+                kind = message[0]
+                if kind == 'solution':
+                    if message[1] < best_cost:
+                        best_cost, best_path = message[1], message[2]
+                elif kind == 'error':
+                    raise RuntimeError(f"Worker HDA* {message[1]} lỗi: {message[2]}")
+                elif message[2] == probes:
+                    replies[message[1]] = message[3:]
+
+            idle = all(reply[0] for reply in replies.values())
+            counts = (sum(reply[1] for reply in replies.values()), sum(reply[2] for reply in replies.values()))
+            for wid, reply in replies.items():
+                worker_expansions[wid] = reply[3]
+            open_total = sum(reply[4] for reply in replies.values())
+            max_frontier = max(max_frontier, open_total)
+            if progress_callback:
+                min_f = min(reply[5] for reply in replies.values())
+                progress_callback(sum(worker_expansions), open_total, min_f, min(min_f, best_cost))
+
+            # Hai lượt dò liên tiếp: mọi worker rảnh, không lô nào đang trên đường
+            # và không có lô nào được gửi hay nhận giữa hai lượt
+            if idle and counts[0] == counts[1]:
+                if counts == previous_counts:
+                    finished = True
+                    break
+                previous_counts = counts
+            else:
+                previous_counts = None
+                time.sleep(probe_interval)
+    finally:
+        for inbox in inboxes:
+            inbox.put(('stop',))
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    stats = {
+        'solvable': finished and best_cost != float('inf'),
+        'time': time.time() - start_time,
+        'explored': sum(worker_expansions),
+        'max_frontier': max_frontier,
+        'workers': workers,
+        'worker_expansions': worker_expansions,
+        'probes': probes,
+        'heuristic': heuristic
+    }
+    if not stats['solvable']:
+        return None, stats
+
+    path = build_path(initial_board, _decode_moves(best_path, best_cost))
+    stats['solution_length'] = best_cost
+    return path, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="So sánh HDA* song song với A* tuần tự trên một bảng")
+    parser.add_argument('board', help="16 số trong một chuỗi (0 là ô trống)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--pdb', default=None, help="File PatternDatabase dùng làm heuristic")
+    parser.add_argument('--skip-sequential', action='store_true', help="Chỉ chạy HDA*")
+    args = parser.parse_args(argv)
+
+    board = [int(x) for x in args.board.replace(',', ' ').split()]
+
+    path, stats = solve_parallel(board, workers=args.workers, batch_size=args.batch_size,
+                                 pdb_path=args.pdb)
+    print(f"HDA*: {stats.get('solution_length')} bước, {stats['explored']:,} node, "
+          f"{stats['time']:.3f}s, {stats['workers']} worker")
+    print(f"  node mỗi worker: {stats['worker_expansions']}")
+
+    if not args.skip_sequential:
+        heuristic = PatternDatabase.load(args.pdb) if args.pdb else None
+        _, seq_stats = PuzzleSolver(heuristic=heuristic).solve(board)
+        print(f"A* tuần tự: {seq_stats.get('solution_length')} bước, {seq_stats['explored']:,} node, "
+              f"{seq_stats['time']:.3f}s")
+        print(f"  tăng tốc: {seq_stats['time'] / stats['time']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
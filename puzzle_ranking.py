@@ -0,0 +1,51 @@
+"""Đánh chỉ số hoàn hảo (perfect hash) cho hoán vị và bộ vị trí theo mã Lehmer
+
+Một bộ k vị trí phân biệt trong n ô được đánh số liên tục từ 0 tới
+n!/(n-k)! - 1, nên dùng trực tiếp làm chỉ số mảng: Pattern Database đánh số
+vị trí các ô trong một nhóm, bảng khoảng cách chính xác (distance_table.py)
+đánh số cả hoán vị của bảng (k = n).
+
+Cách dùng:
+    rank = rank_permutation(board)             # 0 .. n! - 1
+    board = unrank_permutation(rank, len(board))
+"""
+from typing import List, Sequence
+
+
+def table_size(k: int, squares: int = 16) -> int:
+    """Số cách đặt k ô phân biệt vào squares vị trí: squares!/(squares-k)!"""
+    size = 1
+    for i in range(k):
+        size *= squares - i
+    return size
+
+
+def rank_positions(positions: Sequence[int], squares: int = 16) -> int:
+    """Chỉ số (perfect hash) của bộ vị trí các ô trong nhóm"""
+    rank = 0
+    for i, p in enumerate(positions):
+        smaller = 0
+        for q in positions[:i]:
+            if q < p:
+                smaller += 1
+        rank = rank * (squares - i) + p - smaller
+    return rank
+
+
+def unrank_positions(rank: int, k: int, squares: int = 16) -> List[int]:
+    """Hàm ngược của rank_positions"""
+    digits = [0] * k
+    for i in range(k - 1, -1, -1):
+        rank, digits[i] = divmod(rank, squares - i)
+    free = list(range(squares))
+    return [free.pop(d) for d in digits]
+
+
+def rank_permutation(permutation: Sequence[int]) -> int:
+    """Chỉ số Lehmer của một hoán vị của 0..n-1 (0 .. n! - 1)"""
+    return rank_positions(permutation, len(permutation))
+
+
+def unrank_permutation(rank: int, n: int) -> List[int]:
+    """Hàm ngược của rank_permutation"""
+    return unrank_positions(rank, n, n)
@@ -0,0 +1,42 @@
+"""Đối xứng qua đường chéo chính của 15-puzzle
+
+Lật bảng qua đường chéo (ô (r, c) -> (c, r)) rồi đổi nhãn mỗi ô số thành ô có
+vị trí đích đối xứng với nó. Trạng thái đích (ô trống ở góc dưới phải) không
+đổi, nên bảng và ảnh đối xứng của nó có cùng số bước tối ưu; lời giải của ảnh
+đối xứng chuyển về lời giải của bảng gốc bằng cách đổi lên/xuống với trái/phải.
+
+canonical_key() gộp một bảng và ảnh đối xứng của nó về cùng một key, dùng cho
+cache lời giải và heuristic.
+"""
+from typing import List, Sequence, Tuple
+
+from puzzle_core import pack_board
+
+# Vị trí đối xứng của từng ô và nhãn mới của từng ô số
+TRANSPOSE = tuple((i % 4) * 4 + i // 4 for i in range(16))
+RELABEL = (0,) + tuple(TRANSPOSE[tile - 1] + 1 for tile in range(1, 16))
+
+# Mã nước đi sau khi lật: (dr, dc) -> (dc, dr), theo thứ tự của DIRECTIONS
+MIRROR_MOVE = (2, 3, 0, 1)
+
+
+def mirror_board(board: Sequence[int]) -> List[int]:
+    """Ảnh đối xứng qua đường chéo (phép biến đổi tự nghịch đảo)"""
+    mirrored = [0] * 16
+    for i, tile in enumerate(board):
+        mirrored[TRANSPOSE[i]] = RELABEL[tile]
+    return mirrored
+
+
+def mirror_moves(move_codes: Sequence[int]) -> List[int]:
+    """Chuyển dãy mã nước đi giữa bảng và ảnh đối xứng của nó (hai chiều như nhau)"""
+    return [MIRROR_MOVE[code] for code in move_codes]
+
+
+def canonical_key(board: Sequence[int]) -> Tuple[int, bool]:
+    """Key chung của bảng và ảnh đối xứng: (key nhỏ hơn, True nếu key là của ảnh đối xứng)"""
+    key = pack_board(board)
+    mirrored_key = pack_board(mirror_board(board))
+    if mirrored_key < key:
+        return mirrored_key, True
+    return key, False
@@ -0,0 +1,122 @@
+"""Tính hàng loạt bằng NumPy: kiểm tra giải được, Manhattan và linear conflict
+
+Các hàm nhận mảng (N, 16) kiểu uint8 (mỗi dòng một bảng, 0 là ô trống) và trả
+về vector N phần tử, không có vòng lặp Python theo từng bảng. Dùng để lọc và
+chấm điểm các file bảng lớn trước khi đưa vào solver.
+
+NumPy là phụ thuộc tùy chọn: module vẫn import được khi thiếu NumPy, chỉ các
+hàm tính toán báo lỗi.
+
+Cách dùng:
+    python puzzle_vectorized.py boards.txt > scores.csv
+"""
+import argparse
+import sys
+from typing import Iterable, List
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy là tùy chọn
+    np = None
+
+from puzzle_batch import read_boards
+from puzzle_core import MANHATTAN_TABLE
+from puzzle_heuristics import LINE_REMOVALS
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Cần cài NumPy để dùng puzzle_vectorized (pip install numpy)")
+
+
+if np is not None:
+    _MANHATTAN = np.array(MANHATTAN_TABLE, dtype=np.uint8)
+    _SQUARES = np.arange(16)
+    _PAIR_I, _PAIR_J = np.triu_indices(16, 1)
+    _REMOVALS = np.frombuffer(LINE_REMOVALS, dtype=np.uint8)
+    _POWERS = np.array([1, 5, 25, 125], dtype=np.int32)
+    # Hàng và cột đích của từng ô số (ô trống: -1 để không thuộc hàng/cột nào)
+    _GOAL_ROW = np.array([-1] + [(t - 1) // 4 for t in range(1, 16)], dtype=np.int8)
+    _GOAL_COL = np.array([-1] + [(t - 1) % 4 for t in range(1, 16)], dtype=np.int8)
+
+
+def boards_to_array(boards: Iterable[List[int]]):
+    """Chuyển danh sách bảng thành mảng (N, 16) uint8"""
+    _require_numpy()
+    return np.array(list(boards), dtype=np.uint8).reshape(-1, 16)
+
+
+def _check(boards):
+    boards = np.asarray(boards)
+    if boards.ndim != 2 or boards.shape[1] != 16:
+        raise ValueError(f"Cần mảng (N, 16), nhận được {boards.shape}")
+    return boards.astype(np.uint8, copy=False)
+
+
+def batch_is_solvable(boards):
+    """Vector bool: bảng nào giải được (cùng quy tắc với PuzzleSolver.is_solvable)"""
+    _require_numpy()
+    boards = _check(boards)
+    # Cặp (i, j) với i < j là nghịch thế nếu board[i] > board[j] > 0
+    left, right = boards[:, _PAIR_I], boards[:, _PAIR_J]
+    inversions = np.count_nonzero((left > right) & (right != 0), axis=1)
+    empty_row = 4 - np.argmax(boards == 0, axis=1) // 4
+    return (inversions + empty_row) % 2 == 1
+
+
+def batch_manhattan(boards):
+    """Vector khoảng cách Manhattan của từng bảng"""
+    _require_numpy()
+    boards = _check(boards)
+    return _MANHATTAN[boards, _SQUARES].sum(axis=1, dtype=np.int32)
+
+
+def _conflict_removals(boards):
+    """Tổng số ô phải bỏ trên mọi hàng và cột để hết xung đột"""
+    grid = boards.reshape(-1, 4, 4)
+    goal_row, goal_col = _GOAL_ROW[grid], _GOAL_COL[grid]
+    lines = np.arange(4, dtype=np.int8)
+
+    # Hàng r: ô có hàng đích r được mã hóa bằng cột đích + 1
+    row_goals = np.where(goal_row == lines[None, :, None], goal_col + 1, 0).astype(np.int32)
+    # Cột c: ô có cột đích c được mã hóa bằng hàng đích + 1
+    col_goals = np.where(goal_col == lines[None, None, :], goal_row + 1, 0).astype(np.int32)
+
+    row_codes = row_goals @ _POWERS
+    col_codes = col_goals.transpose(0, 2, 1) @ _POWERS
+    return (_REMOVALS[row_codes].sum(axis=1, dtype=np.int32)
+            + _REMOVALS[col_codes].sum(axis=1, dtype=np.int32))
+
+
+def batch_linear_conflict(boards):
+    """Vector heuristic linear conflict: Manhattan + 2 * số ô phải bỏ trên mỗi hàng/cột"""
+    _require_numpy()
+    boards = _check(boards)
+    return batch_manhattan(boards) + 2 * _conflict_removals(boards)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lọc và chấm điểm hàng loạt bảng bằng NumPy")
+    parser.add_argument('input', help="File chứa mỗi dòng một bảng, '-' để đọc từ stdin")
+    parser.add_argument('--solvable-only', action='store_true', help="Chỉ in các bảng giải được")
+    args = parser.parse_args(argv)
+
+    if args.input == '-':
+        boards = boards_to_array(read_boards(sys.stdin))
+    else:
+        with open(args.input) as f:
+            boards = boards_to_array(read_boards(f))
+
+    solvable = batch_is_solvable(boards)
+    manhattan = batch_manhattan(boards)
+    conflict = batch_linear_conflict(boards)
+
+    print('board,solvable,manhattan,linear_conflict')
+    for i in range(len(boards)):
+        if args.solvable_only and not solvable[i]:
+            continue
+        print(f"{' '.join(map(str, boards[i]))},{bool(solvable[i])},{manhattan[i]},{conflict[i]}")
+
+
+if __name__ == '__main__':
+    main()
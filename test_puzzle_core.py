@@ -0,0 +1,201 @@
+"""Kiểm thử bộ giải: bảng lớn (7x7 trở lên) và độ dài lời giải của từng thành phần
+so với IDA* trên các bảng sinh với seed cố định
+
+Chạy:
+    python -m unittest test_puzzle_core
+"""
+import heapq
+import os
+import random
+import tempfile
+import unittest
+
+from distance_table import DistanceTable
+from pattern_database import PatternDatabase
+from puzzle_cache import SolutionCache
+from puzzle_constructive import solve_constructive
+from puzzle_core import (ASTAR_NODE_BYTES, BucketFrontier, PuzzleSolver, SearchArena, build_path,
+                         get_geometry)
+from puzzle_heuristics import LinearConflictHeuristic, WalkingDistanceHeuristic
+from puzzle_ranking import rank_permutation, rank_positions, table_size, unrank_permutation, unrank_positions
+from puzzle_symmetry import mirror_board
+
+# PDB nhỏ (5 nhóm 3 ô) sinh trong vài trăm mili giây, đủ để kiểm thử
+PARTITION_33333 = ((1, 2, 3), (4, 5, 6), (7, 8, 9), (10, 11, 12), (13, 14, 15))
+SEEDS = (1, 2, 3)
+
+
+def scrambled_board(size: int, steps: int, seed: int = 1):
+    """Bảng size x size sinh bằng steps nước đi ngẫu nhiên từ đích (luôn giải được)"""
+    geometry = get_geometry(size)
+    board = geometry.goal[:]
+    rng = random.Random(seed)
+    blank, previous = geometry.size - 1, None
+    for _ in range(steps):
+        square = rng.choice([target for _, target in geometry.neighbors[blank] if target != previous])
+        board[blank], board[square] = board[square], 0
+        previous, blank = blank, square
+    return board
+
+
+def optimal_length(board, width=None, height=None) -> int:
+    """Độ dài lời giải tối ưu theo IDA* (Manhattan)"""
+    _, stats = PuzzleSolver(width=width, height=height).solve_ida_star(board)
+    return stats['solution_length']
+
+
+class LargeBoardTest(unittest.TestCase):
+
+    def test_arena_stores_large_heuristic(self):
+        geometry = get_geometry(7)
+        arena = SearchArena(geometry)
+        # Manhattan của bảng 7x7 có thể vượt 255
+        h = sum(max(distances) for distances in geometry.manhattan)
+        self.assertGreater(h, 255)
+        node = arena.add(geometry.goal_key, -1, 0, h, geometry.size - 1, -1)
+        self.assertEqual(arena.h[node], h)
+
+    def test_solve_7x7(self):
+        board = scrambled_board(7, 30)
+        for algorithm in ('astar', 'ida', 'bidirectional'):
+            with self.subTest(algorithm=algorithm):
+                path, stats = PuzzleSolver().solve(board, algorithm=algorithm)
+                self.assertIsNotNone(path)
+                self.assertEqual(path[-1].board, get_geometry(7).goal)
+                self.assertLessEqual(stats['solution_length'], 30)
+
+
+class OptimalityTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pdb = PatternDatabase.build(PARTITION_33333)
+        cls.boards = [scrambled_board(4, 60, seed) for seed in SEEDS]
+        cls.lengths = [optimal_length(board) for board in cls.boards]
+
+    def test_ranking(self):
+        ranks = set()
+        for a in range(9):
+            for b in range(9):
+                if a != b:
+                    rank = rank_positions([a, b], 9)
+                    self.assertEqual(unrank_positions(rank, 2, 9), [a, b])
+                    ranks.add(rank)
+        self.assertEqual(ranks, set(range(table_size(2, 9))))
+        rng = random.Random(1)
+        for _ in range(20):
+            permutation = list(range(16))
+            rng.shuffle(permutation)
+            self.assertEqual(unrank_permutation(rank_permutation(permutation), 16), permutation)
+
+    def test_pdb(self):
+        reflected = PatternDatabase(self.pdb.patterns, self.pdb.tables, reflect=True)
+        for board, length in zip(self.boards, self.lengths):
+            with self.subTest(board=board):
+                h = self.pdb(board)
+                self.assertLessEqual(h, length)
+                self.assertEqual(reflected(board), max(h, self.pdb(mirror_board(board))))
+                self.assertLessEqual(reflected(board), length)
+                for heuristic in (self.pdb, reflected):
+                    _, stats = PuzzleSolver(heuristic=heuristic, backend='python').solve(board)
+                    self.assertEqual(stats['solution_length'], length)
+
+    def test_incremental_update(self):
+        geometry = get_geometry(4)
+        heuristics = (LinearConflictHeuristic(), WalkingDistanceHeuristic(), self.pdb,
+                      PatternDatabase(self.pdb.patterns, self.pdb.tables, reflect=True))
+        for heuristic in heuristics:
+            with self.subTest(heuristic=heuristic.name, reflect=getattr(heuristic, 'reflect', False)):
+                rng = random.Random(1)
+                board = geometry.goal[:]
+                blank = geometry.size - 1
+                h = heuristic(board)
+                for _ in range(200):
+                    _, square = rng.choice(geometry.neighbors[blank])
+                    key = geometry.pack(board)
+                    tile = board[square]
+                    board[blank], board[square] = tile, 0
+                    h = heuristic.update(key, geometry.pack(board), h, tile, square, blank)
+                    blank = square
+                    self.assertEqual(h, heuristic(board))
+
+    def test_cache_suffix_and_mirror(self):
+        cache = SolutionCache()
+        solver = PuzzleSolver(cache=cache)
+        board, length = self.boards[0], self.lengths[0]
+        path, stats = solver.solve(board)
+        self.assertFalse(stats['cache_hit'])
+        self.assertEqual(stats['solution_length'], length)
+        # Trạng thái giữa đường đi và ảnh đối xứng của bảng được trả lời từ cache
+        middle = path[length // 2].board
+        for query, expected in ((middle, length - length // 2), (mirror_board(board), length)):
+            with self.subTest(query=query):
+                cached, stats = solver.solve(query)
+                self.assertTrue(stats['cache_hit'])
+                self.assertEqual(stats['solution_length'], expected)
+                self.assertEqual(cached[-1].board, get_geometry(4).goal)
+
+    def test_bucket_frontier(self):
+        # Cùng thứ tự (f nhỏ nhất, rồi g lớn nhất) với HeapFrontier
+        rng = random.Random(1)
+        frontier, heap, g_of = BucketFrontier(), [], {}
+        for node in range(500):
+            f, g = rng.randrange(40), rng.randrange(20)
+            frontier.push(f, g, node)
+            heapq.heappush(heap, (f, -g))
+            g_of[node] = g
+            while rng.random() < 0.3 and heap:
+                f, node = frontier.pop()
+                self.assertEqual((f, -g_of[node]), heapq.heappop(heap))
+        self.assertEqual(len(frontier), len(heap))
+        for board, length in zip(self.boards, self.lengths):
+            _, stats = PuzzleSolver(backend='python').solve(board, frontier_type='bucket')
+            self.assertEqual(stats['solution_length'], length)
+
+    def test_constructive(self):
+        geometry = get_geometry(4)
+        for board, length in zip(self.boards, self.lengths):
+            with self.subTest(board=board):
+                codes = solve_constructive(board)
+                self.assertEqual(build_path(board, codes)[-1].board, geometry.goal)
+                self.assertGreaterEqual(len(codes), length)
+                _, stats = PuzzleSolver().solve(board, algorithm='constructive')
+                self.assertFalse(stats['optimal'])
+
+    def test_distance_table(self):
+        geometry = get_geometry(3, 2)
+        table = DistanceTable.build(geometry)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'distances_3x2.bin')
+            table.save(path)
+            loaded = DistanceTable.load(path)
+        self.assertEqual(loaded.data, table.data)
+        for seed in SEEDS:
+            board = geometry.goal[:]
+            rng = random.Random(seed)
+            for _ in range(30):
+                blank = board.index(0)
+                _, square = rng.choice(geometry.neighbors[blank])
+                board[blank], board[square] = board[square], 0
+            with self.subTest(board=board):
+                codes = loaded.solve(board)
+                self.assertEqual(build_path(board, codes, geometry=geometry)[-1].board, geometry.goal)
+                self.assertEqual(len(codes), optimal_length(board, 3, 2))
+
+    def test_bidirectional(self):
+        for board, length in zip(self.boards, self.lengths):
+            with self.subTest(board=board):
+                _, stats = PuzzleSolver().solve(board, algorithm='bidirectional')
+                self.assertEqual(stats['solution_length'], length)
+
+    def test_memory_limit_fallback(self):
+        board, length = self.boards[2], self.lengths[2]
+        _, stats = PuzzleSolver().solve(board, memory_limit=100 * ASTAR_NODE_BYTES)
+        self.assertEqual(stats['mode'], 'ida')
+        self.assertEqual(stats['solution_length'], length)
+        with self.assertRaises(ValueError):
+            PuzzleSolver().solve(board, algorithm='weighted', memory_limit=100 * ASTAR_NODE_BYTES)
+
+
+if __name__ == '__main__':
+    unittest.main()